@@ -0,0 +1,314 @@
+"""주식 페이지 벤치마크
+
+로컬 데이터 제공자로 페이지를 화면 없이(AppTest) 실행하면서 기업 수, 기간, 차트 타입별로
+단계별 시간, 최대 메모리, Plotly 차트 전송량, 재실행 시간을 측정합니다.
+결과는 benchmarks/results/pages.jsonl에 한 줄씩 추가되어 이전 실행과 비교할 수 있습니다.
+
+사용 예:
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --pages 02 --tickers 1 50 200 --periods 1년 최대 --compare
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from functools import wraps
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "pages.jsonl")
+
+PAGES = {
+    "00": "pages/00_주식.py",
+    "02": "pages/02_새로운기업추가.py",
+}
+
+# 페이지마다 고를 수 있는 기간
+CHART_TYPES = {"line": "라인 차트", "candle": "캔들스틱 차트"}
+
+# 단계 이름과 시간을 잴 함수 (모듈, 함수 이름)
+STAGES = {
+    "주가 로딩": ("utils.loader", "load_parallel"),
+    "회사 정보": ("utils.metadata", "load_company_info"),
+    "성과 지표": ("utils.analytics", "performance_metrics"),
+    "상관관계": ("utils.analytics", "correlation_matrix"),
+    "다운샘플링": ("utils.charts", "downsample_series"),
+    "캔들스틱 격자": ("utils.charts", "candlestick_grid"),
+    "차트 전송": ("streamlit", "plotly_chart"),
+}
+
+stage_times = defaultdict(float)
+
+
+def setup_environment(store_dir, latency):
+    """utils를 불러오기 전에 로컬 제공자와 임시 저장소를 사용하도록 설정하는 함수"""
+    os.environ["MARKET_DATA_PROVIDER"] = "local"
+    os.environ["MARKET_DATA_LATENCY"] = str(latency)
+    os.environ["OHLCV_STORE_DIR"] = store_dir
+    os.environ["METADATA_DB"] = os.path.join(store_dir, "metadata.sqlite")
+    os.environ["WARMUP_ENABLED"] = "0"
+    # 미리 만든 스냅샷을 쓰면 페이지 처리 과정을 측정할 수 없으므로 끔
+    os.environ["SNAPSHOTS_ENABLED"] = "0"
+    # 단계별 JSON 로그가 결과 표를 덮지 않도록 따로 켜지 않았으면 끔
+    os.environ.setdefault("METRICS_LOG", "0")
+    sys.path.insert(0, ROOT)
+
+
+def timed(name, fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stage_times[name] += time.perf_counter() - start
+    return wrapper
+
+
+def install_stage_timers():
+    """페이지가 불러오는 함수들을 시간 측정 함수로 바꿔 끼우는 함수
+
+    모듈 속성을 바꾸고, 페이지 화면 모듈(utils.stockview)이 이름으로 가져온 함수도 함께 바꿉니다.
+    """
+    import importlib
+
+    from utils import stockview
+
+    for name, (module_name, attr) in STAGES.items():
+        module = importlib.import_module(module_name)
+        original = getattr(module, attr)
+        setattr(module, attr, timed(name, original))
+        if getattr(stockview, attr, None) is original:
+            setattr(stockview, attr, getattr(module, attr))
+
+
+def benchmark_universe(size):
+    """기업 수 size개 이상의 {기업명: 티커} 딕셔너리 (기본 선택 기업이 앞에 오도록 구성)"""
+    from utils.ranking import load_candidates
+    from utils.universe import COMPANIES_TO_ANALYZE
+
+    companies = dict(COMPANIES_TO_ANALYZE)
+    tickers = set(companies.values())
+    for row in load_candidates().itertuples(index=False):
+        if row.ticker not in tickers:
+            companies[row.name] = row.ticker
+            tickers.add(row.ticker)
+
+    # 후보 목록보다 많이 필요하면 합성 티커로 채움
+    i = 0
+    while len(companies) < size:
+        i += 1
+        companies[f"Synthetic {i:03d}"] = f"SYN{i:03d}"
+    return companies
+
+
+def install_universe(companies):
+    import utils.universe as universe
+
+    universe.COMPANIES_TO_ANALYZE = companies
+    universe.top10_companies = lambda: companies
+
+
+def clear_memory_caches():
+    """프로세스 메모리 캐시를 비워 매 시나리오를 같은 조건(디스크 저장소만 채워진 상태)에서 시작"""
+    from utils import fx, metadata, prices, ranking
+
+    prices.load_shared_prices.clear()
+    prices.download_prices.clear()
+    fx.get_rate_series.clear()
+    ranking.market_caps.clear()
+    metadata._quotes.clear()
+
+
+def plotly_payload(at):
+    """화면에 그려진 Plotly 차트 JSON의 총 크기(바이트)"""
+    return sum(len(chart.proto.spec.encode("utf-8")) for chart in at.get("plotly_chart"))
+
+
+def measure(at, action):
+    """action 실행 후 at.run()까지 걸린 시간(ms)과 단계별 시간을 반환하는 함수"""
+    stage_times.clear()
+    action()
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed, {name: round(seconds * 1000, 1) for name, seconds in stage_times.items()}
+
+
+def run_scenario(page, n, period, chart, companies, timeout):
+    """시나리오 하나를 실행하는 함수
+
+    시간 측정과 메모리 측정(tracemalloc은 실행을 느리게 함)은 각각 캐시를 비운 뒤 따로 실행합니다.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    names = list(companies)[:n]
+    other = "line" if chart == "candle" else "candle"
+
+    def open_page():
+        clear_memory_caches()
+        at = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=timeout)
+        initial_ms, _ = measure(at, lambda: None)
+
+        def select():
+            at.sidebar.multiselect[0].set_value(names)
+            at.selectbox[0].set_value(period)
+            at.radio[0].set_value(CHART_TYPES[chart])
+
+        return at, initial_ms, select
+
+    at, initial_ms, select = open_page()
+    cold_ms, stages = measure(at, select)
+    payload = plotly_payload(at)
+    rerun_ms, _ = measure(at, lambda: None)
+    toggle_ms, _ = measure(at, lambda: at.radio[0].set_value(CHART_TYPES[other]))
+
+    at, _, select = open_page()
+    tracemalloc.start()
+    try:
+        measure(at, select)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "page": page,
+        "tickers": n,
+        "period": period,
+        "chart": chart,
+        "initial_ms": round(initial_ms, 1),
+        "cold_ms": round(cold_ms, 1),
+        "rerun_ms": round(rerun_ms, 1),
+        "toggle_ms": round(toggle_ms, 1),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+        "payload_kb": round(payload / 1024, 1),
+        "stages": stages,
+    }
+
+
+def failed_scenario(page, n, period, chart, exc):
+    """실패한 시나리오의 기록 (나머지 시나리오는 계속 실행)"""
+    return {
+        "page": page,
+        "tickers": n,
+        "period": period,
+        "chart": chart,
+        "error": f"{type(exc).__name__}: {exc}",
+    }
+
+
+def scenario_key(result):
+    return (result["page"], result["tickers"], result["period"], result["chart"])
+
+
+def load_previous(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def print_results(results, previous=None):
+    before = {}
+    if previous:
+        before = {scenario_key(r): r for r in previous["results"] if "error" not in r}
+
+    header = f"{'page':<5}{'n':>5} {'period':<6}{'chart':<7}{'cold':>9}{'rerun':>9}{'toggle':>9}{'peak MB':>9}{'payload KB':>11}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['page']:<5}{r['tickers']:>5} {r['period']:<6}{r['chart']:<7}  실패: {r['error']}")
+            continue
+        line = (f"{r['page']:<5}{r['tickers']:>5} {r['period']:<6}{r['chart']:<7}"
+                f"{r['cold_ms']:>9.0f}{r['rerun_ms']:>9.0f}{r['toggle_ms']:>9.0f}"
+                f"{r['peak_mb']:>9.1f}{r['payload_kb']:>11.1f}")
+        old = before.get(scenario_key(r))
+        if old:
+            change = (r["cold_ms"] - old["cold_ms"]) / old["cold_ms"] * 100 if old["cold_ms"] else 0
+            line += f"   (cold {change:+.0f}% vs {previous['commit']})"
+        print(line)
+        stages = ", ".join(f"{name} {ms:.0f}" for name, ms in r["stages"].items())
+        print(f"{'':<11}단계(ms): {stages}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주식 페이지 벤치마크")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--tickers", nargs="+", type=int, default=[1, 10, 50, 200])
+    parser.add_argument("--periods", nargs="+", default=["1년", "5년", "최대"])
+    parser.add_argument("--charts", nargs="+", default=list(CHART_TYPES), choices=list(CHART_TYPES))
+    parser.add_argument("--latency", type=float, default=0.0, help="제공자 호출마다 넣을 지연 시간(초)")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--compare", action="store_true", help="이전 실행 결과와 비교")
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    store_dir = tempfile.mkdtemp(prefix="bench-store-")
+    setup_environment(store_dir, args.latency)
+    install_stage_timers()
+    companies = benchmark_universe(max(args.tickers))
+    install_universe(companies)
+
+    from utils.stockview import page_setup
+
+    results = []
+    for page in args.pages:
+        # 페이지에서 고를 수 없는 기간은 건너뜀
+        _, _, period_options = page_setup(page)
+        for period in args.periods:
+            if period not in period_options:
+                continue
+            for n in args.tickers:
+                for chart in args.charts:
+                    print(f"실행 중: page={page} tickers={n} period={period} chart={chart}", file=sys.stderr)
+                    try:
+                        results.append(run_scenario(page, n, period, chart, companies, args.timeout))
+                    except Exception as exc:
+                        # 시나리오 하나가 실패해도 나머지 결과는 측정하고 저장함
+                        traceback.print_exc()
+                        results.append(failed_scenario(page, n, period, chart, exc))
+
+    record = {
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "latency": args.latency,
+        "results": results,
+    }
+    print_results(results, load_previous(args.output) if args.compare else None)
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"결과 저장: {args.output}")
+
+    failed = [r for r in results if "error" in r]
+    if failed:
+        print(f"실패한 시나리오 {len(failed)}개", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
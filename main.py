@@ -1,67 +1,103 @@
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
+
+from utils.itinerary import plan_itinerary
+from utils.mapview import (VIEWPORT_THRESHOLD, default_view, format_distance, get_base_map, map_view,
+                           nearby_layer, render_map, route_layer, viewport_layer)
+from utils.metrics import start_metrics_server
+from utils.poi import ATTRACTION, NEARBY_COUNT, get_pois, nearby
+from utils.warmup import start_warmup
+
+# 주식 페이지 데이터를 백그라운드에서 미리 받아둠 (프로세스당 한 번 시작)
+start_warmup()
+
+# METRICS_PORT가 설정되어 있으면 /metrics 주소로 단계별 시간과 캐시 지표를 내보냄
+start_metrics_server()
 
 # 앱 제목
 st.title("🇯🇵 도쿄 관광 명소 추천 지도")
 st.markdown("한국인 관광객에게 인기 있는 도쿄 명소와 근처 맛집을 소개합니다! 🍜🍣")
 
-# 지도 중심 좌표 (도쿄 중심)
-tokyo_center = [35.6804, 139.7690]
-m = folium.Map(location=tokyo_center, zoom_start=12)
+# 근처 맛집 검색 조건
+count = st.sidebar.slider("근처 맛집 수", min_value=1, max_value=20, value=NEARBY_COUNT)
+radius_km = st.sidebar.slider("검색 반경 (km)", min_value=0.5, max_value=10.0, value=3.0, step=0.5)
+
+# 장소가 많으면 지도 화면에 보이는 영역의 장소만 보냄 (지도를 움직일 때마다 다시 계산)
+viewport = st.sidebar.toggle("화면에 보이는 장소만 불러오기", value=len(get_pois()) > VIEWPORT_THRESHOLD)
 
-# 관광 명소 및 맛집 데이터
-places = [
-    {
-        "name": "1. 도쿄 캐릭터 스트리트",
-        "location": [35.681167, 139.767052],
-        "desc": "도쿄역 지하에 위치한 캐릭터 전문 상점 거리! 애니메이션 굿즈 쇼핑 천국 🎎",
-        "food": {
-            "name": "카레야 무텐카",
-            "location": [35.680712, 139.766475],
-            "desc": "순한 맛부터 매운 맛까지 다양한 일본식 카레 🍛"
-        }
-    },
-    {
-        "name": "2. 해리포터 스튜디오 도쿄",
-        "location": [35.7364, 139.7130],
-        "desc": "마법 세계로 떠나는 특별한 체험 공간! 🧙‍♂️🪄",
-        "food": {
-            "name": "버터비어 카페",
-            "location": [35.7366, 139.7125],
-            "desc": "해리포터 팬이라면 꼭! 버터비어 맛보기 🍺 (무알콜)"
-        }
-    },
-    {
-        "name": "3. 커비 카페 도쿄",
-        "location": [35.6759, 139.7595],
-        "desc": "귀여움 폭발! 커비 테마 카페 🎂",
-        "food": {
-            "name": "커비 디저트 바",
-            "location": [35.6758, 139.7597],
-            "desc": "딸기 팬케이크, 커비 모양 푸딩 등 인생샷 명소 📸"
-        }
-    }
-]
+# 관광 명소 및 맛집 데이터는 data/tokyo_pois.csv (TOKYO_POI_PATH)에서 읽고,
+# 만들어진 지도는 파일이 바뀔 때까지 재사용
+m = get_base_map(viewport=viewport)
+layers = []
 
-# 지도에 마커 추가
-for place in places:
-    # 관광지 마커
-    folium.Marker(
-        location=place["location"],
-        popup=f"<b>{place['name']}</b><br>{place['desc']}",
-        tooltip=place["name"],
-        icon=folium.Icon(color='blue', icon='info-sign')
-    ).add_to(m)
+# 지도에서 명소나 임의의 위치를 클릭하면 그 주변 맛집을 공간 색인으로 찾음
+selected = st.session_state.get("selected_point")
+restaurants = None
+if selected:
+    restaurants = nearby(selected[0], selected[1], k=count, radius_m=radius_km * 1000)
+    layers.append(nearby_layer(selected, restaurants))
 
-    # 맛집 마커
-    food = place["food"]
-    folium.Marker(
-        location=food["location"],
-        popup=f"<b>{food['name']}</b><br>{food['desc']}",
-        tooltip=food["name"],
-        icon=folium.Icon(color='red', icon='cutlery')
-    ).add_to(m)
+# 여행 동선: 선택한 명소의 방문 순서를 정하고 명소마다 식사 장소를 하나씩 붙임
+st.sidebar.header("🗺 여행 동선")
+attractions = get_pois().query("category == @ATTRACTION")
+chosen = st.sidebar.multiselect(
+    "방문할 명소",
+    options=attractions['name'].tolist(),
+    default=attractions['name'].tolist()[:10]
+)
+with_meals = st.sidebar.checkbox("명소마다 근처 식사 장소 넣기", value=True)
+itinerary = None
+if chosen:
+    itinerary, total_m = plan_itinerary(attractions[attractions['name'].isin(chosen)], meals=with_meals)
+    layers.append(route_layer(itinerary))
+
+# 지난 실행에서 지도가 돌려준 화면 영역과 줌 레벨 (처음에는 기본 화면)
+if viewport:
+    bounds, zoom = map_view(st.session_state.get("tokyo_map")) or default_view()
+    layer, total, shown = viewport_layer(bounds, zoom)
+    layers.append(layer)
+    st.sidebar.caption(f"화면 안 장소 {total:,}곳 중 {shown:,}곳 표시 (줌 {zoom})")
 
 # Streamlit에 지도 표시
-st_data = st_folium(m, width=700, height=500)
+# 화면 영역 모드에서는 지도 이동/확대와 클릭에만, 아니면 클릭에만 다시 실행되도록 반환값을 제한
+returned_objects = ["last_clicked", "last_object_clicked"]
+if viewport:
+    returned_objects += ["bounds", "zoom"]
+st_data = render_map(
+    m,
+    width=700,
+    height=500,
+    key="tokyo_map",
+    feature_group_to_add=layers or None,
+    returned_objects=returned_objects
+)
+
+# 마커를 클릭했으면 그 마커 위치, 아니면 클릭한 지도 위치를 기준으로 사용
+clicked = (st_data or {}).get("last_object_clicked") or (st_data or {}).get("last_clicked")
+if clicked:
+    point = [clicked["lat"], clicked["lng"]]
+    if point != selected:
+        st.session_state["selected_point"] = point
+        st.rerun()
+
+if itinerary is not None:
+    st.subheader(f"🗺 추천 방문 순서 (총 {format_distance(total_m)})")
+    st.dataframe(
+        itinerary.assign(이동=itinerary['leg_m'].map(format_distance))[['order', 'kind', 'name', '이동']]
+        .rename(columns={'order': '순서', 'kind': '종류', 'name': '이름'}),
+        hide_index=True,
+        use_container_width=True
+    )
+
+if restaurants is not None:
+    st.subheader("🍽 선택한 위치 근처 맛집")
+    if restaurants.empty:
+        st.info("검색 반경 안에 맛집이 없습니다.")
+    else:
+        st.dataframe(
+            restaurants.assign(거리=restaurants['distance_m'].map(format_distance))[['name', '거리', 'desc']]
+            .rename(columns={'name': '이름', 'desc': '설명'}),
+            hide_index=True,
+            use_container_width=True
+        )
+else:
+    st.caption("지도에서 명소나 원하는 위치를 클릭하면 근처 맛집을 찾아드립니다.")
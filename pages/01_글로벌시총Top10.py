@@ -1,50 +1,66 @@
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objs as go
 from datetime import datetime, timedelta
 
+from utils.fx import FxError, to_usd
+from utils.metrics import render_debug_panel, stage, start_metrics_server
+from utils.prices import load_prices
+from utils.universe import global_top10_companies
+from utils.warmup import start_warmup
+
 st.set_page_config(page_title="시총 Top 10 기업 주가 추이", layout="wide")
+
+# 전체 기업 데이터를 백그라운드에서 미리 받아둠 (프로세스당 한 번 시작)
+start_warmup()
+
+# METRICS_PORT가 설정되어 있으면 /metrics 주소로 단계별 시간과 캐시 지표를 내보냄
+start_metrics_server()
+
 st.title("🌍 글로벌 시가총액 Top 10 기업 - 최근 3년 주가 변동")
 
-# 시총 기준 Top 10 기업 및 티커
-top10_companies = {
-    "Apple (AAPL)": "AAPL",
-    "Microsoft (MSFT)": "MSFT",
-    "NVIDIA (NVDA)": "NVDA",
-    "Saudi Aramco (2222.SR)": "2222.SR",  # 사우디거래소
-    "Amazon (AMZN)": "AMZN",
-    "Alphabet (GOOGL)": "GOOGL",
-    "Meta Platforms (META)": "META",
-    "Berkshire Hathaway (BRK-B)": "BRK-B",
-    "Eli Lilly (LLY)": "LLY",
-    "TSMC (TSM)": "TSM"
-}
+# 시가총액 순위로 만든 Top 10 목록 (순위 계산 전에는 기본 목록 사용)
+top10_companies = global_top10_companies()
 
 selected_companies = st.multiselect(
     "🔍 기업을 선택하세요 (복수 선택 가능)",
     list(top10_companies.keys()),
-    default=["Apple (AAPL)", "Microsoft (MSFT)", "NVIDIA (NVDA)"]
+    default=list(top10_companies.keys())[:3]
 )
 
 if selected_companies:
     end_date = datetime.today()
     start_date = end_date - timedelta(days=365*3)
 
+    # 선택된 모든 티커를 한 번의 요청으로 가져옴 (티커 집합, 기간 기준 캐시)
+    tickers = [top10_companies[name] for name in selected_companies]
+    try:
+        with stage("stock_data", period="3y", companies=len(tickers)):
+            prices = load_prices(tickers, start_date, end_date)
+    except Exception as e:
+        st.error(f"주가 데이터를 불러오는 중 오류 발생: {e}")
+        prices = {}
+
     fig = go.Figure()
 
     for name in selected_companies:
         ticker = top10_companies[name]
+        df = prices.get(ticker)
+        if df is None:
+            st.warning(f"{name} 데이터를 불러오지 못했습니다.")
+            continue
+        # 사우디거래소 등 USD가 아닌 상장 종목은 USD로 변환
         try:
-            df = yf.download(ticker, start=start_date, end=end_date)
-            if not df.empty:
-                fig.add_trace(go.Scatter(
-                    x=df.index,
-                    y=df['Close'],
-                    mode='lines',
-                    name=name
-                ))
-        except Exception as e:
-            st.error(f"{name} 데이터를 불러오는 중 오류 발생: {e}")
+            with stage("fx_convert", ticker=ticker):
+                df = to_usd(df, ticker, "3y")
+        except FxError as e:
+            st.warning(str(e))
+            continue
+        fig.add_trace(go.Scatter(
+            x=df.index,
+            y=df['Close'],
+            mode='lines',
+            name=name
+        ))
 
     fig.update_layout(
         title="최근 3년간 종가 기준 주가 추이",
@@ -54,7 +70,10 @@ if selected_companies:
         hovermode="x unified"
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    with stage("plotly_chart", chart="price"):
+        st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("왼쪽에서 하나 이상의 기업을 선택하세요.")
 
+render_debug_panel()
+
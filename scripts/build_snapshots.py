@@ -0,0 +1,86 @@
+"""주식 페이지 스냅샷 생성기
+
+설정 파일(data/snapshots.json)에 적힌 (기업 선택, 기간, 차트 타입) 조합마다 페이지와 같은 방식으로
+주가를 받고 계산해 차트(Plotly JSON, HTML 보고서)와 표(Parquet)를 미리 만들어 둡니다.
+페이지는 선택이 스냅샷과 같으면 외부 요청이나 계산 없이 저장된 결과를 그대로 보여줍니다.
+주기적으로(예: cron) 실행해 SNAPSHOT_MAX_AGE보다 자주 갱신하면 됩니다.
+
+사용 예:
+    python scripts/build_snapshots.py
+    python scripts/build_snapshots.py --pages 02 --periods 1년 최대
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT, "data", "snapshots.json")
+
+
+def page_selection(page, names=None, labels=None):
+    """페이지와 같은 기업 목록, 기간 선택지로 ({기업명: 티커}, {기간 이름: 기간 코드})를 만드는 함수
+
+    names가 없으면 페이지의 기본 선택, labels가 없으면 3년을 사용합니다.
+    """
+    from utils.stockview import page_setup
+
+    universe, default, period_options = page_setup(page)
+    names = names or default
+    missing = [name for name in names if name not in universe]
+    if missing:
+        raise ValueError(f"페이지 {page}에 없는 기업입니다: {', '.join(missing)}")
+    labels = labels or ["3년"]
+    missing = [label for label in labels if label not in period_options]
+    if missing:
+        raise ValueError(f"페이지 {page}에서 고를 수 없는 기간입니다: {', '.join(missing)}")
+    return {name: universe[name] for name in names}, {label: period_options[label] for label in labels}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="주식 페이지 스냅샷 생성기")
+    parser.add_argument("--config", default=CONFIG_PATH, help="스냅샷 설정 파일 (JSON)")
+    parser.add_argument("--pages", nargs="+", help="이 페이지의 설정만 실행 (예: 00 02)")
+    parser.add_argument("--periods", nargs="+", help="설정 대신 사용할 기간 (예: 1년 3년)")
+    parser.add_argument("--out", help="스냅샷 저장 경로 (기본값: SNAPSHOT_DIR)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    if args.out:
+        os.environ["SNAPSHOT_DIR"] = args.out
+    # 스냅샷을 만들 때는 백그라운드 워밍업이 필요 없음
+    os.environ.setdefault("WARMUP_ENABLED", "0")
+
+    from utils.snapshots import CHART_FILES, SNAPSHOT_DIR, build_snapshot
+
+    # Streamlit 밖에서 실행하므로 스크립트 실행 컨텍스트가 없다는 경고는 숨김
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+
+    with open(args.config, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    failed = False
+    for entry in entries:
+        page = str(entry.get("page", "02"))
+        if args.pages and page not in args.pages:
+            continue
+        companies, periods = page_selection(page, entry.get("companies"), args.periods or entry.get("periods"))
+        labels = list(periods)
+        charts = entry.get("charts") or list(CHART_FILES)
+
+        start = time.perf_counter()
+        folder, errors = build_snapshot(companies, periods, charts, root=SNAPSHOT_DIR)
+        print(f"[{page}] {', '.join(companies)} / {', '.join(labels)} -> {folder} "
+              f"({time.perf_counter() - start:.1f}초)")
+        for company, message in errors.items():
+            failed = True
+            print(f"  {company} 오류: {message}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.analytics import TRADING_DAYS, close_matrix, correlation_matrix, performance_metrics
+from utils.providers import synthetic_history
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+@pytest.fixture
+def stock_data():
+    """상장일과 휴장일이 서로 다른 세 기업"""
+    late = synthetic_history("BBB", TODAY).iloc[-700:]
+    holidays = synthetic_history("CCC", TODAY).iloc[-1500:]
+    return {
+        "AAA": synthetic_history("AAA", TODAY).iloc[-1500:],
+        "BBB": late,
+        "CCC": holidays.drop(holidays.index[::11]),
+    }
+
+
+def naive_metrics(column):
+    """기업 하나씩 계산한 기준값 (수익률은 합친 날짜 기준이라 휴장일 다음 날은 비어 있음)"""
+    returns = column.pct_change(fill_method=None).dropna()
+    close = column.dropna()
+    years = (close.index[-1] - close.index[0]).days / 365.25
+    volatility = returns.std() * np.sqrt(TRADING_DAYS)
+    return {
+        '시작 가격': close.iloc[0],
+        '현재 가격': close.iloc[-1],
+        '총 수익률': close.iloc[-1] / close.iloc[0] - 1,
+        '연평균 수익률(CAGR)': (close.iloc[-1] / close.iloc[0]) ** (1 / years) - 1,
+        '최고가': close.max(),
+        '최저가': close.min(),
+        '가격 표준편차': close.std(),
+        '연환산 변동성': volatility,
+        '최대 낙폭': (close / close.cummax() - 1).min(),
+        '샤프 지수': returns.mean() * TRADING_DAYS / volatility,
+    }
+
+
+def test_close_matrix_aligns_dates(stock_data):
+    closes = close_matrix(stock_data)
+    assert list(closes.columns) == list(stock_data)
+    assert closes.index.is_monotonic_increasing
+    for company, data in stock_data.items():
+        assert closes[company].dropna().tolist() == data['Close'].tolist()
+
+
+def test_performance_metrics_match_per_company_calculation(stock_data):
+    closes = close_matrix(stock_data)
+    metrics = performance_metrics(closes)
+    for company in stock_data:
+        expected = naive_metrics(closes[company])
+        assert metrics.loc[company].to_dict() == pytest.approx(expected)
+
+
+def test_correlation_matches_pairwise_calculation(stock_data):
+    closes = close_matrix(stock_data)
+    corr = correlation_matrix(closes)
+    # 휴장일 다음 날 수익률은 비워 두므로 두 기업 모두 값이 있는 날만 비교함
+    returns = closes.pct_change(fill_method=None)
+    both = returns[["AAA", "CCC"]].dropna()
+    assert corr.loc["AAA", "CCC"] == pytest.approx(np.corrcoef(both["AAA"], both["CCC"])[0, 1])
+    assert np.allclose(np.diag(corr), 1.0)
+
+
+def test_empty_input():
+    assert close_matrix({}).empty
+    assert performance_metrics(pd.DataFrame()).empty
@@ -0,0 +1,187 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import fx, prices, ranking, warmup
+from utils.cache import EXPIRED, FRESH, MISS, STALE, TTLCache, cached
+from utils.metrics import registry
+from utils.providers import synthetic_history
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+def test_refresh_fills_the_entry_callers_read():
+    calls = []
+
+    @cached(ttl=60)
+    def load(ticker, period="3y"):
+        calls.append((ticker, period))
+        return len(calls)
+
+    assert load.refresh("AAA", "1y") == 1
+    assert load("AAA", "1y") == 1
+    assert calls == [("AAA", "1y")]
+
+
+def test_positional_keyword_and_default_arguments_share_one_entry():
+    calls = []
+
+    @cached(ttl=60)
+    def quote_for_key_test(ticker, period="3y"):
+        calls.append((ticker, period))
+        return ticker
+
+    quote_for_key_test("KEY", "3y")
+    quote_for_key_test("KEY", period="3y")
+    quote_for_key_test(ticker="KEY")
+    quote_for_key_test("KEY")
+    assert calls == [("KEY", "3y")]
+    # 캐시 통계도 위치 인자에서 찾은 티커로 기록됨
+    assert registry.cache[(quote_for_key_test.__qualname__, "KEY", "miss")] == 1
+    assert registry.cache[(quote_for_key_test.__qualname__, "KEY", "fresh")] == 3
+
+
+def test_warmup_fills_the_entries_pages_read(monkeypatch):
+    loaded = []
+
+    def load_history(ticker, period="3y"):
+        loaded.append((ticker, period))
+        return synthetic_history(ticker, TODAY)
+
+    monkeypatch.setattr(prices, "load_history", load_history)
+    monkeypatch.setattr(fx, "load_history", load_history)
+    monkeypatch.setattr(warmup, "refresh_metadata", lambda tickers: {})
+    monkeypatch.setattr(warmup, "load_prices", lambda *args: {})
+    caches = [prices.load_shared_prices, fx.get_rate_series]
+    for cache in caches:
+        cache.clear()
+    try:
+        succeeded, failed = warmup.warm_universe(["AAA", "005930.KS"], periods=("3y",))
+        assert failed == 0
+        warmed = len(loaded)
+
+        # 페이지와 환율 변환이 부르는 형태 그대로 읽으면 다시 받아오지 않음
+        prices.get_stock_data("AAA")
+        prices.get_stock_data("005930.KS", period="3y")
+        fx.latest_rate("KRW")
+        assert len(loaded) == warmed
+    finally:
+        for cache in caches:
+            cache.clear()
+
+
+def test_warmup_ranking_refresh_is_read_by_top_n(monkeypatch):
+    calls = []
+
+    def load_candidates(path):
+        calls.append(path)
+        return pd.DataFrame({'ticker': ["AAA"], 'name': ["AAA Inc."]})
+
+    monkeypatch.setattr(ranking, "load_candidates", load_candidates)
+    monkeypatch.setattr(ranking.static_table, "get_many", lambda tickers: {})
+    ranking.market_caps.clear()
+    try:
+        # warmup.warm_universe와 같은 형태로 갱신한 뒤 페이지 경로(top_n)로 읽음
+        ranking.market_caps.refresh()
+        ranking.top_n(10)
+        assert calls == [ranking.CANDIDATES_PATH]
+    finally:
+        ranking.market_caps.clear()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 안에 조건을 만족하지 않음"
+        time.sleep(0.01)
+
+
+def test_entry_states_follow_ttl():
+    assert TTLCache("fresh", ttl=60).get("missing") == (None, MISS)
+    for ttl, stale_ttl, state in [(60, 60, FRESH), (0, 60, STALE), (0, 0, EXPIRED)]:
+        cache = TTLCache("states", ttl=ttl, stale_ttl=stale_ttl)
+        cache.set("key", 1)
+        assert cache.get("key") == (1, state)
+
+
+def test_stale_value_is_returned_while_refreshing_in_background():
+    calls = []
+    release = threading.Event()
+
+    @cached(ttl=0, stale_ttl=60)
+    def load(ticker):
+        calls.append(ticker)
+        if len(calls) > 1:
+            release.wait(5)
+        return len(calls)
+
+    assert load("AAA") == 1
+    # 갱신이 끝나지 않아도 기존 값을 바로 반환하고, 갱신은 한 번만 시작함
+    assert load("AAA") == 1
+    assert load("AAA") == 1
+    release.set()
+    wait_for(lambda: load.cache.get((("ticker", "AAA"),))[0] == 2)
+    assert calls == ["AAA", "AAA"]
+
+
+def test_failed_background_refresh_keeps_stale_value():
+    calls = []
+
+    @cached(ttl=0, stale_ttl=60)
+    def load(ticker):
+        calls.append(ticker)
+        if len(calls) > 1:
+            raise ConnectionError("down")
+        return "old"
+
+    assert load("AAA") == "old"
+    assert load("AAA") == "old"
+    wait_for(lambda: len(calls) == 2)
+    assert load("AAA") == "old"
+
+
+def test_expired_value_is_refetched_and_used_when_refetch_fails():
+    results = iter(["old", "new"])
+    failing = False
+
+    @cached(ttl=0, stale_ttl=0)
+    def load(ticker):
+        if failing:
+            raise ConnectionError("down")
+        return next(results)
+
+    assert load("AAA") == "old"
+    # 만료된 값은 기다려서 새로 받아옴
+    assert load("AAA") == "new"
+    failing = True
+    assert load("AAA") == "new"
+    # 처음 받는 값은 대신 쓸 값이 없으므로 오류를 그대로 전달함
+    with pytest.raises(ConnectionError):
+        load("BBB")
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = TTLCache("entries", ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") == (None, MISS)
+    assert cache.get("a") == (1, FRESH) and cache.get("c") == (3, FRESH)
+
+
+def test_memory_limit_evicts_entries_and_skips_oversized_values():
+    block = np.zeros(1000)
+    cache = TTLCache("bytes", ttl=60, max_bytes=2 * block.nbytes)
+    cache.set("a", block)
+    cache.set("b", block.copy())
+    cache.set("c", block.copy())
+    assert len(cache) == 2 and cache.total_bytes == 2 * block.nbytes
+    assert cache.get("a") == (None, MISS)
+
+    cache.set("huge", np.zeros(3000))
+    assert cache.get("huge") == (None, MISS)
+    assert len(cache) == 2
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from utils.charts import candlestick_grid
+from utils.providers import synthetic_history, synthetic_intraday
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+@pytest.mark.parametrize("count", [1, 2, 7, 60, 200])
+def test_candlestick_grid_any_number_of_tickers(count):
+    stock_data = {f"T{i}": synthetic_history(f"T{i}", TODAY).iloc[-250:] for i in range(count)}
+    fig, unit = candlestick_grid(stock_data, budget=300)
+
+    candles = [trace for trace in fig.data if trace.type == 'candlestick']
+    volumes = [trace for trace in fig.data if trace.type == 'bar']
+    assert [trace.name for trace in candles] == list(stock_data)
+    assert len(volumes) == count
+    assert unit
+
+
+def test_candlestick_grid_keeps_intraday_bars_apart():
+    now = TODAY + pd.Timedelta(hours=10)
+    stock_data = {
+        "AAA": synthetic_intraday("AAA", "1m", now).tz_localize("America/New_York"),
+        "BBB": synthetic_intraday("BBB", "1m", now).iloc[-120:],
+    }
+    fig, unit = candlestick_grid(stock_data, budget=800, interval="1m")
+
+    candles = [trace for trace in fig.data if trace.type == 'candlestick']
+    assert unit == "1m"
+    assert [trace.name for trace in candles] == ["AAA", "BBB"]
+    # 봉마다 다른 축 위치를 쓰고(날짜로 합쳐지지 않음) 칸마다 예산 안의 최근 봉만 그림
+    assert len(candles[0].x) == 400
+    assert len(set(candles[0].x)) == len(candles[0].x)
+    assert list(candles[1].x) == sorted(candles[1].x)
+    assert fig.layout.xaxis.ticktext[-1].endswith("10:00")
+
+
+def test_candlestick_grid_hover_shows_dates():
+    stock_data = {f"T{i}": synthetic_history(f"T{i}", TODAY).iloc[-300:] for i in range(2)}
+    overlays = {"SMA 20": {"T0": stock_data["T0"][['Close']].rolling(20).mean()}}
+    fig, unit = candlestick_grid(stock_data, budget=2000, overlays=overlays)
+
+    assert unit == "일봉"
+    assert fig.layout.hovermode == 'closest'
+    for trace in fig.data:
+        # 축 위치가 아니라 그 봉의 날짜를 설명에 표시
+        assert "%{customdata}" in trace.hovertemplate
+        assert "%{x}" not in trace.hovertemplate
+        dates = stock_data[trace.name.split()[0]].index.strftime("%Y-%m-%d")
+        assert list(trace.customdata) == list(dates)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.downsample import (WEBGL_THRESHOLD, downsample_series, lttb_indices, resample_ohlc,
+                              scatter_class)
+from utils.providers import synthetic_history
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+def test_lttb_keeps_endpoints_and_point_count():
+    close = synthetic_history("AAA", TODAY)['Close']
+    reduced = downsample_series(close, 500)
+
+    assert len(reduced) == 500
+    assert reduced.index[0] == close.index[0] and reduced.index[-1] == close.index[-1]
+    assert reduced.index.is_monotonic_increasing
+    # 고른 점은 원래 값 그대로
+    assert reduced.equals(close.loc[reduced.index])
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(1000)
+    y[[123, 456, 789]] = [50.0, -40.0, 30.0]
+    indices = lttb_indices(np.arange(1000), y, 100)
+    assert {123, 456, 789} <= set(indices)
+
+
+def test_short_series_is_returned_as_is():
+    close = synthetic_history("AAA", TODAY)['Close'].iloc[-100:]
+    assert downsample_series(close, 500).equals(close)
+    assert len(lttb_indices(np.arange(10), np.arange(10), 2)) == 10
+
+
+def test_missing_values_are_dropped_before_downsampling():
+    close = synthetic_history("AAA", TODAY)['Close'].copy()
+    close.iloc[::7] = np.nan
+    reduced = downsample_series(close, 300)
+    assert len(reduced) == 300 and not reduced.isna().any()
+
+
+def test_long_ohlc_is_resampled_to_weeks_or_months():
+    data = synthetic_history("AAA", TODAY).iloc[-1000:]
+    bars, unit = resample_ohlc(data, 300)
+    assert unit == "주봉" and len(bars) <= 300
+
+    # 주봉 하나는 그 주 일봉들의 시가(처음), 고가(최대), 저가(최소), 종가(마지막), 거래량(합)
+    week = data[(data.index > bars.index[1] - pd.Timedelta(days=7)) & (data.index <= bars.index[1])]
+    expected = [week['Open'].iloc[0], week['High'].max(), week['Low'].min(),
+                week['Close'].iloc[-1], week['Volume'].sum()]
+    assert bars[['Open', 'High', 'Low', 'Close', 'Volume']].iloc[1].tolist() == expected
+
+    bars, unit = resample_ohlc(data, 100)
+    assert unit == "월봉" and len(bars) <= 100
+
+
+def test_short_ohlc_stays_daily():
+    data = synthetic_history("AAA", TODAY).iloc[-50:]
+    bars, unit = resample_ohlc(data, 100)
+    assert unit == "일봉" and bars is data
+
+
+def test_webgl_only_for_many_points():
+    assert scatter_class(WEBGL_THRESHOLD) is go.Scatter
+    assert scatter_class(WEBGL_THRESHOLD + 1) is go.Scattergl
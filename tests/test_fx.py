@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import fx
+from utils.fx import FxError, convert_ohlc, currency_for, get_rate_series, to_usd
+
+
+def bars(index, close, volume=1000):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.full(len(close), volume)}, index=index)
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    """환율 티커(KRW=X 등)의 일봉을 정해 두고 돌려주는 저장소"""
+    history = {}
+
+    def load_history(ticker, period="3y"):
+        return history.get(ticker, pd.DataFrame())
+
+    monkeypatch.setattr(fx, "load_history", load_history)
+    get_rate_series.clear()
+    yield history
+    get_rate_series.clear()
+
+
+def test_currency_from_exchange_suffix():
+    assert currency_for("AAPL") == "USD"
+    assert currency_for("005930.KS") == "KRW"
+    assert currency_for("7203.t") == "JPY"
+    assert currency_for("VOD.L") == "GBp"
+
+
+def test_convert_fills_missing_rate_days_and_keeps_volume():
+    days = pd.bdate_range("2026-01-05", periods=5)
+    data = bars(days, [1000, 2000, 3000, 4000, 5000], volume=7)
+    # 첫날은 환율이 없고 셋째 날은 환율 제공일이 아님
+    rates = pd.Series([1000.0, 4000.0, 5000.0], index=days[[1, 3, 4]])
+
+    converted = convert_ohlc(data, rates)
+    assert list(converted.index) == list(days[1:])
+    np.testing.assert_allclose(converted['Close'], [2.0, 3.0, 1.0, 1.0])
+    assert (converted['Volume'] == 7).all()
+    assert data['Close'].iloc[1] == 2000
+
+
+def test_pence_quotes_are_converted_to_dollars(rates):
+    days = pd.bdate_range("2026-01-05", periods=3, tz="Europe/London")
+    rates["GBP=X"] = bars(days, [0.8, 0.8, 0.8])
+    series = get_rate_series("GBp", "1y")
+    # 1달러 = 0.8파운드 = 80펜스, 날짜는 타임존 없이 맞춤
+    np.testing.assert_allclose(series, 80.0)
+    assert series.index.tz is None
+
+    data = bars(days.tz_localize(None), [160.0, 160.0, 160.0])
+    np.testing.assert_allclose(to_usd(data, "VOD.L", "1y")['Close'], 2.0)
+
+
+def test_missing_rates_raise_fx_error(rates):
+    data = bars(pd.bdate_range("2026-01-05", periods=3), [1.0, 2.0, 3.0])
+    with pytest.raises(FxError):
+        to_usd(data, "005930.KS", "1y")
+    assert to_usd(data, "AAPL", "1y") is data
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.indicators import INDICATOR_OPTIONS, IndicatorEngine
+from utils.providers import synthetic_history
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+def closes(tickers, lengths):
+    return {ticker: synthetic_history(ticker, TODAY)['Close'].iloc[-length:]
+            for ticker, length in zip(tickers, lengths)}
+
+
+@pytest.mark.parametrize("label", list(INDICATOR_OPTIONS))
+def test_tail_update_with_mixed_stored_lengths(label):
+    """저장된 길이가 다른 티커(상장일이 다르거나 다른 기간으로 저장된 경우)도 함께 이어서 계산"""
+    name, params = INDICATOR_OPTIONS[label]
+    full = closes(["AAA", "BBB"], [1000, 700])
+    engine = IndicatorEngine()
+    engine.compute({ticker: series.iloc[:-1] for ticker, series in full.items()}, name, **params)
+
+    updated = engine.compute(full, name, **params)
+    expected = IndicatorEngine().compute(full, name, **params)
+    for ticker, series in full.items():
+        assert len(updated[ticker]) == len(series)
+        np.testing.assert_allclose(updated[ticker].to_numpy(), expected[ticker].to_numpy(),
+                                   rtol=1e-9, equal_nan=True)
+
+
+def test_changed_last_bar_is_recomputed():
+    full = closes(["AAA"], [300])
+    engine = IndicatorEngine()
+    intraday = full["AAA"].iloc[:-1].copy()
+    intraday.iloc[-1] *= 1.01
+    engine.compute({"AAA": intraday}, 'rsi', period=14)
+
+    updated = engine.compute(full, 'rsi', period=14)["AAA"]
+    expected = IndicatorEngine().compute(full, 'rsi', period=14)["AAA"]
+    np.testing.assert_allclose(updated.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("label", list(INDICATOR_OPTIONS))
+def test_result_does_not_depend_on_earlier_requests(label):
+    """긴 기간을 먼저 요청한 뒤 짧은 기간을 요청해도 처음부터 계산한 값과 같음"""
+    name, params = INDICATOR_OPTIONS[label]
+    full = closes(["AAA"], [500])
+    short = {"AAA": full["AAA"].iloc[-100:]}
+    engine = IndicatorEngine()
+    engine.compute(full, name, **params)
+
+    sliced = engine.compute(short, name, **params)["AAA"]
+    expected = IndicatorEngine().compute(short, name, **params)["AAA"]
+    assert sliced.index.equals(short["AAA"].index)
+    np.testing.assert_allclose(sliced.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_range_ending_earlier_is_sliced_from_stored_values():
+    full = closes(["AAA"], [500])
+    engine = IndicatorEngine()
+    stored = engine.compute(full, 'sma', window=20)["AAA"]
+    head = engine.compute({"AAA": full["AAA"].iloc[:-100]}, 'sma', window=20)["AAA"]
+    assert head.index.equals(full["AAA"].index[:-100])
+    np.testing.assert_array_equal(head.to_numpy(), stored.to_numpy()[:-100])
@@ -0,0 +1,85 @@
+from itertools import permutations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.itinerary import distance_matrix, path_length, plan_itinerary, solve_route, two_opt
+
+rng = np.random.default_rng(21)
+POINTS = [tuple(p) for p in np.column_stack([rng.uniform(35.6, 35.75, 12), rng.uniform(139.65, 139.85, 12)])]
+
+
+def test_route_visits_every_place_once_from_the_start():
+    order, length = solve_route(POINTS, start=3)
+    assert order[0] == 3
+    assert sorted(order.tolist()) == list(range(len(POINTS)))
+    assert length == pytest.approx(path_length(order, distance_matrix(tuple(POINTS))))
+
+
+def test_route_is_no_longer_than_input_order():
+    dist = distance_matrix(tuple(POINTS))
+    _, length = solve_route(POINTS)
+    assert length <= path_length(np.arange(len(POINTS)), dist)
+
+
+def test_two_opt_result_cannot_be_improved_by_any_reversal():
+    dist = distance_matrix(tuple(POINTS))
+    order = two_opt(np.arange(len(POINTS)), dist)
+    best = path_length(order, dist)
+    for i in range(1, len(order) - 1):
+        for j in range(i + 1, len(order)):
+            candidate = order.copy()
+            candidate[i:j + 1] = candidate[i:j + 1][::-1]
+            assert path_length(candidate, dist) >= best - 1e-6
+
+
+def test_small_route_is_optimal():
+    points = POINTS[:7]
+    dist = distance_matrix(tuple(points))
+    _, length = solve_route(points)
+    optimal = min(path_length(np.array((0,) + rest), dist) for rest in permutations(range(1, 7)))
+    assert length == pytest.approx(optimal)
+
+
+def test_empty_route():
+    order, length = solve_route([])
+    assert len(order) == 0 and length == 0.0
+
+
+@pytest.fixture
+def poi_path(tmp_path):
+    """일직선 위의 명소 네 곳과, 명소마다 바로 옆의 맛집 한 곳씩"""
+    rows = []
+    for i in range(4):
+        lon = 139.70 + i * 0.01
+        rows.append({'name': f"명소 {i}", 'category': "attraction", 'lat': 35.68, 'lon': lon, 'desc': ""})
+        rows.append({'name': f"맛집 {i}", 'category': "restaurant", 'lat': 35.6801, 'lon': lon, 'desc': ""})
+    path = tmp_path / "pois.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_itinerary_orders_places_and_inserts_meals(poi_path):
+    places = pd.DataFrame({
+        'name': ["명소 2", "명소 0", "명소 3", "명소 1"],
+        'lat': [35.68] * 4,
+        'lon': [139.72, 139.70, 139.73, 139.71],
+        'desc': [""] * 4,
+    })
+    stops, total = plan_itinerary(places, path=poi_path)
+
+    assert stops['order'].tolist() == list(range(1, 9))
+    assert stops['kind'].tolist() == ["명소", "식사"] * 4
+    # 첫 장소에서 출발해 일직선을 한 방향으로 따라감
+    assert stops['name'].tolist() == ["명소 2", "맛집 2", "명소 3", "맛집 3",
+                                      "명소 1", "맛집 1", "명소 0", "맛집 0"]
+    assert stops['leg_m'].iloc[0] == 0.0
+    assert total == pytest.approx(stops['leg_m'].sum())
+
+
+def test_itinerary_without_meals(poi_path):
+    places = pd.DataFrame({'name': ["명소 0", "명소 1"], 'lat': [35.68, 35.68],
+                           'lon': [139.70, 139.71], 'desc': ["", ""]})
+    stops, _ = plan_itinerary(places, meals=False, path=poi_path)
+    assert stops['kind'].tolist() == ["명소", "명소"]
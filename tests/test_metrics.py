@@ -0,0 +1,43 @@
+import io
+import json
+import logging
+
+import pytest
+
+from utils import metrics
+
+
+@pytest.fixture
+def bare_logger(monkeypatch):
+    """핸들러와 수준이 설정되지 않은 상태의 utils.metrics 로거"""
+    monkeypatch.setattr(metrics.logger, "handlers", [])
+    monkeypatch.setattr(metrics.logger, "level", logging.NOTSET)
+    monkeypatch.setattr(metrics.logger, "propagate", True)
+    monkeypatch.setattr(metrics, "METRICS_LOG", True)
+    # pytest가 루트 로거에 붙이는 로그 수집 핸들러도 없는 상태로 만듦
+    monkeypatch.setattr(logging.getLogger(), "handlers", [])
+    return metrics.logger
+
+
+def test_stage_logs_are_printed_without_app_logging_config(bare_logger, monkeypatch):
+    monkeypatch.setattr(logging.getLogger(), "handlers", [])
+    stream = io.StringIO()
+    metrics.configure_logging(stream)
+
+    with metrics.stage("test_stage", ticker="AAA"):
+        pass
+
+    event = json.loads(stream.getvalue().strip().splitlines()[-1])
+    assert event['stage'] == "test_stage"
+    assert event['ticker'] == "AAA"
+
+
+def test_existing_root_handler_is_used(bare_logger):
+    root_stream = io.StringIO()
+    logging.getLogger().handlers = [logging.StreamHandler(root_stream)]
+    metrics.configure_logging(io.StringIO())
+
+    assert bare_logger.handlers == []
+    with metrics.stage("test_stage"):
+        pass
+    assert '"stage": "test_stage"' in root_stream.getvalue()
@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError, YFRateLimitError
+
+from utils import pipeline
+from utils.pipeline import OPEN, CircuitBreaker, CircuitOpenError, FetchPipeline
+from utils.providers import EmptyResponseError, YahooProvider, synthetic_history
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+@pytest.fixture
+def fast_pipeline(monkeypatch):
+    """재시도 1번, 연속 실패 2번이면 서킷이 열리는 대기 없는 파이프라인"""
+    fresh = FetchPipeline(rate=1000, burst=1000, max_retries=1)
+    fresh._breakers['yahoo'] = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    monkeypatch.setattr(pipeline, "pipeline", fresh)
+    monkeypatch.setattr(pipeline, "backoff_delay", lambda attempt: 0)
+    return fresh
+
+
+def batch(tickers):
+    return pd.concat({ticker: synthetic_history(ticker, TODAY).tail(5) for ticker in tickers}, axis=1)
+
+
+def test_empty_download_opens_circuit(fast_pipeline, monkeypatch):
+    calls = []
+
+    def download(tickers, **kwargs):
+        # yfinance가 오류를 숨기고 빈 결과를 돌려주는 경우
+        calls.append(tickers)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(yf, "download", download)
+    provider = YahooProvider()
+
+    with pytest.raises(EmptyResponseError):
+        provider.download(["AAA", "BBB"], period="5d")
+    assert len(calls) == 2
+    assert fast_pipeline.breaker('yahoo').state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        provider.download(["AAA", "BBB"], period="5d")
+    assert len(calls) == 2
+
+
+def test_rate_limited_history_is_retried(fast_pipeline, monkeypatch):
+    attempts = []
+
+    def history(self, **kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise YFRateLimitError()
+        return synthetic_history(self.ticker, TODAY)
+
+    monkeypatch.setattr(yf.Ticker, "history", history)
+    data = YahooProvider().history("AAA", period="1y")
+    assert not data.empty
+    assert len(attempts) == 2
+    assert fast_pipeline.retries == 1
+
+
+def test_missing_prices_are_empty_without_tripping_circuit(fast_pipeline, monkeypatch):
+    def history(self, **kwargs):
+        raise YFPricesMissingError(self.ticker, "")
+
+    monkeypatch.setattr(yf.Ticker, "history", history)
+    provider = YahooProvider()
+    for _ in range(3):
+        assert provider.history("GONE", start="2026-10-16").empty
+    assert fast_pipeline.breaker('yahoo').failures == 0
+
+
+def test_tickers_missing_from_download_are_fetched_one_by_one(fast_pipeline, monkeypatch):
+    monkeypatch.setattr(yf, "download", lambda tickers, **kwargs: batch(["AAA"]))
+    fetched = []
+
+    def history(self, **kwargs):
+        fetched.append(self.ticker)
+        return synthetic_history(self.ticker, TODAY).tail(5).tz_localize("Asia/Seoul")
+
+    monkeypatch.setattr(yf.Ticker, "history", history)
+    raw = YahooProvider().download(["AAA", "005930.KS"], period="5d")
+    assert fetched == ["005930.KS"]
+    assert set(raw.columns.get_level_values(0)) == {"AAA", "005930.KS"}
+    assert raw.index.tz is None
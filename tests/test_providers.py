@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from utils import providers
+from utils.providers import LocalProvider, YahooProvider, record_fixtures, synthetic_history
+from utils.store import OHLCVStore
+
+TODAY = pd.Timestamp.today().normalize()
+
+
+@pytest.fixture
+def recorded(tmp_path, monkeypatch):
+    """Yahoo 응답처럼 거래소 타임존이 있는 일봉을 녹화한 폴더"""
+    def history(self, ticker, start=None, period=None):
+        return synthetic_history(ticker, TODAY).tz_localize("America/New_York")
+
+    monkeypatch.setattr(YahooProvider, "history", history)
+    monkeypatch.setattr(YahooProvider, "info", lambda self, ticker: {'longName': f"{ticker} Inc."})
+    record_fixtures(["AAA"], root=str(tmp_path))
+    return tmp_path
+
+
+def test_recorded_history_filters_with_naive_start(recorded):
+    provider = LocalProvider(root=str(recorded))
+    start = (TODAY - pd.Timedelta(days=30)).date()
+
+    data = provider.history("AAA", start=start)
+    assert str(data.index.tz) == "America/New_York"
+    assert not data.empty
+    assert data.index[0] >= pd.Timestamp(start).tz_localize("America/New_York")
+    assert provider.info("AAA")['longName'] == "AAA Inc."
+
+
+def test_recorded_and_synthetic_download_together(recorded):
+    provider = LocalProvider(root=str(recorded))
+    start, end = TODAY - pd.Timedelta(days=30), TODAY - pd.Timedelta(days=10)
+
+    raw = provider.download(("AAA", "BBB"), start=start.date(), end=end.date())
+    assert set(raw.columns.get_level_values(0)) == {"AAA", "BBB"}
+    assert raw.index.tz is None
+    assert raw.index.min() >= start and raw.index.max() < end
+
+
+def test_store_loads_recorded_fixtures_offline(recorded, tmp_path, monkeypatch):
+    monkeypatch.setattr(providers, "_provider", LocalProvider(root=str(recorded)))
+    store = OHLCVStore(root=str(tmp_path / "store"))
+
+    data = store.load_history("AAA", "1y")
+    assert not data.empty
+    # 저장된 데이터로 다시 불러와도(장중 갱신 경로) 같은 결과
+    store.min_refresh = pd.Timedelta(0)
+    again = store.load_history("AAA", "1y")
+    assert again.index.equals(data.index)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from utils.providers import synthetic_history
+from utils.shared import SharedPrices
+
+TODAY = pd.Timestamp("2026-10-16")
+
+
+def test_view_shares_arrays_and_copies_on_write():
+    shared = SharedPrices(synthetic_history("AAA", TODAY))
+    close = shared.columns['Close'].copy()
+
+    view = shared.view()
+    assert np.shares_memory(view['Close'].to_numpy(), shared.columns['Close'])
+
+    # 한 세션에서 값을 바꿔도 캐시된 배열과 다른 세션의 뷰는 그대로
+    view.loc[view.index[0], 'Close'] = -1.0
+    view['Close'] *= 2
+    assert np.array_equal(shared.columns['Close'], close)
+    assert np.array_equal(shared.view()['Close'].to_numpy(), close)
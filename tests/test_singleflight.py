@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from utils import singleflight
+from utils.cache import cached
+
+THREADS = 8
+
+
+def run_together(target):
+    """THREADS개의 스레드에서 target을 동시에 실행하고 결과 목록을 반환하는 함수"""
+    results = [None] * THREADS
+
+    def run(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def wait_for_followers(flight, count):
+    """count개의 요청이 진행 중인 호출에 합류할 때까지 기다리는 함수"""
+    deadline = time.monotonic() + 5
+    while flight.stats()['deduplicated'] < count:
+        assert time.monotonic() < deadline, "요청이 합류하지 않음"
+        time.sleep(0.01)
+
+
+def test_concurrent_requests_share_one_call():
+    flight = singleflight.SingleFlight("test")
+    calls = []
+
+    def load(ticker):
+        calls.append(ticker)
+        # 나머지 요청이 모두 합류한 뒤에 끝나도록 함
+        wait_for_followers(flight, THREADS - 1)
+        return {'ticker': ticker}
+
+    results = run_together(lambda: flight.do("AAA", load, "AAA"))
+    assert calls == ["AAA"]
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'calls': 1, 'deduplicated': THREADS - 1, 'inflight': 0}
+
+    # 끝난 뒤의 요청은 새로 호출함
+    flight.do("AAA", lambda: None)
+    assert flight.stats()['calls'] == 2
+
+
+def test_error_is_shared_with_waiting_requests():
+    flight = singleflight.SingleFlight("test")
+
+    def load():
+        wait_for_followers(flight, THREADS - 1)
+        raise ConnectionError("down")
+
+    def request():
+        with pytest.raises(ConnectionError):
+            flight.do("AAA", load)
+        return True
+
+    assert run_together(request) == [True] * THREADS
+    assert flight.stats()['inflight'] == 0
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = singleflight.SingleFlight("test")
+    started = threading.Barrier(2, timeout=5)
+
+    def load(ticker):
+        # 두 키가 모두 호출되어야 통과하므로, 한쪽이 다른 쪽을 기다리면 시간 초과
+        started.wait()
+        return ticker
+
+    results = {}
+    threads = [threading.Thread(target=lambda t=t: results.update({t: flight.do(t, load, t)}))
+               for t in ("AAA", "BBB")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert results == {"AAA": "AAA", "BBB": "BBB"}
+
+
+def test_cache_misses_from_many_sessions_fetch_once():
+    calls = []
+
+    @cached(ttl=60)
+    def load_for_flight_test(ticker):
+        calls.append(ticker)
+        wait_for_followers(load_for_flight_test.flight, THREADS - 1)
+        return [ticker]
+
+    results = run_together(lambda: load_for_flight_test("AAA"))
+    assert calls == ["AAA"]
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from scripts.build_snapshots import page_selection
+from utils import metadata, prices, providers, snapshots, store
+from utils.providers import LocalProvider
+from utils.stockview import COMPANY_PERIOD_OPTIONS, page_setup
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """합성 데이터 제공자와 임시 저장소를 쓰는 환경"""
+    monkeypatch.setattr(providers, "_provider", LocalProvider(root=str(tmp_path / "fixtures"), latency=0))
+    monkeypatch.setattr(store, "_default_store", store.OHLCVStore(root=str(tmp_path / "ohlcv")))
+    monkeypatch.setattr(metadata, "static_table", metadata.StaticTable(str(tmp_path / "metadata.sqlite")))
+    prices.load_shared_prices.clear()
+    yield tmp_path
+    prices.load_shared_prices.clear()
+
+
+def test_build_script_uses_page_selection():
+    companies, periods = page_selection("02", labels=["1년", "최대"])
+    universe, default, period_options = page_setup("02")
+    assert list(companies) == default
+    assert periods == {"1년": period_options["1년"], "최대": period_options["최대"]}
+    # 페이지 00에는 없는 기간으로 스냅샷을 만들지 않음
+    with pytest.raises(ValueError):
+        page_selection("00", labels=["최대"])
+
+
+def test_built_snapshot_is_loaded_for_page_selection(offline):
+    companies, periods = page_selection("02", labels=["1년"])
+    root = str(offline / "snapshots")
+
+    folder, errors = snapshots.build_snapshot(companies, periods, root=root)
+    assert errors == {}
+
+    # 페이지가 기본 선택과 기간 코드로 찾는 스냅샷이 방금 만든 스냅샷
+    snapshot = snapshots.load_snapshot(companies, COMPANY_PERIOD_OPTIONS["1년"], root=root)
+    assert snapshot is not None and snapshot.root == folder
+    assert list(snapshot.cards()) == list(companies)
+    assert list(snapshot.performance("1y").index) == list(companies)
+    assert snapshot.chart("1y", "캔들스틱 차트") is not None
+    assert snapshots.load_snapshot(companies, "3y", root=root) is None
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from utils.spatial import GridIndex, haversine
+
+# 도쿄 주변에 흩어진 점과, 점들이 있는 범위 안팎의 질의 지점
+rng = np.random.default_rng(19)
+LAT = rng.uniform(35.5, 35.9, 3000)
+LON = rng.uniform(139.5, 139.95, 3000)
+QUERIES = np.column_stack([rng.uniform(35.3, 36.1, 40), rng.uniform(139.3, 140.2, 40)])
+
+
+@pytest.fixture(scope="module")
+def index():
+    return GridIndex(LAT, LON, cell_m=500)
+
+
+def brute_force_distances(lat, lon):
+    return haversine(lat, lon, LAT, LON)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_matches_brute_force(index, k):
+    for lat, lon in QUERIES:
+        indices, distances = index.nearest(lat, lon, k=k)
+        expected = np.argsort(brute_force_distances(lat, lon), kind='stable')[:k]
+        assert indices.tolist() == expected.tolist()
+        assert np.allclose(distances, brute_force_distances(lat, lon)[expected])
+
+
+def test_nearest_respects_max_radius(index):
+    for lat, lon in QUERIES:
+        indices, distances = index.nearest(lat, lon, k=20, max_radius_m=800)
+        all_distances = brute_force_distances(lat, lon)
+        expected = np.argsort(all_distances, kind='stable')[:20]
+        expected = expected[all_distances[expected] <= 800]
+        assert indices.tolist() == expected.tolist()
+        assert (distances <= 800).all()
+
+
+def test_within_matches_brute_force(index):
+    for lat, lon in QUERIES:
+        indices, distances = index.within(lat, lon, 1500)
+        all_distances = brute_force_distances(lat, lon)
+        expected = np.flatnonzero(all_distances <= 1500)
+        assert sorted(indices.tolist()) == expected.tolist()
+        assert (np.diff(distances) >= 0).all()
+
+
+@pytest.mark.parametrize("bounds", [
+    (35.6, 139.6, 35.7, 139.8),      # 점들 가운데의 화면
+    (35.0, 139.0, 36.5, 140.5),      # 모든 점을 덮는 화면
+    (35.85, 139.9, 36.2, 140.3),     # 모서리에 걸친 화면
+    (34.0, 139.0, 35.0, 140.0),      # 점이 없는 화면
+    (35.7, 139.7, 35.7001, 139.7001),
+])
+def test_in_bounds_matches_brute_force(index, bounds):
+    south, west, north, east = bounds
+    expected = np.flatnonzero((LAT >= south) & (LAT <= north) & (LON >= west) & (LON <= east))
+    assert index.in_bounds(*bounds).tolist() == expected.tolist()
+
+
+def test_empty_index():
+    index = GridIndex([], [])
+    assert len(index) == 0
+    assert len(index.nearest(35.7, 139.7)[0]) == 0
+    assert len(index.in_bounds(35, 139, 36, 140)) == 0
+
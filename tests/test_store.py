@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import providers
+from utils.store import OHLCVStore, period_start
+
+TODAY = pd.Timestamp.today().normalize()
+
+
+class FakeProvider:
+    """Yahoo처럼 수정 주가와 분할/배당 컬럼을 돌려주는 제공자 (frame을 바꿔 가며 사용)"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def history(self, ticker, start=None, period=None):
+        self.calls.append(start)
+        if start is None:
+            return self.frame
+        return self.frame[self.frame.index >= pd.Timestamp(start)]
+
+
+def bars(index, close):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame({
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Volume': np.full(len(close), 1000), 'Dividends': 0.0, 'Stock Splits': 0.0
+    }, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = OHLCVStore(root=str(tmp_path))
+    store.min_refresh = pd.Timedelta(0)
+    return store
+
+
+def test_delta_only_appends_new_bars(store, monkeypatch):
+    index = pd.bdate_range(end=TODAY - pd.Timedelta(days=7), periods=100)
+    provider = FakeProvider(bars(index, 100 + np.arange(100)))
+    monkeypatch.setattr(providers, "_provider", provider)
+    store.load_history("AAA", "1y")
+
+    longer = pd.bdate_range(start=index[0], end=TODAY)
+    provider.frame = bars(longer, 100 + np.arange(len(longer)))
+    data = store.load_history("AAA", "1y")
+
+    assert provider.calls[-1] == index[-1].date()
+    assert data.index.equals(longer)
+    assert np.array_equal(data['Close'], provider.frame['Close'])
+
+
+def test_split_in_delta_rescales_earlier_bars(store, monkeypatch):
+    index = pd.bdate_range(end=TODAY - pd.Timedelta(days=7), periods=100)
+    provider = FakeProvider(bars(index, np.full(100, 200.0)))
+    monkeypatch.setattr(providers, "_provider", provider)
+    store.load_history("AAA", "1y")
+
+    # 2:1 분할 뒤 Yahoo는 분할 이전 봉까지 모두 절반으로 수정한 값을 돌려줌
+    longer = pd.bdate_range(start=index[0], end=TODAY)
+    after = bars(longer, np.full(len(longer), 100.0))
+    after.loc[longer[len(index)], 'Stock Splits'] = 2.0
+    provider.frame = after
+    data = store.load_history("AAA", "1y")
+
+    assert provider.calls[-2] == index[-1].date()
+    assert provider.calls[-1] == period_start("1y").date()
+    assert np.allclose(data['Close'], 100.0)
+    assert np.allclose(store.read("AAA")[0]['Close'], 100.0)
+
+
+def test_changed_overlap_bar_triggers_refetch(store, monkeypatch):
+    index = pd.bdate_range(end=TODAY - pd.Timedelta(days=7), periods=100)
+    provider = FakeProvider(bars(index, np.full(100, 50.0)))
+    monkeypatch.setattr(providers, "_provider", provider)
+    store.load_history("AAA", "1y")
+
+    # 분할/배당 컬럼 없이 수정 주가만 바뀐 경우 (겹치는 마지막 봉의 시가로 확인)
+    provider.frame = bars(index, np.full(100, 49.0)).drop(columns=['Dividends', 'Stock Splits'])
+    data = store.load_history("AAA", "1y")
+    assert np.allclose(data['Close'], 49.0)
+
+
+def test_stored_dividend_does_not_refetch_again(store, monkeypatch):
+    index = pd.bdate_range(end=TODAY, periods=100)
+    frame = bars(index, np.full(100, 80.0))
+    frame.loc[index[-1], 'Dividends'] = 0.5
+    provider = FakeProvider(frame)
+    monkeypatch.setattr(providers, "_provider", provider)
+    store.load_history("AAA", "1y")
+
+    # 배당이 있는 마지막 봉은 장중 갱신 때마다 다시 받지만 전체를 다시 받지는 않음
+    store.load_history("AAA", "1y")
+    assert provider.calls[-1] == index[-1].date()
+    assert len(provider.calls) == 2
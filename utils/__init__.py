@@ -0,0 +1 @@
+"""여러 페이지에서 공유하는 데이터 로딩 유틸리티"""
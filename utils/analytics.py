@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from utils.store import to_dates
+
+TRADING_DAYS = 252
+
+
+def close_matrix(stock_data, column='Close'):
+    """{기업명: 주가 DataFrame}을 날짜 인덱스, 기업별 컬럼의 넓은 행렬로 합치는 함수"""
+    series = {}
+    for company, data in stock_data.items():
+        values = data[column]
+        values = pd.Series(values.to_numpy(), index=to_dates(data.index))
+        series[company] = values[~values.index.duplicated(keep='last')]
+    if not series:
+        return pd.DataFrame()
+    return pd.DataFrame(series).sort_index()
+
+
+def daily_returns(closes):
+    """일간 수익률 행렬 (상장 전이나 휴장일의 빈 값은 채우지 않음)"""
+    return closes.pct_change(fill_method=None)
+
+
+def performance_metrics(closes, risk_free_rate=0.0):
+    """모든 기업의 성과 지표를 한 번에 계산해 숫자 DataFrame으로 반환하는 함수
+
+    수익률, 변동성, 낙폭은 비율(0.1 = 10%)로 반환하며 표시 형식은 화면에서 정합니다.
+    """
+    if closes.empty:
+        return pd.DataFrame()
+
+    valid = closes.notna()
+    first_date = valid.idxmax()
+    last_date = valid[::-1].idxmax()
+    start_price = closes.bfill().iloc[0]
+    end_price = closes.ffill().iloc[-1]
+
+    returns = daily_returns(closes)
+    years = (last_date - first_date).dt.days / 365.25
+    total_return = end_price / start_price - 1
+    cagr = (end_price / start_price) ** (1 / years.where(years > 0)) - 1
+
+    annual_volatility = returns.std() * np.sqrt(TRADING_DAYS)
+    annual_return = returns.mean() * TRADING_DAYS
+    sharpe = (annual_return - risk_free_rate) / annual_volatility.replace(0, np.nan)
+
+    # 최대 낙폭: 이전 최고가 대비 가장 크게 떨어진 비율
+    max_drawdown = (closes / closes.cummax() - 1).min()
+
+    metrics = pd.DataFrame({
+        '시작 가격': start_price,
+        '현재 가격': end_price,
+        '총 수익률': total_return,
+        '연평균 수익률(CAGR)': cagr,
+        '최고가': closes.max(),
+        '최저가': closes.min(),
+        '가격 표준편차': closes.std(),
+        '연환산 변동성': annual_volatility,
+        '최대 낙폭': max_drawdown,
+        '샤프 지수': sharpe,
+    })
+    metrics.index.name = '기업'
+    return metrics
+
+
+def correlation_matrix(closes):
+    """일간 수익률 기준 기업 간 상관계수 행렬"""
+    return daily_returns(closes).corr()
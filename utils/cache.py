@@ -0,0 +1,182 @@
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import pandas as pd
+
+from utils import singleflight
+from utils.metrics import count_cache
+
+logger = logging.getLogger(__name__)
+
+# 데이터 종류별 유효 기간(초)
+QUOTE_TTL = int(os.environ.get("QUOTE_CACHE_TTL", 5 * 60))          # 장중 시세, 최신 환율
+DAILY_TTL = int(os.environ.get("DAILY_CACHE_TTL", 60 * 60))         # 일봉 데이터
+INFO_TTL = int(os.environ.get("INFO_CACHE_TTL", 24 * 60 * 60))      # 회사명, 섹터 등 잘 바뀌지 않는 정보
+
+# 유효 기간이 지난 뒤에도 백그라운드 갱신 동안 기존 값을 보여줄 수 있는 시간(초)
+STALE_TTL = int(os.environ.get("STALE_CACHE_TTL", 24 * 60 * 60))
+
+# 캐시 하나당 최대 메모리 사용량
+MAX_CACHE_BYTES = int(float(os.environ.get("PRICE_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"   # 갱신 대기 시간도 지났지만 외부 요청이 실패할 때 대신 쓸 수 있는 값
+MISS = "miss"
+
+
+def estimate_size(value):
+    """캐시 값이 차지하는 메모리(바이트)를 대략 계산하는 함수"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if hasattr(value, 'nbytes'):
+        # numpy 배열, 공유 주가 배열 등
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """항목 수와 메모리 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지우는 TTL 캐시"""
+
+    def __init__(self, name, ttl, stale_ttl=STALE_TTL, max_entries=256, max_bytes=MAX_CACHE_BYTES):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(값, 상태)를 반환하는 함수 (상태는 fresh, stale, expired, miss 중 하나)
+
+        만료된 항목도 용량 한도로 밀려날 때까지 남겨 두어, 외부 서버 장애 시 대신 쓸 수 있게 합니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, MISS
+            value, stored_at, _ = entry
+            age = time.monotonic() - stored_at
+            self._entries.move_to_end(key)
+            if age < self.ttl:
+                return value, FRESH
+            if age < self.ttl + self.stale_ttl:
+                return value, STALE
+            return value, EXPIRED
+
+    def set(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # 한도보다 큰 값은 저장하지 않음
+                return
+            self._entries[key] = (value, time.monotonic(), size)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def cached(ttl, stale_ttl=STALE_TTL, max_entries=256, max_bytes=MAX_CACHE_BYTES):
+    """함수 결과를 프로세스 전체에서 공유하는 캐시 데코레이터
+
+    유효 기간이 지난 값은 바로 반환하고 백그라운드에서 새로 받아옵니다(stale-while-revalidate).
+    만료된 값은 새로 받아오되, 외부 요청이 실패하면 만료된 값을 그대로 반환합니다.
+    반환값은 세션끼리 공유되므로 호출한 쪽에서 수정하면 안 됩니다.
+    """
+    def decorator(fn):
+        cache = TTLCache(fn.__qualname__, ttl, stale_ttl, max_entries, max_bytes)
+        refreshing = set()
+        refreshing_lock = threading.Lock()
+        flight = singleflight.group(fn.__qualname__)
+        signature = inspect.signature(fn)
+
+        def make_key(args, kwargs):
+            # 기본값과 키워드 인자를 채워서 f(t, "3y"), f(t, period="3y"), f(t)가 같은 키가 되도록 함
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(bound.arguments.items())
+
+        def load(key, args, kwargs):
+            value = fn(*args, **kwargs)
+            cache.set(key, value)
+            return value
+
+        def refresh(key, args, kwargs):
+            try:
+                flight.do(key, load, key, args, kwargs)
+            except Exception:
+                # 갱신에 실패하면 기존 값을 계속 사용
+                logger.warning("%s 백그라운드 갱신 실패: %s", fn.__qualname__, args, exc_info=True)
+            finally:
+                with refreshing_lock:
+                    refreshing.discard(key)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            value, state = cache.get(key)
+            arguments = dict(key)
+            count_cache(fn.__qualname__, state, arguments.get('ticker') or arguments.get('currency', ""))
+            if state == FRESH:
+                return value
+            if state == STALE:
+                with refreshing_lock:
+                    start = key not in refreshing
+                    refreshing.add(key)
+                if start:
+                    threading.Thread(
+                        target=refresh, args=(key, args, kwargs), daemon=True,
+                        name=f"refresh-{fn.__name__}"
+                    ).start()
+                return value
+
+            # 여러 세션이 동시에 같은 값을 요청하면 실제 호출은 한 번만 함
+            if state == MISS:
+                return flight.do(key, load, key, args, kwargs)
+            try:
+                return flight.do(key, load, key, args, kwargs)
+            except Exception:
+                logger.warning("%s 갱신 실패, 만료된 값 사용: %s", fn.__qualname__, args, exc_info=True)
+                return value
+
+        def force_refresh(*args, **kwargs):
+            """캐시 상태와 관계없이 새로 받아와 저장하는 함수 (워밍업용)"""
+            key = make_key(args, kwargs)
+            return flight.do(key, load, key, args, kwargs)
+
+        wrapper.refresh = force_refresh
+        wrapper.cache = cache
+        wrapper.clear = cache.clear
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
@@ -0,0 +1,349 @@
+"""주식 페이지의 Plotly 차트를 만드는 모듈 (페이지와 스냅샷 생성기가 함께 사용)"""
+
+import math
+import os
+from functools import reduce
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from utils.downsample import downsample_series, point_budget, resample_ohlc, resample_to, scatter_class
+from utils.store import to_dates
+
+# 캔들스틱 격자의 열 수와 기업 한 칸(가격 + 거래량)의 높이(px)
+GRID_COLUMNS = int(os.environ.get("CANDLE_GRID_COLUMNS", "2"))
+GRID_CELL_HEIGHT = int(os.environ.get("CANDLE_GRID_CELL_HEIGHT", "360"))
+
+# 공통 날짜 축에 표시할 눈금 수
+TICK_COUNT = 8
+
+# 집계 단위별 날짜 눈금 형식 (그 밖의 단위는 장중 봉 간격)
+TICK_FORMATS = {"일봉": "%Y-%m-%d", "주봉": "%Y-%m-%d", "월봉": "%Y-%m"}
+INTRADAY_FORMAT = "%m-%d %H:%M"
+
+# 가격 칸과 거래량 칸의 높이 비율
+PRICE_SHARE = 0.75
+
+# 칸 사이 간격(전체 높이 대비)과, 기업이 많을 때 간격이 차지할 수 있는 최대 비율
+GRID_SPACING = 0.02
+GRID_MAX_SPACING = 0.3
+
+COLORS = px.colors.qualitative.Set1
+
+# 가격 위에 겹쳐 그리는 보조 지표의 선 모양 (출력 이름별)
+OVERLAY_DASH = {
+    'sma': 'dot',
+    'ema': 'dash',
+    'mid': 'dash',
+    'upper': 'dot',
+    'lower': 'dot',
+}
+
+# 별도 차트에 그리는 지표의 기준선 (첫 번째 출력 이름별, RSI 과매수/과매도)
+PANEL_LINES = {
+    'rsi': [30, 70],
+}
+
+
+def local_times(index):
+    """타임존만 없앤 시각 인덱스 (장중 봉의 공통 축에 사용)"""
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def date_axis(stock_data, key=to_dates):
+    """모든 기업의 날짜(key로 맞춘 인덱스)를 합쳐 정렬한 공통 축"""
+    return reduce(lambda axis, data: axis.union(key(data.index)),
+                  stock_data.values(), key(next(iter(stock_data.values())).index[:0]))
+
+
+def axis_ticks(axis, unit, count=TICK_COUNT):
+    """공통 축 위치(정수) 중 눈금을 넣을 위치와 날짜 글자"""
+    if len(axis) == 0:
+        return [], []
+    positions = np.unique(np.linspace(0, len(axis) - 1, min(count, len(axis))).round().astype(np.int64))
+    fmt = TICK_FORMATS.get(unit, INTRADAY_FORMAT)
+    return positions.tolist(), axis[positions].strftime(fmt).tolist()
+
+
+def overlay_traces(company, color, overlays, x, aligned):
+    """한 기업의 가격 위에 겹칠 보조 지표 트레이스 목록
+
+    aligned(frame)은 지표 DataFrame을 가격 트레이스와 같은 점들로 맞춰 주는 함수입니다.
+    """
+    traces = []
+    for label, frames in (overlays or {}).items():
+        if company not in frames:
+            continue
+        frame = aligned(frames[company])
+        for output in frame.columns:
+            name = f"{company} {label}" if len(frame.columns) == 1 else f"{company} {label} {output}"
+            traces.append(go.Scatter(
+                x=x,
+                y=frame[output].to_numpy(dtype=np.float32),
+                mode='lines',
+                name=name,
+                legendgroup=company,
+                line=dict(color=color, width=1, dash=OVERLAY_DASH.get(output, 'dot')),
+                hovertemplate=f'{name}: %{{y:.2f}}<extra></extra>'
+            ))
+    return traces
+
+
+def candlestick_grid(stock_data, budget=None, columns=GRID_COLUMNS, overlays=None, interval=None):
+    """선택한 모든 기업의 캔들스틱을 격자로, 기업마다 아래에 거래량 막대를 넣은 그림 하나를 만드는 함수
+
+    모든 기업이 같은 집계 단위와 공통 날짜 축을 쓰며, 트레이스의 x는 날짜 대신 축 위치(int32)라
+    날짜는 눈금 글자로 한 번만 전송됩니다. 가격과 거래량은 float32 배열로 보냅니다.
+    interval(예: "1m")을 주면 장중 봉으로 보고 집계 없이 최근 봉만 시각 축에 그립니다.
+    (그림, 집계 단위 이름)을 반환합니다.
+    """
+    columns = max(1, min(columns, len(stock_data)))
+    # 한 칸의 폭이 좁아지므로 칸마다 보낼 봉 수도 열 수만큼 줄임
+    budget = max(3, (budget or point_budget()) // columns)
+
+    if interval:
+        unit, key = interval, local_times
+        bars = {company: data.tail(budget) for company, data in stock_data.items()}
+    else:
+        # 가장 긴 기업 기준으로 단위를 정해 모든 기업을 같은 단위로 맞춤
+        longest = max(stock_data, key=lambda company: len(stock_data[company]))
+        _, unit = resample_ohlc(stock_data[longest], budget)
+        key = to_dates
+        bars = {company: resample_to(data, unit) for company, data in stock_data.items()}
+    axis = date_axis(bars, key)
+
+    grid_rows = math.ceil(len(bars) / columns)
+    titles = []
+    for row in range(grid_rows):
+        companies = list(bars)[row * columns:(row + 1) * columns]
+        titles += companies + [""] * (columns - len(companies)) + [""] * columns
+
+    # Plotly는 간격 합이 높이를 넘으면 오류를 내므로, 기업이 많으면 간격을 행 수에 맞춰 줄임
+    rows = grid_rows * 2
+    spacing = min(GRID_SPACING if grid_rows > 1 else 2 * GRID_SPACING, GRID_MAX_SPACING / (rows - 1))
+
+    fig = make_subplots(
+        rows=rows,
+        cols=columns,
+        row_heights=[PRICE_SHARE, 1 - PRICE_SHARE] * grid_rows,
+        vertical_spacing=spacing,
+        horizontal_spacing=0.06,
+        subplot_titles=titles
+    )
+
+    # x는 축 위치이므로 마우스를 올렸을 때 보여줄 날짜는 customdata로 따로 보냄
+    labels = np.asarray(axis.strftime(TICK_FORMATS.get(unit, INTRADAY_FORMAT)))
+
+    for i, (company, data) in enumerate(bars.items()):
+        row, col = (i // columns) * 2 + 1, i % columns + 1
+        x = axis.get_indexer(key(data.index)).astype(np.int32)
+        color = COLORS[i % len(COLORS)]
+        dates = labels[x]
+
+        fig.add_trace(go.Candlestick(
+            x=x,
+            open=data['Open'].to_numpy(dtype=np.float32),
+            high=data['High'].to_numpy(dtype=np.float32),
+            low=data['Low'].to_numpy(dtype=np.float32),
+            close=data['Close'].to_numpy(dtype=np.float32),
+            name=company,
+            customdata=dates,
+            hovertemplate=f'<b>{company}</b> %{{customdata}}<br>' +
+                          '시가: %{open:.2f}<br>고가: %{high:.2f}<br>' +
+                          '저가: %{low:.2f}<br>종가: %{close:.2f}<extra></extra>',
+            showlegend=False
+        ), row=row, col=col)
+
+        # 일봉으로 계산한 지표는 집계된 봉의 날짜 기준으로 직전 값을 사용
+        index = key(data.index)
+        for trace in overlay_traces(
+                company, color, overlays, x,
+                lambda frame: frame.set_axis(to_dates(frame.index)).reindex(index, method='ffill')):
+            trace.update(showlegend=False, customdata=dates,
+                         hovertemplate=f'{trace.name} %{{customdata}}: %{{y:.2f}}<extra></extra>')
+            fig.add_trace(trace, row=row, col=col)
+
+        if 'Volume' in data.columns:
+            fig.add_trace(go.Bar(
+                x=x,
+                y=data['Volume'].to_numpy(dtype=np.float32),
+                name=f"{company} 거래량",
+                marker=dict(color=color, line=dict(width=0)),
+                opacity=0.6,
+                customdata=dates,
+                hovertemplate=f'{company} 거래량 %{{customdata}}: %{{y:,.0f}}<extra></extra>',
+                showlegend=False
+            ), row=row + 1, col=col)
+
+        fig.update_yaxes(title_text="USD", row=row, col=col)
+
+    # 모든 칸이 같은 x축 범위를 쓰고, 날짜 눈금은 거래량 칸 아래에만 표시
+    tickvals, ticktext = axis_ticks(axis, unit)
+    fig.update_xaxes(
+        matches='x',
+        rangeslider_visible=False,
+        tickmode='array',
+        tickvals=tickvals,
+        ticktext=ticktext,
+        showticklabels=False,
+        range=[-0.5, len(axis) - 0.5]
+    )
+    for row in range(2, rows + 1, 2):
+        fig.update_xaxes(showticklabels=True, row=row)
+
+    fig.update_layout(
+        height=max(400, grid_rows * GRID_CELL_HEIGHT),
+        # 'x' 모드는 축 위치(정수)를 축 옆에 따로 띄우므로, 트레이스마다 날짜가 들어간 설명만 표시
+        hovermode='closest',
+        bargap=0,
+        template='plotly_white',
+        margin=dict(t=80)
+    )
+    return fig, unit
+
+
+def line_chart(stock_data, selected_period, budget=None, overlays=None):
+    """기업별 종가 라인 차트 (overlays는 {지표 이름: {기업명: 지표 DataFrame}})"""
+    fig = go.Figure()
+
+    close_series = {
+        company: downsample_series(data['Close'], budget)
+        for company, data in stock_data.items()
+    }
+    Scatter = scatter_class(sum(len(series) for series in close_series.values()))
+
+    for i, (company, series) in enumerate(close_series.items()):
+        fig.add_trace(Scatter(
+            x=series.index,
+            y=series,
+            mode='lines',
+            name=company,
+            line=dict(color=COLORS[i % len(COLORS)], width=2),
+            hovertemplate=f'<b>{company}</b><br>' +
+                         'Date: %{x}<br>' +
+                         'Price: $%{y:.2f}<br>' +
+                         '<extra></extra>'
+        ))
+
+        # 보조 지표는 줄인 종가와 같은 날짜의 값만 보냄
+        for trace in overlay_traces(company, COLORS[i % len(COLORS)], overlays, series.index,
+                                    lambda frame: frame.reindex(series.index)):
+            fig.add_trace(trace)
+
+    fig.update_layout(
+        title=f"주가 추이 - {selected_period}",
+        xaxis_title="날짜",
+        yaxis_title="주가 (USD)",
+        hovermode='x unified',
+        height=600,
+        template='plotly_white'
+    )
+    return fig
+
+
+def candlestick_chart(stock_data, selected_period, budget=None, overlays=None):
+    """캔들스틱 격자 차트 (제목에 집계 단위와 기간 표시)"""
+    fig, unit = candlestick_grid(stock_data, budget, overlays=overlays)
+    fig.update_layout(
+        title=f"캔들스틱 차트 ({unit}) - {selected_period}"
+    )
+    return fig
+
+
+def volume_chart(stock_data, selected_period, budget=None):
+    """기업별 거래량 추이 차트"""
+    fig_volume = go.Figure()
+
+    volume_series = {
+        company: downsample_series(data['Volume'], budget)
+        for company, data in stock_data.items()
+    }
+    Scatter = scatter_class(sum(len(series) for series in volume_series.values()))
+
+    for i, (company, series) in enumerate(volume_series.items()):
+        fig_volume.add_trace(Scatter(
+            x=series.index,
+            y=series,
+            mode='lines',
+            name=company,
+            line=dict(color=COLORS[i % len(COLORS)], width=2),
+            hovertemplate=f'<b>{company}</b><br>' +
+                         'Date: %{x}<br>' +
+                         'Volume: %{y:,.0f}<br>' +
+                         '<extra></extra>'
+        ))
+
+    fig_volume.update_layout(
+        title=f"거래량 추이 - {selected_period}",
+        xaxis_title="날짜",
+        yaxis_title="거래량",
+        hovermode='x unified',
+        height=400,
+        template='plotly_white'
+    )
+    return fig_volume
+
+
+def correlation_chart(correlation):
+    """수익률 상관관계 히트맵"""
+    return px.imshow(
+        correlation,
+        text_auto=".2f",
+        zmin=-1,
+        zmax=1,
+        color_continuous_scale='RdBu_r'
+    )
+
+
+def indicator_chart(panels, selected_period, budget=None):
+    """RSI, MACD, 변동성처럼 가격과 단위가 다른 지표를 지표마다 한 칸씩 그린 차트
+
+    panels는 {지표 이름: {기업명: 지표 DataFrame}}이며, 점의 개수는 첫 번째 출력을 기준으로 줄입니다.
+    """
+    companies = list(dict.fromkeys(company for frames in panels.values() for company in frames))
+    fig = make_subplots(
+        rows=len(panels),
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.06,
+        subplot_titles=list(panels)
+    )
+
+    for row, (label, frames) in enumerate(panels.items(), start=1):
+        for company, frame in frames.items():
+            i = companies.index(company)
+            color = COLORS[i % len(COLORS)]
+            sampled = downsample_series(frame.iloc[:, 0], budget)
+            frame = frame.reindex(sampled.index)
+            Scatter = scatter_class(len(frame) * len(frames))
+            for output in frame.columns:
+                name = f"{company}" if len(frame.columns) == 1 else f"{company} {output}"
+                if output == 'hist':
+                    trace = go.Bar(x=frame.index, y=frame[output].to_numpy(dtype=np.float32), name=name,
+                                   marker=dict(color=color, line=dict(width=0)), opacity=0.4)
+                else:
+                    trace = Scatter(x=frame.index, y=frame[output].to_numpy(dtype=np.float32), mode='lines',
+                                    name=name, line=dict(color=color, width=1.5,
+                                                         dash='dot' if output == 'signal' else 'solid'))
+                trace.update(legendgroup=company, showlegend=row == 1 and output == frame.columns[0])
+                fig.add_trace(trace, row=row, col=1)
+        outputs = next(iter(frames.values())).columns if frames else []
+        for level in PANEL_LINES.get(outputs[0] if len(outputs) else None, []):
+            fig.add_hline(y=level, line=dict(color='gray', width=1, dash='dash'), row=row, col=1)
+
+    fig.update_layout(
+        title=f"보조 지표 - {selected_period}",
+        hovermode='x unified',
+        height=max(300, 250 * len(panels)),
+        template='plotly_white'
+    )
+    return fig
+
+
+# 페이지의 차트 타입 이름과 차트를 만드는 함수
+PRICE_CHARTS = {
+    "라인 차트": line_chart,
+    "캔들스틱 차트": candlestick_chart,
+}
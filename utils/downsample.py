@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# 차트 가로 폭(px) 기준으로 트레이스당 보낼 점의 수를 정함 (환경 변수로 변경 가능)
+CHART_WIDTH = int(os.environ.get("CHART_WIDTH", "1200"))
+POINTS_PER_PIXEL = float(os.environ.get("CHART_POINTS_PER_PIXEL", "1.5"))
+
+# 한 차트의 전체 점 개수가 이 값을 넘으면 WebGL(Scattergl)로 그림
+WEBGL_THRESHOLD = int(os.environ.get("CHART_WEBGL_THRESHOLD", "5000"))
+
+# 캔들스틱 집계 단위 (일봉 -> 주봉 -> 월봉 순으로 시도)
+OHLC_RULES = [
+    ("주봉", pd.offsets.Week(weekday=4)),
+    ("월봉", pd.offsets.MonthEnd()),
+]
+
+OHLC_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def point_budget(width=CHART_WIDTH, points_per_pixel=POINTS_PER_PIXEL):
+    """차트 폭에 맞춰 트레이스당 최대 점 개수를 계산하는 함수"""
+    return max(3, int(width * points_per_pixel))
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets로 남길 점의 위치를 고르는 함수"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (n_out - 2)
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # 다음 구간의 평균점과 직전에 고른 점으로 만든 삼각형의 넓이가 가장 큰 점을 선택
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    indices[-1] = n - 1
+    return indices
+
+
+def downsample_series(series, n_out=None):
+    """날짜 인덱스 시계열을 LTTB로 줄이는 함수 (점이 적으면 그대로 반환)"""
+    n_out = n_out or point_budget()
+    series = series.dropna()
+    if len(series) <= n_out:
+        return series
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+    return series.iloc[lttb_indices(x, series.to_numpy(), n_out)]
+
+
+def resample_ohlc(data, max_bars=None):
+    """봉 개수가 예산을 넘으면 주봉이나 월봉으로 집계하는 함수
+
+    (집계된 데이터, 단위 이름)을 반환하며, 일봉 그대로면 단위 이름은 "일봉"입니다.
+    """
+    max_bars = max_bars or point_budget()
+    if len(data) <= max_bars:
+        return data, "일봉"
+
+    for label, _ in OHLC_RULES:
+        resampled = resample_to(data, label)
+        if len(resampled) <= max_bars:
+            break
+    return resampled, label
+
+
+def resample_to(data, label):
+    """정해진 단위("일봉", "주봉", "월봉")로 집계하는 함수 (여러 기업을 같은 단위로 맞출 때 사용)"""
+    rules = dict(OHLC_RULES)
+    if label not in rules:
+        return data
+    agg = {col: how for col, how in OHLC_AGG.items() if col in data.columns}
+    return data.resample(rules[label]).agg(agg).dropna(subset=['Close'])
+
+
+def scatter_class(total_points):
+    """전체 점 개수에 따라 Scatter 또는 Scattergl을 고르는 함수"""
+    return go.Scattergl if total_points > WEBGL_THRESHOLD else go.Scatter
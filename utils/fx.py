@@ -0,0 +1,100 @@
+import numpy as np
+
+from utils.cache import DAILY_TTL, cached
+from utils.store import load_history, to_dates
+
+# 거래소 접미사별 거래 통화
+SUFFIX_CURRENCY = {
+    ".KS": "KRW",   # 한국거래소 (KOSPI)
+    ".KQ": "KRW",   # 한국거래소 (KOSDAQ)
+    ".SR": "SAR",   # 사우디거래소
+    ".T": "JPY",    # 도쿄증권거래소
+    ".HK": "HKD",   # 홍콩거래소
+    ".SS": "CNY",   # 상하이거래소
+    ".SZ": "CNY",   # 선전거래소
+    ".TW": "TWD",   # 대만거래소
+    ".L": "GBp",    # 런던거래소 (펜스 단위)
+    ".PA": "EUR",   # 파리
+    ".DE": "EUR",   # 독일
+    ".AS": "EUR",   # 암스테르담
+    ".MI": "EUR",   # 밀라노
+    ".SW": "CHF",   # 스위스
+    ".TO": "CAD",   # 토론토
+    ".AX": "AUD",   # 호주
+    ".NS": "INR",   # 인도 (NSE)
+    ".BO": "INR",   # 인도 (BSE)
+}
+
+# 보조 단위로 호가되는 통화: (기준 통화, 기준 통화 1단위당 보조 단위 수)
+SUBUNITS = {
+    "GBp": ("GBP", 100),
+}
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+class FxError(Exception):
+    """환율 데이터를 구할 수 없어 변환할 수 없을 때 발생하는 예외"""
+
+
+def currency_for(ticker):
+    """티커의 거래소 접미사로 거래 통화를 판단하는 함수 (접미사가 없으면 USD)"""
+    if "." in ticker:
+        suffix = "." + ticker.rsplit(".", 1)[1].upper()
+        return SUFFIX_CURRENCY.get(suffix, "USD")
+    return "USD"
+
+
+@cached(ttl=DAILY_TTL, max_entries=64)
+def get_rate_series(currency, period="3y"):
+    """USD 1달러당 해당 통화의 환율 시계열을 가져오는 함수 (통화쌍, 기간별로 한 번만 요청)"""
+    base, units = SUBUNITS.get(currency, (currency, 1))
+    data = load_history(f"{base}=X", period)
+    if data is None or data.empty:
+        return None
+
+    rates = data['Close'].dropna() * units
+    rates.index = to_dates(rates.index)
+    rates = rates[~rates.index.duplicated(keep='last')].sort_index()
+    rates = rates[rates > 0]
+    return rates.rename(f"{currency}_USD_Rate")
+
+
+def latest_rate(currency):
+    """가장 최근의 USD 대비 환율을 반환하는 함수"""
+    rates = get_rate_series(currency, "1mo")
+    if rates is None or rates.empty:
+        raise FxError(f"최신 {currency}/USD 환율 데이터를 가져올 수 없습니다.")
+    return float(rates.iloc[-1])
+
+
+def convert_ohlc(data, rates, columns=PRICE_COLUMNS):
+    """날짜 기준으로 환율을 맞춘 뒤 가격 컬럼 전체를 한 번에 USD로 변환하는 함수
+
+    환율이 없는 날짜(환율 제공 시작 이전)의 행은 제외하며, 원본 데이터는 바꾸지 않습니다.
+    """
+    # 주식 거래일과 환율 제공일이 다를 수 있으므로 직전 환율로 채움
+    aligned = rates.reindex(to_dates(data.index), method='ffill').to_numpy()
+    mask = ~np.isnan(aligned)
+
+    converted = data.loc[mask].copy()
+    columns = [col for col in columns if col in converted.columns]
+    # 거래량은 통화 변환의 대상이 아니므로 그대로 둡니다.
+    converted[columns] = converted[columns].to_numpy() / aligned[mask][:, None]
+    return converted
+
+
+def to_usd(data, ticker, period="3y"):
+    """티커의 거래 통화가 USD가 아니면 주가 데이터를 USD로 변환하는 함수"""
+    currency = currency_for(ticker)
+    if currency == "USD" or data is None or data.empty:
+        return data
+
+    rates = get_rate_series(currency, period)
+    if rates is None or rates.empty:
+        raise FxError(f"{currency}/USD 환율 데이터를 가져올 수 없어 {ticker}의 주가를 변환하지 못했습니다.")
+
+    converted = convert_ohlc(data, rates)
+    if converted.empty:
+        raise FxError(f"{ticker}에 대한 환율 데이터가 충분하지 않아 변환하지 못했습니다.")
+    return converted
@@ -0,0 +1,300 @@
+"""이동 평균, 볼린저 밴드, RSI, MACD, 변동성 같은 보조 지표를 계산하는 모듈
+
+지표 값은 (티커, 지표, 매개변수)마다 보관하고, 같은 티커에 새 봉이 붙으면 뒷부분만 이어서 계산합니다.
+거래일이 같은 티커끼리는 하나의 날짜 x 티커 행렬로 묶어 한 번에 계산합니다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.analytics import TRADING_DAYS
+from utils.cache import FRESH, MISS
+from utils.metrics import count_cache
+
+# 보관할 최대 (티커, 지표, 매개변수) 조합 수
+INDICATOR_CACHE_ENTRIES = int(os.environ.get("INDICATOR_CACHE_ENTRIES", "512"))
+
+# 뒷부분만 이어서 계산한 경우의 캐시 상태 이름
+PARTIAL = "partial"
+
+
+def _ewm(values, alpha, start=0, seed=None):
+    """adjust=False 지수 이동 평균의 start 행부터의 값
+
+    seed(start 바로 앞 행의 평균값)가 있으면 그 값에서 이어서 계산하므로 앞부분을 다시 계산하지 않습니다.
+    """
+    if seed is None:
+        return values.ewm(alpha=alpha, adjust=False).mean().iloc[start:]
+    part = pd.concat([seed.to_frame().T, values.iloc[start:]])
+    return part.ewm(alpha=alpha, adjust=False).mean().iloc[1:]
+
+
+def _seed(prev, name):
+    return None if prev is None else prev[name]
+
+
+def sma(closes, start=0, prev=None, window=20):
+    return {'sma': closes.rolling(window).mean().iloc[start:]}
+
+
+def ema(closes, start=0, prev=None, span=20):
+    return {'ema': _ewm(closes, 2 / (span + 1), start, _seed(prev, 'ema'))}
+
+
+def bollinger(closes, start=0, prev=None, window=20, k=2.0):
+    rolling = closes.rolling(window)
+    mid = rolling.mean().iloc[start:]
+    std = rolling.std(ddof=0).iloc[start:]
+    return {'mid': mid, 'upper': mid + k * std, 'lower': mid - k * std}
+
+
+def rsi(closes, start=0, prev=None, period=14):
+    """와일더 방식 RSI (평균 상승폭, 하락폭은 다음 계산에 이어 쓰도록 함께 반환)"""
+    delta = closes.diff()
+    avg_gain = _ewm(delta.clip(lower=0), 1 / period, start, _seed(prev, '_avg_gain'))
+    avg_loss = _ewm(-delta.clip(upper=0), 1 / period, start, _seed(prev, '_avg_loss'))
+    value = 100 - 100 / (1 + avg_gain / avg_loss)
+    # 하락이 전혀 없으면 100
+    value = value.mask((avg_loss == 0) & (avg_gain > 0), 100.0)
+    return {'rsi': value, '_avg_gain': avg_gain, '_avg_loss': avg_loss}
+
+
+def macd(closes, start=0, prev=None, fast=12, slow=26, signal=9):
+    ema_fast = _ewm(closes, 2 / (fast + 1), start, _seed(prev, '_ema_fast'))
+    ema_slow = _ewm(closes, 2 / (slow + 1), start, _seed(prev, '_ema_slow'))
+    line = ema_fast - ema_slow
+    # 시그널선은 MACD선의 지수 이동 평균이므로 이전 시그널 값에서 이어서 계산
+    signal_line = _ewm(line, 2 / (signal + 1), 0, _seed(prev, 'signal'))
+    return {'macd': line, 'signal': signal_line, 'hist': line - signal_line,
+            '_ema_fast': ema_fast, '_ema_slow': ema_slow}
+
+
+def volatility(closes, start=0, prev=None, window=20):
+    """로그 수익률의 이동 표준편차를 연환산한 변동성"""
+    returns = np.log(closes).diff()
+    return {'volatility': returns.rolling(window).std().iloc[start:] * np.sqrt(TRADING_DAYS)}
+
+
+class Indicator:
+    """지표 하나의 계산 함수와 이어서 계산할 때 필요한 이전 봉 수"""
+
+    def __init__(self, compute, lookback, overlay):
+        self.compute = compute
+        self.lookback = lookback
+        # 가격과 같은 축에 겹쳐 그리는 지표인지 여부 (아니면 별도 차트)
+        self.overlay = overlay
+
+
+INDICATORS = {
+    'sma': Indicator(sma, lambda window=20: window, overlay=True),
+    'ema': Indicator(ema, lambda span=20: 1, overlay=True),
+    'bollinger': Indicator(bollinger, lambda window=20, k=2.0: window, overlay=True),
+    'rsi': Indicator(rsi, lambda period=14: 1, overlay=False),
+    'macd': Indicator(macd, lambda fast=12, slow=26, signal=9: 1, overlay=False),
+    'volatility': Indicator(volatility, lambda window=20: window + 1, overlay=False),
+}
+
+
+class IndicatorEngine:
+    """티커별 지표 값을 (티커, 지표, 매개변수)마다 보관하고 새 봉이 붙으면 뒷부분만 계산하는 엔진
+
+    보관하는 값에는 다음 계산에 이어 쓸 내부 상태(이름이 _로 시작하는 출력)와 종가도 함께 들어갑니다.
+    출력은 (출력 수 x 봉 수) 배열 하나에 담아 두고, 화면에 보여줄 DataFrame은 그 배열을 복사 없이 가리킵니다.
+    이동 평균 등은 첫 봉에 따라 값이 달라지므로, 요청의 첫 봉 날짜도 키에 넣어 어떤 순서로 요청해도
+    처음부터 계산한 값과 같게 합니다. 첫 봉이 같고 더 앞에서 끝나는 범위는 계산 없이 잘라서 반환합니다.
+    """
+
+    def __init__(self, max_entries=INDICATOR_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _plan(entry, dates, close):
+        """저장된 값으로 처리할 방법 (상태, 새 봉이 시작하는 요청 내 위치, 저장된 값 중 유지할 행 수)"""
+        if entry is None:
+            return MISS, 0, 0
+        stored_dates, stored_close = entry['dates'], entry['close']
+        # 키에 첫 봉 날짜가 들어 있으므로 첫 봉은 같고, 과거 값이 바뀌었으면(분할 조정 등) 전체를 다시 계산
+        if stored_close[0] != close[0]:
+            return MISS, 0, 0
+
+        last = stored_dates[-1]
+        j = dates.searchsorted(last)
+        if j == len(dates):
+            return FRESH, None, None
+        if dates[j] != last:
+            return MISS, 0, 0
+
+        # 마지막 저장 봉은 장중에 바뀔 수 있으므로 값이 다르면 그 봉부터 다시 계산
+        changed = close[j] != stored_close[-1]
+        new_from = j if changed else j + 1
+        if new_from == len(dates):
+            return FRESH, None, None
+        keep = len(stored_dates) - 1 if changed else len(stored_dates)
+        if keep == 0:
+            return MISS, 0, 0
+        return PARTIAL, new_from, keep
+
+    def compute(self, closes, name, **params):
+        """{티커: 종가 Series}의 지표 값을 {티커: 지표 DataFrame(컬럼: 출력 이름)}으로 반환하는 함수
+
+        반환값은 요청한 종가의 날짜 범위로 잘린 공유 값이므로 수정하면 안 됩니다.
+        """
+        indicator = INDICATORS[name]
+        lookback = indicator.lookback(**params)
+        params_key = tuple(sorted(params.items()))
+
+        results = {}
+        jobs = {}
+        for ticker, series in closes.items():
+            index, close = series.index, series.to_numpy(dtype=np.float64)
+            missing = np.isnan(close)
+            if missing.any():
+                index, close = index[~missing], close[~missing]
+            if len(close) == 0:
+                continue
+            # 날짜 비교는 DatetimeIndex 대신 datetime64 배열로 (티커마다 pandas 호출 비용을 줄임)
+            dates = index.values
+            key = (ticker, name, params_key, dates[0])
+            entry = self._get(key)
+            state, new_from, keep = self._plan(entry, dates, close)
+            count_cache("indicator", state, ticker)
+            if state == FRESH:
+                results[ticker] = self._slice(entry, dates)
+                continue
+
+            if state == MISS:
+                jobs[ticker] = (key, dates, index, close, dates, close, 0, None, None, 0)
+                continue
+
+            # 저장된 종가 뒤에 새 봉을 붙이고, 창(window) 계산에 필요한 만큼의 이전 봉만 함께 계산
+            start = min(lookback, keep)
+            # 요청이 저장된 첫 봉부터라면 요청의 인덱스가 합친 인덱스와 같으므로 새로 만들지 않음
+            if new_from == keep:
+                merged_index = index
+            else:
+                merged_index = entry['index'][:keep].append(index[new_from:])
+            merged_close = np.concatenate([entry['close'][:keep], close[new_from:]])
+            pending_dates = np.concatenate([entry['dates'][keep - start:keep], dates[new_from:]])
+            pending_close = merged_close[keep - start:]
+            jobs[ticker] = (key, dates, merged_index, merged_close, pending_dates, pending_close,
+                            start, entry['block'][:, keep - 1], entry, keep)
+
+        # 계산할 구간의 날짜가 같은 티커(같은 거래소 등)끼리 묶어 하나의 행렬로 계산
+        # 티커마다 저장된 길이(keep)가 달라도 계산할 구간은 각자의 pending 배열이므로 행이 맞음
+        for batch in self._batches(jobs):
+            first = jobs[batch[0]]
+            start, prev = first[6], first[7]
+            matrix = pd.DataFrame(np.column_stack([jobs[ticker][5] for ticker in batch]),
+                                  index=pd.DatetimeIndex(first[4]), columns=batch, copy=False)
+            if prev is not None:
+                # 이어서 계산할 때 쓰는 직전 값 (행: 티커, 컬럼: 출력 이름)
+                prev = pd.DataFrame(np.vstack([jobs[ticker][7] for ticker in batch]),
+                                    index=batch, columns=pd.Index(first[8]['outputs']))
+            outputs = indicator.compute(matrix, start, prev, **params)
+            # 화면에 보여줄 출력을 앞에, 내부 상태를 뒤에 두어 앞쪽 행만 DataFrame으로 보여줌
+            names = sorted(outputs, key=lambda output: output.startswith('_'))
+            # 컬럼 인덱스는 배치마다 한 번만 만들어 티커들이 함께 씀
+            public = pd.Index([output for output in names if not output.startswith('_')])
+            # (출력, 새 봉, 티커) 배열
+            new_values = np.stack([outputs[output].to_numpy(dtype=np.float64) for output in names])
+
+            for column, ticker in enumerate(batch):
+                key, dates, merged_index, merged_close, _, _, _, _, entry, keep = jobs[ticker]
+                new = new_values[:, :, column]
+                block = new.copy() if entry is None else np.concatenate([entry['block'][:, :keep], new], axis=1)
+                entry = {
+                    'index': merged_index,
+                    'dates': merged_index.values,
+                    'close': merged_close,
+                    'outputs': names,
+                    'block': block,
+                    'public': pd.DataFrame(block[:len(public)].T, index=merged_index, columns=public, copy=False),
+                }
+                self._put(key, entry)
+                results[ticker] = self._slice(entry, dates)
+
+        return {ticker: results[ticker] for ticker in closes if ticker in results}
+
+    @staticmethod
+    def _batches(jobs):
+        """계산할 구간(앞쪽 창 포함)의 날짜와 계산 방식이 같은 티커끼리 묶는 함수"""
+        batches = []
+        for ticker, job in jobs.items():
+            for batch in batches:
+                other = jobs[batch[0]]
+                if (other[6] == job[6] and (other[7] is None) == (job[7] is None)
+                        and np.array_equal(other[4], job[4])):
+                    batch.append(ticker)
+                    break
+            else:
+                batches.append([ticker])
+        return batches
+
+    @staticmethod
+    def _slice(entry, dates):
+        """저장된 값 중 요청한 날짜 범위"""
+        public, stored = entry['public'], entry['dates']
+        lo = stored.searchsorted(dates[0], side='left')
+        hi = stored.searchsorted(dates[-1], side='right')
+        return public if lo == 0 and hi == len(stored) else public.iloc[lo:hi]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_engine = IndicatorEngine()
+
+
+def compute_indicator(closes, name, **params):
+    """기본 엔진으로 지표를 계산하는 함수 (closes는 {티커: 종가 Series})"""
+    return _engine.compute(closes, name, **params)
+
+
+# 페이지에서 고를 수 있는 지표 (표시 이름: (지표, 매개변수))
+INDICATOR_OPTIONS = {
+    "SMA 20": ('sma', {'window': 20}),
+    "SMA 60": ('sma', {'window': 60}),
+    "EMA 20": ('ema', {'span': 20}),
+    "볼린저 밴드 (20, 2)": ('bollinger', {'window': 20, 'k': 2.0}),
+    "RSI 14": ('rsi', {'period': 14}),
+    "MACD (12, 26, 9)": ('macd', {'fast': 12, 'slow': 26, 'signal': 9}),
+    "변동성 20일": ('volatility', {'window': 20}),
+}
+
+
+def company_indicators(stock_data, companies, labels):
+    """선택한 지표를 기업별로 계산해 가격 위에 겹칠 지표와 별도 차트로 그릴 지표로 나누는 함수
+
+    stock_data는 {기업명: 주가 DataFrame}, companies는 {기업명: 티커}이며
+    ({지표 이름: {기업명: DataFrame}}, {지표 이름: {기업명: DataFrame}})을 반환합니다.
+    """
+    overlays, panels = {}, {}
+    tickers = {company: companies.get(company, company) for company in stock_data}
+    closes = {tickers[company]: data['Close'] for company, data in stock_data.items()}
+    for label in labels:
+        name, params = INDICATOR_OPTIONS[label]
+        values = compute_indicator(closes, name, **params)
+        frames = {company: values[ticker] for company, ticker in tickers.items() if ticker in values}
+        (overlays if INDICATORS[name].overlay else panels)[label] = frames
+    return overlays, panels
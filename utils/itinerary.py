@@ -0,0 +1,143 @@
+"""선택한 명소를 어떤 순서로 방문할지 정하는 여행 동선 계산 모듈"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import INFO_TTL, cached
+from utils.poi import POI_PATH, RESTAURANT, build_index
+from utils.spatial import haversine
+
+# 2-opt 개선을 반복하는 최대 횟수와 식사 장소 후보 수
+MAX_PASSES = int(os.environ.get("ITINERARY_MAX_PASSES", "50"))
+MEAL_CANDIDATES = int(os.environ.get("ITINERARY_MEAL_CANDIDATES", "5"))
+
+
+@cached(ttl=INFO_TTL, max_entries=32)
+def distance_matrix(points):
+    """(위도, 경도) 튜플들 사이의 거리 행렬(m) (장소 조합별로 캐시되는 읽기 전용 배열)"""
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    lat, lon = coords[:, 0], coords[:, 1]
+    matrix = haversine(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    matrix.flags.writeable = False
+    return matrix
+
+
+def nearest_neighbour(dist, start=0):
+    """현재 위치에서 가장 가까운 미방문 장소로 계속 이동하는 초기 경로"""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[order[-1]])
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        visited[nxt] = True
+    return np.array(order)
+
+
+def path_length(order, dist):
+    return float(dist[order[:-1], order[1:]].sum()) if len(order) > 1 else 0.0
+
+
+def two_opt(order, dist, max_passes=MAX_PASSES):
+    """경로의 한 구간을 뒤집어 총 거리가 줄어들면 바꾸는 개선을 반복하는 함수
+
+    출발지는 고정하고 도착지는 자유로운 열린 경로 기준이며,
+    구간 끝 j에 대한 이득은 한 번에 배열로 계산합니다.
+    """
+    order = np.array(order)
+    n = len(order)
+    if n < 4:
+        return order
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = order[i - 1], order[i]
+            js = np.arange(i + 1, n)
+            c = order[js]
+            # 마지막 장소 다음은 없으므로 그 구간의 연결 비용은 0
+            d = order[np.minimum(js + 1, n - 1)]
+            next_cost = np.where(js + 1 < n, dist[c, d], 0.0)
+            new_cost = np.where(js + 1 < n, dist[b, d], 0.0)
+            delta = dist[a, c] + new_cost - dist[a, b] - next_cost
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = js[best]
+                order[i:j + 1] = order[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return order
+
+
+def solve_route(points, start=0):
+    """방문 순서(입력 위치 번호 배열)와 총 거리(m)를 반환하는 함수"""
+    points = tuple((float(lat), float(lon)) for lat, lon in points)
+    if not points:
+        return np.empty(0, dtype=np.int64), 0.0
+    dist = distance_matrix(points)
+    order = two_opt(nearest_neighbour(dist, start), dist)
+    return order, path_length(order, dist)
+
+
+def pick_meals(stops, path=POI_PATH, candidates=MEAL_CANDIDATES):
+    """명소마다 식사 장소를 하나씩 고르는 함수 (다음 명소로 가는 길에서 덜 돌아가는 맛집 우선)
+
+    stops는 방문 순서대로 정렬된 명소 DataFrame이며, 맛집이 없으면 해당 명소는 None입니다.
+    같은 맛집은 두 번 고르지 않습니다.
+    """
+    restaurants, index = build_index(path, os.path.getmtime(path), RESTAURANT)
+    used = set()
+    meals = []
+    lat, lon = stops['lat'].to_numpy(), stops['lon'].to_numpy()
+    for i in range(len(stops)):
+        rows, distances = index.nearest(lat[i], lon[i], candidates + len(used))
+        keep = np.array([row not in used for row in rows], dtype=bool)
+        rows, distances = rows[keep][:candidates], distances[keep][:candidates]
+        if len(rows) == 0:
+            meals.append(None)
+            continue
+        if i + 1 < len(stops):
+            # 명소 -> 맛집 -> 다음 명소로 갈 때 늘어나는 거리가 가장 작은 곳
+            onward = haversine(restaurants['lat'].to_numpy()[rows], restaurants['lon'].to_numpy()[rows],
+                               lat[i + 1], lon[i + 1])
+            detour = distances + onward - haversine(lat[i], lon[i], lat[i + 1], lon[i + 1])
+        else:
+            detour = distances
+        row = int(rows[np.argmin(detour)])
+        used.add(row)
+        meals.append(row)
+    return restaurants, meals
+
+
+def plan_itinerary(places, meals=True, path=POI_PATH):
+    """명소 DataFrame(name, lat, lon, desc)으로 방문 순서를 정한 일정표를 만드는 함수
+
+    반환값은 (일정 DataFrame, 총 이동 거리(m))이며 일정에는 순번, 종류, 이전 장소에서의 거리가 들어갑니다.
+    """
+    if places.empty:
+        return places.assign(kind=[], leg_m=[]), 0.0
+
+    order, _ = solve_route(list(zip(places['lat'], places['lon'])))
+    stops = places.iloc[order].reset_index(drop=True).assign(kind="명소")
+
+    if meals:
+        restaurants, picks = pick_meals(stops, path)
+        rows = []
+        for i, stop in enumerate(stops.to_dict('records')):
+            rows.append(stop)
+            if picks[i] is not None:
+                meal = restaurants.iloc[picks[i]].to_dict()
+                meal['kind'] = "식사"
+                rows.append(meal)
+        stops = pd.DataFrame(rows, columns=stops.columns)
+
+    lat, lon = stops['lat'].to_numpy(), stops['lon'].to_numpy()
+    legs = np.concatenate([[0.0], haversine(lat[:-1], lon[:-1], lat[1:], lon[1:])])
+    stops = stops.assign(leg_m=legs)
+    stops.insert(0, 'order', np.arange(1, len(stops) + 1))
+    return stops, float(legs.sum())
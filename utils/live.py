@@ -0,0 +1,123 @@
+"""장중 1분/5분 봉을 주기적으로 받아 기존 시계열 뒤에 붙이는 실시간 모드용 모듈"""
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.fx import PRICE_COLUMNS, currency_for, latest_rate
+from utils.providers import get_provider
+from utils.store import merge_bars
+
+logger = logging.getLogger(__name__)
+
+# 화면을 새로 고치는 주기(초), 티커당 메모리에 남기는 최대 봉 수
+LIVE_REFRESH = int(os.environ.get("LIVE_REFRESH_SECONDS", "30"))
+LIVE_MAX_BARS = int(os.environ.get("LIVE_MAX_BARS", "1000"))
+
+# 여러 세션이 같은 티커를 보고 있어도 이 간격(초)보다 자주 외부에 요청하지 않음
+LIVE_MIN_POLL = float(os.environ.get("LIVE_MIN_POLL_SECONDS", "10"))
+
+
+class IntradayBuffer:
+    """티커, 봉 간격별 장중 봉을 프로세스 전체에서 공유하고 마지막 봉 이후만 새로 받는 버퍼
+
+    마지막 봉은 장중에 계속 바뀌므로 새로 받을 때는 마지막 봉의 시각부터 다시 요청합니다.
+    """
+
+    def __init__(self, max_bars=LIVE_MAX_BARS, min_poll=LIVE_MIN_POLL):
+        self.max_bars = max_bars
+        self.min_poll = min_poll
+        self._series = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, key):
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def update(self, ticker, interval="1m"):
+        """새 봉을 받아 붙인 뒤 전체 장중 봉을 반환하는 함수 (요청이 실패하면 기존 봉 반환)
+
+        반환값은 세션끼리 공유되므로 수정하면 안 됩니다.
+        """
+        key = (ticker, interval)
+        with self._lock(key):
+            data, polled_at = self._series.get(key, (None, 0.0))
+            if data is not None and time.monotonic() - polled_at < self.min_poll:
+                return data
+
+            start = None if data is None or data.empty else data.index[-1]
+            try:
+                fetched = get_provider().intraday(ticker, interval=interval, start=start)
+            except Exception:
+                if data is None:
+                    raise
+                logger.warning("%s 장중 데이터 요청 실패, 기존 봉 사용", ticker, exc_info=True)
+                return data
+
+            if fetched is not None and not fetched.empty:
+                fetched = to_usd_live(fetched, ticker)
+                data = merge_bars(data, fetched).tail(self.max_bars)
+            elif data is None:
+                data = fetched
+            self._series[key] = (data, time.monotonic())
+            return data
+
+    def clear(self):
+        with self._locks_guard:
+            self._series.clear()
+
+
+def to_usd_live(data, ticker):
+    """장중 봉을 최신 환율 하나로 USD로 변환하는 함수 (USD 종목은 그대로 반환)"""
+    currency = currency_for(ticker)
+    if currency == "USD":
+        return data
+    rate = latest_rate(currency)
+    columns = [col for col in PRICE_COLUMNS if col in data.columns]
+    converted = data.copy()
+    converted[columns] = converted[columns].to_numpy() / rate
+    return converted
+
+
+_buffer = IntradayBuffer()
+
+
+def load_intraday(ticker, interval="1m"):
+    """기본 버퍼를 통해 장중 봉을 가져오는 함수 (load_parallel에 넘길 수 있는 형태)"""
+    return _buffer.update(ticker, interval)
+
+
+def bars_since(data, last):
+    """마지막으로 표시한 시각(last) 이후의 봉 (마지막 봉은 값이 바뀌었을 수 있어 다시 포함)"""
+    if last is None:
+        return data
+    return data[data.index >= last]
+
+
+def _concat(values, new, keep, max_points):
+    new = np.asarray(new)
+    if keep == 0:
+        return new[-max_points:]
+    return np.concatenate([np.asarray(values)[:keep], new])[-max_points:]
+
+
+def append_bars(trace, new, fields, max_points=LIVE_MAX_BARS):
+    """Plotly 트레이스에 새 봉만 이어 붙이는 함수 (그림을 처음부터 다시 만들지 않음)
+
+    fields는 {트레이스 속성: 데이터 컬럼}이며(예: {'y': 'Close'}),
+    새 봉 중 이미 그린 시각과 겹치는 점은 새 값으로 바꿉니다.
+    """
+    if new.empty:
+        return
+    x = np.asarray(trace.x if trace.x is not None else [])
+    new_x = new.index.to_numpy()
+    # 새 봉의 첫 시각 이후로 그려진 점은 버리고 새 값으로 채움
+    keep = len(x) - int(np.sum(x >= new_x[0])) if len(x) else 0
+    updates = {'x': _concat(x, new_x, keep, max_points)}
+    for attr, column in fields.items():
+        updates[attr] = _concat(getattr(trace, attr), new[column].to_numpy(), keep, max_points)
+    trace.update(**updates)
@@ -0,0 +1,45 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# 동시에 보낼 수 있는 최대 요청 수 (환경 변수로 변경 가능)
+MAX_WORKERS = int(os.environ.get("STOCK_FETCH_WORKERS", "8"))
+
+
+def load_parallel(companies, fetch, *args, max_workers=MAX_WORKERS):
+    """선택된 기업마다 fetch(티커, *args)를 병렬로 호출하는 함수
+
+    companies는 {기업명: 티커} 딕셔너리입니다.
+    일부 기업이 실패해도 나머지 결과는 유지하고, 실패 내용은 errors에 기업별로 담아 반환합니다.
+    """
+    results = {}
+    errors = {}
+    if not companies:
+        return results, errors
+
+    # 작업 스레드에서도 현재 세션의 컨텍스트를 사용할 수 있도록 전달
+    ctx = get_script_run_ctx()
+
+    def run(ticker):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch(ticker, *args)
+
+    workers = max(1, min(max_workers, len(companies)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {company: executor.submit(run, ticker) for company, ticker in companies.items()}
+
+        # 선택 순서를 유지하기 위해 제출 순서대로 결과를 모음
+        for company, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[company] = str(e)
+                continue
+            if result is None or getattr(result, 'empty', False):
+                errors[company] = "데이터가 없습니다."
+                continue
+            results[company] = result
+
+    return results, errors
@@ -0,0 +1,215 @@
+"""도쿄 지도를 만드는 모듈 (많은 장소는 브라우저에서 클러스터로 묶어 표시)"""
+
+import os
+import threading
+
+import folium
+from folium.plugins import FastMarkerCluster
+from streamlit_folium import st_folium
+
+from utils.cache import INFO_TTL, cached
+from utils.poi import ATTRACTION, NEARBY_COUNT, RESTAURANT, POI_PATH, build_index, load_pois
+from utils.spatial import degrees_per_pixel, thin
+
+# 지도 중심 좌표 (도쿄 중심)
+TOKYO_CENTER = [35.6804, 139.7690]
+
+TOKYO_ZOOM = 12
+
+# 관광 명소가 이 개수 이하면 개별 마커로, 넘으면 클러스터로 표시
+MARKER_LIMIT = int(os.environ.get("MAP_MARKER_LIMIT", "200"))
+
+# 화면 영역 모드: 장소가 이 개수를 넘으면 기본으로 켜고, 한 화면에 보내는 마커 수와 마커 간격(px)을 제한
+VIEWPORT_THRESHOLD = int(os.environ.get("MAP_VIEWPORT_THRESHOLD", "2000"))
+VIEWPORT_MAX_MARKERS = int(os.environ.get("MAP_VIEWPORT_MAX_MARKERS", "300"))
+VIEWPORT_SPACING_PX = int(os.environ.get("MAP_VIEWPORT_SPACING_PX", "24"))
+
+# 카테고리별 아이콘 (AwesomeMarkers)
+ICONS = {
+    ATTRACTION: ('blue', 'info-sign'),
+    RESTAURANT: ('red', 'cutlery'),
+}
+DEFAULT_ICON = ('gray', 'map-marker')
+
+# 클러스터의 각 점을 브라우저에서 마커로 만드는 함수 (row: [위도, 경도, 이름, 설명])
+CLUSTER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: '%s', markerColor: '%s', prefix: 'glyphicon'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup('<b>' + row[2] + '</b><br>' + row[3]);
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+# 캐시된 지도는 세션끼리 공유되고, st_folium이 그릴 때 지도 객체를 건드리므로 한 번에 하나씩 그림
+_render_lock = threading.Lock()
+
+
+def format_distance(meters):
+    return f"{meters:,.0f}m" if meters < 1000 else f"{meters / 1000:.1f}km"
+
+
+def nearby_html(restaurants, index, lat, lon, k=NEARBY_COUNT):
+    """명소 팝업에 넣을 근처 맛집 목록 HTML"""
+    rows, distances = index.nearest(lat, lon, k)
+    if len(rows) == 0:
+        return ""
+    items = "".join(
+        f"<li>{restaurants['name'].iat[row]} ({format_distance(distance)})</li>"
+        for row, distance in zip(rows, distances)
+    )
+    return f"<br><br>🍽 <b>근처 맛집</b><ul style='margin:0;padding-left:16px'>{items}</ul>"
+
+
+def add_markers(m, places, category, extra=None):
+    """장소들을 개별 마커로 추가하는 함수 (적은 수의 강조할 장소용)
+
+    extra는 장소별로 팝업 끝에 붙일 HTML 목록입니다.
+    """
+    color, icon = ICONS.get(category, DEFAULT_ICON)
+    extra = extra or [""] * len(places)
+    for place, html in zip(places.itertuples(index=False), extra):
+        folium.Marker(
+            location=[place.lat, place.lon],
+            popup=folium.Popup(f"<b>{place.name}</b><br>{place.desc}{html}", max_width=300),
+            tooltip=place.name,
+            icon=folium.Icon(color=color, icon=icon)
+        ).add_to(m)
+
+
+def add_cluster(m, places, category, name=None):
+    """장소들을 클러스터 하나로 추가하는 함수 (마커는 브라우저에서 만들어짐)"""
+    color, icon = ICONS.get(category, DEFAULT_ICON)
+    data = places[['lat', 'lon', 'name', 'desc']].to_numpy().tolist()
+    FastMarkerCluster(
+        data,
+        callback=CLUSTER_CALLBACK % (icon, color),
+        name=name or category
+    ).add_to(m)
+
+
+def lazy_categories(pois):
+    """화면 영역 모드에서 기본 지도에 넣지 않고 화면에 보이는 부분만 보낼 카테고리"""
+    counts = pois['category'].value_counts()
+    return [category for category, count in counts.items()
+            if not (category == ATTRACTION and count <= MARKER_LIMIT)]
+
+
+@cached(ttl=INFO_TTL, max_entries=8)
+def build_base_map(path, mtime, viewport=False):
+    """장소 파일로 기본 지도를 만드는 함수 (파일이 바뀔 때만 다시 만듦)
+
+    viewport=True면 개별 마커로 표시할 명소만 넣고, 나머지는 viewport_layer()로 화면에 보이는 부분만 추가합니다.
+    """
+    pois = load_pois(path, mtime)
+    restaurants, index = build_index(path, mtime, RESTAURANT)
+    m = folium.Map(location=TOKYO_CENTER, zoom_start=TOKYO_ZOOM)
+    lazy = lazy_categories(pois) if viewport else []
+
+    for category, places in pois.groupby('category', sort=False):
+        if category in lazy:
+            continue
+        if category == ATTRACTION and len(places) <= MARKER_LIMIT:
+            # 명소 팝업에 공간 색인으로 찾은 가장 가까운 맛집을 함께 표시
+            extra = [nearby_html(restaurants, index, place.lat, place.lon)
+                     for place in places.itertuples(index=False)]
+            add_markers(m, places, category, extra)
+        else:
+            add_cluster(m, places, category)
+    return m
+
+
+def get_base_map(path=POI_PATH, viewport=False):
+    return build_base_map(path, os.path.getmtime(path), viewport)
+
+
+def default_view(center=TOKYO_CENTER, zoom=TOKYO_ZOOM, width=700, height=500):
+    """지도가 처음 그려질 때의 화면 영역 (south, west, north, east)과 줌 레벨"""
+    half_lon = degrees_per_pixel(zoom) * width / 2
+    half_lat = half_lon * height / width
+    return (center[0] - half_lat, center[1] - half_lon, center[0] + half_lat, center[1] + half_lon), zoom
+
+
+def map_view(st_data):
+    """st_folium이 돌려준 값에서 (south, west, north, east), 줌 레벨을 꺼내는 함수 (없으면 None)"""
+    bounds = (st_data or {}).get("bounds") or {}
+    south_west, north_east = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    if south_west.get("lat") is None or north_east.get("lat") is None or not st_data.get("zoom"):
+        return None
+    return (south_west["lat"], south_west["lng"], north_east["lat"], north_east["lng"]), st_data["zoom"]
+
+
+def viewport_layer(bounds, zoom, path=POI_PATH):
+    """화면 영역 안의 장소만 줌 레벨에 맞게 솎아내 마커 레이어로 만드는 함수
+
+    반환값은 (레이어, 화면 안 장소 수, 표시한 마커 수)입니다.
+    """
+    mtime = os.path.getmtime(path)
+    layer = folium.FeatureGroup(name="화면 영역 장소")
+    total = shown = 0
+    for category in lazy_categories(load_pois(path, mtime)):
+        places, index = build_index(path, mtime, category)
+        rows = index.in_bounds(*bounds)
+        total += len(rows)
+        lat, lon = places['lat'].to_numpy()[rows], places['lon'].to_numpy()[rows]
+        rows = rows[thin(lat, lon, zoom, VIEWPORT_SPACING_PX, limit=VIEWPORT_MAX_MARKERS)]
+        shown += len(rows)
+
+        color, _ = ICONS.get(category, DEFAULT_ICON)
+        for place in places.iloc[rows].itertuples(index=False):
+            folium.CircleMarker(
+                location=[place.lat, place.lon],
+                radius=6,
+                color=color,
+                fill=True,
+                fill_opacity=0.8,
+                popup=f"<b>{place.name}</b><br>{place.desc}",
+                tooltip=place.name
+            ).add_to(layer)
+    return layer, total, shown
+
+
+def render_map(m, **kwargs):
+    """공유 지도를 Streamlit에 표시하는 함수 (st_folium의 반환값을 그대로 반환)"""
+    with _render_lock:
+        return st_folium(m, **kwargs)
+
+
+def nearby_layer(point, restaurants):
+    """선택한 지점과 근처 맛집을 강조하는 레이어 (기본 지도를 다시 그리지 않고 추가됨)"""
+    layer = folium.FeatureGroup(name="근처 맛집")
+    folium.CircleMarker(
+        location=point, radius=8, color='green', fill=True, fill_opacity=0.7,
+        tooltip="선택한 위치"
+    ).add_to(layer)
+    for place in restaurants.itertuples(index=False):
+        folium.PolyLine([point, [place.lat, place.lon]], color='green', weight=2, dash_array='5').add_to(layer)
+        folium.Marker(
+            location=[place.lat, place.lon],
+            popup=f"<b>{place.name}</b><br>{place.desc}<br>{format_distance(place.distance_m)}",
+            tooltip=f"{place.name} ({format_distance(place.distance_m)})",
+            icon=folium.Icon(color='green', icon='cutlery')
+        ).add_to(layer)
+    return layer
+
+
+def route_layer(stops):
+    """일정 순서대로 장소를 잇는 선과 순번 마커 레이어 (stops는 plan_itinerary의 결과)"""
+    layer = folium.FeatureGroup(name="여행 동선")
+    points = stops[['lat', 'lon']].to_numpy().tolist()
+    if len(points) > 1:
+        folium.PolyLine(points, color='purple', weight=4, opacity=0.8).add_to(layer)
+    for stop in stops.itertuples(index=False):
+        color = 'purple' if stop.kind == "명소" else 'orange'
+        folium.Marker(
+            location=[stop.lat, stop.lon],
+            tooltip=f"{stop.order}. {stop.name} ({stop.kind})",
+            icon=folium.DivIcon(
+                icon_size=(24, 24),
+                icon_anchor=(12, 12),
+                html=(f"<div style='background:{color};color:white;border-radius:12px;width:24px;height:24px;"
+                      f"text-align:center;line-height:24px;font-size:11px;font-weight:bold'>{stop.order}</div>")
+            )
+        ).add_to(layer)
+    return layer
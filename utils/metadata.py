@@ -0,0 +1,248 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils import singleflight
+from utils.cache import EXPIRED, FRESH, QUOTE_TTL, STALE, TTLCache
+from utils.fx import FxError, currency_for, latest_rate
+from utils.loader import MAX_WORKERS
+from utils.metrics import count_cache
+from utils.providers import get_provider
+from utils.store import STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+# 회사명, 섹터, 상장 주식 수를 보관하는 SQLite 파일
+METADATA_DB = os.environ.get(
+    "METADATA_DB",
+    os.path.join(os.path.dirname(STORE_DIR), "metadata.sqlite")
+)
+
+# 잘 바뀌지 않는 정보를 다시 받아오는 주기(초)
+STATIC_TTL = int(os.environ.get("METADATA_STATIC_TTL", 30 * 24 * 60 * 60))
+
+class StaticTable:
+    """회사명, 섹터, 상장 주식 수를 티커별로 디스크에 보관하는 테이블"""
+
+    def __init__(self, path=METADATA_DB):
+        self.path = path
+        self._rows = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS company ("
+            " ticker TEXT PRIMARY KEY, name TEXT, sector TEXT,"
+            " shares REAL, updated_at REAL)"
+        )
+        return conn
+
+    def _load(self):
+        # 처음 사용할 때 한 번만 디스크에서 전체를 읽어 메모리에 둠
+        if self._rows is None:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT ticker, name, sector, shares, updated_at FROM company")
+                self._rows = {
+                    ticker: {'name': name, 'sector': sector, 'shares': shares, 'updated_at': updated_at}
+                    for ticker, name, sector, shares, updated_at in rows
+                }
+        return self._rows
+
+    def get_many(self, tickers):
+        with self._lock:
+            rows = self._load()
+            return {ticker: rows[ticker] for ticker in tickers if ticker in rows}
+
+    def stale(self, tickers, now=None):
+        """없거나 유효 기간이 지난 티커 목록"""
+        now = now or time.time()
+        rows = self.get_many(tickers)
+        return [t for t in tickers if t not in rows or now - rows[t]['updated_at'] >= STATIC_TTL]
+
+    def upsert_many(self, records):
+        if not records:
+            return
+        with self._lock:
+            rows = self._load()
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO company (ticker, name, sector, shares, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(t, r['name'], r['sector'], r['shares'], r['updated_at']) for t, r in records.items()]
+                )
+            rows.update(records)
+
+
+static_table = StaticTable()
+
+_quotes = TTLCache("quotes", QUOTE_TTL, max_entries=4096)
+_quote_flight = singleflight.group("quotes")
+
+
+def fetch_static(ticker):
+    """회사명, 섹터, 상장 주식 수를 받아오는 함수 (오래 보관하므로 가끔만 호출됨)"""
+    info = get_provider().info(ticker)
+    shares = info.get('sharesOutstanding')
+    return {
+        'name': info.get('longName') or info.get('shortName') or 'N/A',
+        'sector': info.get('sector', 'N/A'),
+        'shares': float(shares or 0),
+        'updated_at': time.time(),
+    }
+
+
+def refresh_static(tickers, force=False, max_workers=MAX_WORKERS):
+    """유효 기간이 지난 티커의 고정 정보를 병렬로 받아 테이블에 저장하는 함수
+
+    실패한 티커는 {티커: 오류 메시지}로 반환합니다.
+    """
+    targets = list(tickers) if force else static_table.stale(tickers)
+    errors = {}
+    if not targets:
+        return errors
+
+    def run(ticker):
+        try:
+            return ticker, fetch_static(ticker), None
+        except Exception as e:
+            return ticker, None, str(e)
+
+    records = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+        for ticker, record, error in executor.map(run, targets):
+            if record is not None:
+                records[ticker] = record
+            else:
+                errors[ticker] = error
+    static_table.upsert_many(records)
+    return errors
+
+
+def _last_closes(raw, tickers):
+    """일괄 요청 결과에서 티커별 마지막 종가를 꺼내는 함수"""
+    closes = {}
+    if raw is None or raw.empty:
+        return closes
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            close = raw[ticker]['Close']
+        else:
+            close = raw['Close']
+        close = close.dropna()
+        if not close.empty:
+            closes[ticker] = float(close.iloc[-1])
+    return closes
+
+
+def _fetch_quotes(tickers):
+    """여러 티커의 최신 종가를 한 번의 요청으로 받아 캐시에 넣는 함수"""
+    raw = get_provider().download(tickers, period="5d", auto_adjust=False)
+    closes = _last_closes(raw, tickers)
+    for ticker, price in closes.items():
+        _quotes.set(ticker, price)
+    return closes
+
+
+def _refresh_quotes_in_background(tickers):
+    def run():
+        try:
+            _quote_flight.do(tickers, _fetch_quotes, tickers)
+        except Exception:
+            logger.warning("시세 백그라운드 갱신 실패: %s", tickers, exc_info=True)
+
+    threading.Thread(target=run, daemon=True, name="refresh-quotes").start()
+
+
+def get_quotes(tickers):
+    """티커별 최신 가격(현지 통화)을 반환하는 함수
+
+    캐시에 없는 티커만 모아서 한 번에 요청하고, 유효 기간이 지난 값은 그대로 쓰면서 백그라운드에서 갱신합니다.
+    요청이 실패하면 만료된 값이라도 있는 티커는 그 값을 사용합니다.
+    """
+    prices = {}
+    missing = []
+    stale = []
+    expired = {}
+    for ticker in tickers:
+        price, state = _quotes.get(ticker)
+        count_cache("quotes", state, ticker)
+        if state in (FRESH, STALE):
+            prices[ticker] = price
+            if state == STALE:
+                stale.append(ticker)
+        else:
+            missing.append(ticker)
+            if state == EXPIRED:
+                expired[ticker] = price
+
+    if stale:
+        _refresh_quotes_in_background(tuple(sorted(stale)))
+    if missing:
+        key = tuple(sorted(missing))
+        try:
+            prices.update(_quote_flight.do(key, _fetch_quotes, key))
+        except Exception:
+            if not expired:
+                raise
+            logger.warning("시세 요청 실패, 만료된 값 사용: %s", key, exc_info=True)
+            prices.update(expired)
+    return prices
+
+
+def load_company_info(companies):
+    """선택된 기업들의 회사 정보를 한 번에 가져오는 함수 (USD 외 통화는 환율 변환 포함)
+
+    companies는 {기업명: 티커} 딕셔너리이며 (회사 정보, 오류) 딕셔너리 두 개를 반환합니다.
+    """
+    tickers = list(dict.fromkeys(companies.values()))
+    static_errors = refresh_static(tickers)
+    static = static_table.get_many(tickers)
+    quotes = get_quotes(tickers)
+
+    infos = {}
+    errors = {}
+    for company, ticker in companies.items():
+        if ticker not in quotes:
+            errors[company] = static_errors.get(ticker, "시세 데이터가 없습니다.")
+            continue
+
+        row = static.get(ticker, {})
+        price = quotes[ticker]
+        market_cap = price * (row.get('shares') or 0)
+
+        # 현재 가격과 시가총액을 USD로 변환
+        currency = currency_for(ticker)
+        if currency != "USD":
+            try:
+                rate = latest_rate(currency)
+            except FxError as e:
+                errors[company] = str(e)
+                continue
+            price = price / rate
+            market_cap = market_cap / rate
+
+        infos[company] = {
+            'name': row.get('name', 'N/A'),
+            'sector': row.get('sector', 'N/A'),
+            'marketCap': market_cap,
+            'currentPrice': price
+        }
+    return infos, errors
+
+
+def refresh_metadata(tickers):
+    """전체 기업의 고정 정보와 시세를 일괄로 새로 받아오는 함수 (워밍업용)"""
+    tickers = list(dict.fromkeys(tickers))
+    errors = refresh_static(tickers)
+    key = tuple(sorted(tickers))
+    _quote_flight.do(key, _fetch_quotes, key)
+    return errors
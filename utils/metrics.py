@@ -0,0 +1,245 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils import singleflight
+from utils.pipeline import pipeline
+
+logger = logging.getLogger(__name__)
+
+# 단계별 시간을 구조화 로그(JSON 한 줄)로 남길지 여부
+# 켜져 있으면 앱에서 logging을 따로 설정하지 않아도 utils.metrics 로거가 INFO 로그를 표준 에러로 출력합니다.
+# 루트 로거에 이미 핸들러가 있으면(logging.basicConfig 등) 그 설정을 따릅니다.
+METRICS_LOG = os.environ.get("METRICS_LOG", "1") != "0"
+
+# Prometheus 형식 지표를 내보낼 포트 (0이면 사용하지 않음)
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+
+# 사이드바 디버그 패널 표시 여부 (URL에 ?debug=1을 붙여도 표시됨)
+DEBUG_PANEL = os.environ.get("DEBUG_PANEL", "0") == "1"
+
+
+def configure_logging(stream=None):
+    """구조화 로그가 실제로 출력되도록 이 모듈의 로거 수준과 핸들러를 설정하는 함수"""
+    logger.setLevel(logging.INFO)
+    if logger.handlers or logging.getLogger().handlers:
+        return
+    # 메시지가 이미 JSON 한 줄이므로 다른 형식 없이 그대로 출력
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+def _session_id():
+    # 스크립트 실행 컨텍스트가 없는 스레드(워밍업 등)에서는 None
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return None
+    return ctx.session_id if ctx is not None else None
+
+
+class Registry:
+    """단계별 소요 시간과 캐시 적중 횟수를 프로세스 전체에서 모으는 저장소"""
+
+    def __init__(self, recent=500):
+        self.stages = {}
+        self.cache = Counter()
+        self.recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def record_stage(self, name, seconds, labels):
+        event = {'event': 'stage', 'stage': name, 'ms': round(seconds * 1000, 2),
+                 'session': _session_id(), 'at': time.time(), **labels}
+        with self._lock:
+            count, total, longest = self.stages.get(name, (0, 0.0, 0.0))
+            self.stages[name] = (count + 1, total + seconds, max(longest, seconds))
+            self.recent.append(event)
+        if METRICS_LOG:
+            logger.info(json.dumps(event, ensure_ascii=False, default=str))
+
+    def record_cache(self, function, state, ticker=""):
+        with self._lock:
+            self.cache[(function, ticker, state)] += 1
+        logger.debug("cache %s %s %s", function, ticker, state)
+
+    def session_events(self, session):
+        with self._lock:
+            return [event for event in self.recent if event['session'] == session]
+
+    def cache_summary(self):
+        """함수별 캐시 상태 횟수 {함수: {상태: 횟수}}"""
+        summary = {}
+        with self._lock:
+            for (function, _, state), count in self.cache.items():
+                summary.setdefault(function, Counter())[state] += count
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self.stages.clear()
+            self.cache.clear()
+            self.recent.clear()
+
+
+registry = Registry()
+
+if METRICS_LOG:
+    configure_logging()
+
+
+@contextmanager
+def stage(name, **labels):
+    """with 블록이 걸린 시간을 단계 이름으로 기록하는 함수"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.record_stage(name, time.perf_counter() - start, labels)
+
+
+def timed(name):
+    """함수 실행 시간을 단계 이름으로 기록하는 데코레이터"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_cache(function, state, ticker=""):
+    registry.record_cache(function, state, ticker)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus():
+    """수집한 지표를 Prometheus 텍스트 형식으로 만드는 함수"""
+    lines = []
+    with registry._lock:
+        stages = dict(registry.stages)
+        cache = dict(registry.cache)
+
+    lines.append("# HELP app_stage_seconds 단계별 소요 시간")
+    lines.append("# TYPE app_stage_seconds summary")
+    for name, (count, total, _) in sorted(stages.items()):
+        lines.append(f"app_stage_seconds_count{_labels(stage=name)} {count}")
+        lines.append(f"app_stage_seconds_sum{_labels(stage=name)} {total:.6f}")
+    lines.append("# HELP app_stage_seconds_max 단계별 최대 소요 시간")
+    lines.append("# TYPE app_stage_seconds_max gauge")
+    for name, (_, _, longest) in sorted(stages.items()):
+        lines.append(f"app_stage_seconds_max{_labels(stage=name)} {longest:.6f}")
+
+    lines.append("# HELP app_cache_requests_total 캐시 조회 횟수 (state: fresh, stale, expired, miss)")
+    lines.append("# TYPE app_cache_requests_total counter")
+    for (function, ticker, state), count in sorted(cache.items()):
+        lines.append(f"app_cache_requests_total{_labels(function=function, ticker=ticker, state=state)} {count}")
+
+    fetch = pipeline.metrics()
+    lines.append("# TYPE app_fetch_queue_depth gauge")
+    lines.append(f"app_fetch_queue_depth {fetch['queue_depth']}")
+    lines.append("# TYPE app_fetch_in_flight gauge")
+    lines.append(f"app_fetch_in_flight {fetch['in_flight']}")
+    lines.append("# TYPE app_fetch_requests_total counter")
+    for result in ('submitted', 'succeeded', 'failed', 'rejected'):
+        lines.append(f"app_fetch_requests_total{_labels(result=result)} {fetch[result]}")
+    lines.append("# TYPE app_fetch_retries_total counter")
+    lines.append(f"app_fetch_retries_total {fetch['retries']}")
+    lines.append("# HELP app_fetch_circuit_open 서킷이 열려 있으면 1")
+    lines.append("# TYPE app_fetch_circuit_open gauge")
+    for host, state in sorted(fetch['circuits'].items()):
+        lines.append(f"app_fetch_circuit_open{_labels(host=host)} {int(state != 'closed')}")
+
+    lines.append("# TYPE app_singleflight_calls_total counter")
+    lines.append("# TYPE app_singleflight_deduplicated_total counter")
+    for name, group_stats in sorted(singleflight.stats().items()):
+        lines.append(f"app_singleflight_calls_total{_labels(group=name)} {group_stats['calls']}")
+        lines.append(f"app_singleflight_deduplicated_total{_labels(group=name)} {group_stats['deduplicated']}")
+
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집기 요청마다 로그가 쌓이지 않도록 함
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """/metrics 주소로 Prometheus 지표를 내보내는 서버를 시작하는 함수 (프로세스당 한 번)"""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            except OSError:
+                logger.warning("지표 서버를 시작할 수 없습니다 (포트 %d)", port, exc_info=True)
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-server").start()
+        return _server
+
+
+def render_debug_panel():
+    """사이드바에 이 세션의 단계별 시간과 캐시 적중 현황을 보여주는 함수"""
+    import pandas as pd
+    import streamlit as st
+
+    if not (DEBUG_PANEL or st.query_params.get("debug") == "1"):
+        return
+
+    with st.sidebar.expander("🛠 디버그 정보"):
+        events = registry.session_events(_session_id())[-30:]
+        if events:
+            st.caption("최근 단계별 소요 시간 (ms)")
+            st.dataframe(
+                pd.DataFrame(events)[['stage', 'ms']].iloc[::-1],
+                hide_index=True,
+                use_container_width=True
+            )
+
+        summary = registry.cache_summary()
+        if summary:
+            st.caption("캐시 조회 (함수별)")
+            st.dataframe(
+                pd.DataFrame(summary).T.fillna(0).astype(int),
+                use_container_width=True
+            )
+
+        fetch = pipeline.metrics()
+        st.caption(
+            f"요청 대기열 {fetch['queue_depth']} · 처리 중 {fetch['in_flight']} · "
+            f"재시도 {fetch['retries']} · 거절 {fetch['rejected']}"
+        )
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+# 외부 요청 속도와 동시성 설정 (환경 변수로 변경 가능)
+REQUESTS_PER_SECOND = float(os.environ.get("FETCH_RATE", "5"))
+BURST = int(os.environ.get("FETCH_BURST", "10"))
+CONCURRENCY = int(os.environ.get("FETCH_CONCURRENCY", "8"))
+QUEUE_SIZE = int(os.environ.get("FETCH_QUEUE_SIZE", "256"))
+MAX_RETRIES = int(os.environ.get("FETCH_MAX_RETRIES", "3"))
+BASE_DELAY = float(os.environ.get("FETCH_BASE_DELAY", "0.5"))
+MAX_DELAY = float(os.environ.get("FETCH_MAX_DELAY", "8"))
+FAILURE_THRESHOLD = int(os.environ.get("FETCH_FAILURE_THRESHOLD", "5"))
+RESET_TIMEOUT = float(os.environ.get("FETCH_RESET_TIMEOUT", "60"))
+
+# 다시 시도해도 결과가 같은 오류 (잘못된 인자 등)는 재시도하지 않고 서킷 실패로도 세지 않음
+NON_RETRYABLE = (ValueError, KeyError, TypeError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class PipelineError(Exception):
+    """요청 파이프라인에서 요청을 보내지 않고 거절할 때 발생하는 예외"""
+
+
+class CircuitOpenError(PipelineError):
+    """외부 서버 장애로 서킷이 열려 있어 요청을 보내지 않을 때 발생하는 예외"""
+
+
+class QueueFullError(PipelineError):
+    """대기열이 가득 차서 요청을 받을 수 없을 때 발생하는 예외"""
+
+
+class TokenBucket:
+    """초당 요청 수를 제한하는 토큰 버킷 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """연속 실패가 기준을 넘으면 일정 시간 요청을 막고, 이후 한 번 시험해 보는 서킷 브레이커"""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    def allow(self):
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self._trial_running = False
+        if self.state == HALF_OPEN:
+            # 반쯤 열린 상태에서는 시험 요청 하나만 보냄
+            if self._trial_running:
+                return False
+            self._trial_running = True
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_running = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning("서킷 열림: 연속 실패 %d회", self.failures)
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+def backoff_delay(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    """재시도 대기 시간 (지수적으로 늘어나는 상한 안에서 무작위로 선택)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class FetchPipeline:
+    """외부 데이터 요청을 속도 제한, 재시도, 서킷 브레이커를 거쳐 보내는 비동기 파이프라인
+
+    이벤트 루프는 별도 스레드에서 돌고, 다른 스레드에서는 call()로 요청을 넣고 결과를 기다립니다.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST, concurrency=CONCURRENCY,
+                 queue_size=QUEUE_SIZE, max_retries=MAX_RETRIES):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+        self._loop = None
+        self._queue = None
+        self._buckets = {}
+        self._breakers = {}
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch")
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._queue = asyncio.Queue(maxsize=self.queue_size)
+                for _ in range(self.concurrency):
+                    loop.create_task(self._worker())
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name="fetch-pipeline", daemon=True).start()
+            ready.wait()
+            self._loop = loop
+
+    def _bucket(self, host):
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def breaker(self, host):
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker()
+        return self._breakers[host]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self.in_flight += 1
+            try:
+                await self._execute(*job)
+            finally:
+                self.in_flight -= 1
+                self._queue.task_done()
+
+    async def _execute(self, host, fn, future):
+        breaker = self.breaker(host)
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self.rejected += 1
+                future.set_exception(CircuitOpenError(f"{host} 요청이 일시적으로 중단되었습니다 (서킷 열림)"))
+                return
+
+            await self._bucket(host).acquire()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+            except NON_RETRYABLE as e:
+                breaker.record_success()
+                self.failed += 1
+                future.set_exception(e)
+                return
+            except Exception as e:
+                breaker.record_failure()
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    future.set_exception(e)
+                    return
+                self.retries += 1
+                delay = backoff_delay(attempt)
+                logger.info("%s 요청 실패, %.2f초 후 재시도 (%d/%d): %s",
+                            host, delay, attempt + 1, self.max_retries, e)
+                await asyncio.sleep(delay)
+            else:
+                breaker.record_success()
+                self.succeeded += 1
+                future.set_result(result)
+                return
+
+    def call(self, fn, *args, host="yahoo", timeout=None, **kwargs):
+        """요청을 대기열에 넣고 결과를 기다리는 함수 (실패하면 마지막 예외를 그대로 발생)"""
+        self._ensure_started()
+        future = Future()
+        job = (host, partial(fn, *args, **kwargs), future)
+
+        def enqueue():
+            try:
+                self._queue.put_nowait(job)
+                self.submitted += 1
+            except asyncio.QueueFull:
+                self.rejected += 1
+                future.set_exception(QueueFullError("요청 대기열이 가득 찼습니다."))
+
+        self._loop.call_soon_threadsafe(enqueue)
+        return future.result(timeout)
+
+    def metrics(self):
+        """대기열 길이, 재시도 횟수, 서킷 상태 등 현재 지표"""
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': self.in_flight,
+            'submitted': self.submitted,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'retries': self.retries,
+            'rejected': self.rejected,
+            'circuits': {host: breaker.state for host, breaker in self._breakers.items()},
+        }
+
+
+pipeline = FetchPipeline()
+
+
+def fetch(fn, *args, host="yahoo", **kwargs):
+    """기본 파이프라인을 통해 외부 요청을 보내는 함수"""
+    return pipeline.call(fn, *args, host=host, **kwargs)
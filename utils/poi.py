@@ -0,0 +1,99 @@
+"""도쿄 관광 명소, 맛집 데이터를 파일에서 읽어오는 모듈"""
+
+import json
+import os
+
+import pandas as pd
+
+from utils.cache import INFO_TTL, cached
+from utils.spatial import GridIndex
+
+# 장소 데이터 파일 (CSV 또는 GeoJSON, 환경 변수로 변경 가능)
+POI_PATH = os.environ.get(
+    "TOKYO_POI_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tokyo_pois.csv")
+)
+
+COLUMNS = ['name', 'category', 'lat', 'lon', 'desc']
+
+ATTRACTION = "attraction"
+RESTAURANT = "restaurant"
+
+# 근처 맛집으로 보여줄 개수와 색인 격자 한 칸의 크기(m)
+NEARBY_COUNT = int(os.environ.get("NEARBY_COUNT", "3"))
+GRID_CELL_M = float(os.environ.get("SPATIAL_GRID_CELL_M", "300"))
+
+
+def _read_csv(path):
+    return pd.read_csv(path, dtype={'name': str, 'category': str, 'desc': str})
+
+
+def _read_geojson(path):
+    """Point 지오메트리만 읽고 속성(name, category, desc)을 컬럼으로 만드는 함수"""
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+
+    rows = []
+    for feature in collection.get('features', []):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') != 'Point':
+            continue
+        lon, lat = geometry['coordinates'][:2]
+        properties = feature.get('properties') or {}
+        rows.append({
+            'name': properties.get('name'),
+            'category': properties.get('category'),
+            'lat': lat,
+            'lon': lon,
+            'desc': properties.get('desc'),
+        })
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+@cached(ttl=INFO_TTL, max_entries=8)
+def load_pois(path, mtime):
+    """장소 파일을 읽어 name, category, lat, lon, desc 컬럼의 DataFrame으로 반환하는 함수
+
+    mtime(파일 수정 시각)을 캐시 키에 넣어 파일이 바뀌면 다시 읽습니다.
+    반환값은 세션끼리 공유되므로 수정하면 안 됩니다.
+    """
+    if path.lower().endswith((".geojson", ".json")):
+        pois = _read_geojson(path)
+    else:
+        pois = _read_csv(path)
+
+    missing = [col for col in ('name', 'lat', 'lon') if col not in pois.columns]
+    if missing:
+        raise ValueError(f"장소 데이터에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+
+    pois = pois.reindex(columns=COLUMNS)
+    pois['lat'] = pd.to_numeric(pois['lat'], errors='coerce')
+    pois['lon'] = pd.to_numeric(pois['lon'], errors='coerce')
+    pois = pois.dropna(subset=['lat', 'lon'])
+    pois['category'] = pois['category'].fillna(ATTRACTION).str.lower()
+    pois['name'] = pois['name'].fillna("")
+    pois['desc'] = pois['desc'].fillna("")
+    return pois.reset_index(drop=True)
+
+
+def get_pois(path=POI_PATH):
+    """현재 장소 데이터 (파일이 바뀌었을 때만 다시 읽음)"""
+    return load_pois(path, os.path.getmtime(path))
+
+
+@cached(ttl=INFO_TTL, max_entries=16)
+def build_index(path, mtime, category=RESTAURANT):
+    """한 카테고리의 장소와 그 공간 색인을 (장소 DataFrame, GridIndex)로 반환하는 함수"""
+    pois = load_pois(path, mtime)
+    places = pois[pois['category'] == category].reset_index(drop=True)
+    return places, GridIndex(places['lat'], places['lon'], cell_m=GRID_CELL_M)
+
+
+def nearby(lat, lon, k=NEARBY_COUNT, radius_m=None, category=RESTAURANT, path=POI_PATH):
+    """지점에서 가까운 장소 k개를 거리(distance_m) 컬럼과 함께 가까운 순서로 반환하는 함수
+
+    radius_m을 주면 그 반경 밖의 장소는 제외합니다.
+    """
+    places, index = build_index(path, os.path.getmtime(path), category)
+    rows, distances = index.nearest(lat, lon, k, radius_m)
+    return places.iloc[rows].assign(distance_m=distances).reset_index(drop=True)
@@ -0,0 +1,72 @@
+import pandas as pd
+
+from utils.cache import DAILY_TTL, cached
+from utils.fx import to_usd
+from utils.metrics import stage
+from utils.providers import get_provider
+from utils.shared import SharedPrices
+from utils.store import load_history
+
+
+def _split_by_ticker(raw, tickers):
+    """일괄 요청 결과를 티커별 DataFrame으로 나누는 함수"""
+    result = {}
+    if raw is None or raw.empty:
+        return result
+
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = raw[ticker]
+        else:
+            # 단일 티커를 평탄한 컬럼으로 반환하는 yfinance 버전 대응
+            df = raw
+
+        # 거래소마다 휴장일이 달라 생기는 빈 행은 제거
+        df = df.dropna(how='all')
+        if not df.empty:
+            result[ticker] = SharedPrices(df)
+    return result
+
+
+@cached(ttl=DAILY_TTL, max_entries=64)
+def download_prices(tickers, start, end):
+    """여러 티커의 주가를 한 번의 요청으로 받아 티커별 공유 배열로 나눠 반환하는 함수
+
+    tickers는 정렬된 튜플, start/end는 날짜(date)로 넘겨야 캐시 키가 안정적입니다.
+    """
+    tickers = tuple(tickers)
+    raw = get_provider().download(tickers, start=start, end=end, auto_adjust=True)
+    return _split_by_ticker(raw, tickers)
+
+
+def load_prices(tickers, start, end, refresh=False):
+    """티커 집합과 기간으로 캐시된 주가 데이터를 가져오는 함수 (refresh=True면 새로 받아옴)"""
+    key = tuple(sorted(set(tickers)))
+    if not key:
+        return {}
+    fetch = download_prices.refresh if refresh else download_prices
+    shared = fetch(key, pd.Timestamp(start).date(), pd.Timestamp(end).date())
+    return {ticker: prices.view() for ticker, prices in shared.items()}
+
+
+@cached(ttl=DAILY_TTL)
+def load_shared_prices(ticker, period="3y"):
+    """USD로 변환한 주가를 세션끼리 공유하는 읽기 전용 배열로 가져오는 함수"""
+    # 디스크 저장소에 없는 구간만 새로 받아옴
+    data = load_history(ticker, period)
+    if data.empty:
+        return None
+    with stage("fx_convert", ticker=ticker):
+        data = to_usd(data, ticker, period)
+    return SharedPrices(data)
+
+
+def get_stock_data(ticker, period="3y"):
+    """주식 데이터를 가져오는 함수 (USD 외 통화는 환율 변환 포함, 오류는 호출한 쪽에서 처리)
+
+    반환되는 DataFrame은 공유 배열의 뷰이므로 세션마다 복사본이 생기지 않습니다.
+    """
+    shared = load_shared_prices(ticker, period)
+    return None if shared is None else shared.view()
@@ -0,0 +1,331 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFInvalidPeriodError, YFTickerMissingError
+
+from utils.pipeline import fetch
+
+logger = logging.getLogger(__name__)
+
+# 사용할 데이터 제공자 (yahoo: 실제 Yahoo Finance, local: 로컬 고정 데이터)
+PROVIDER = os.environ.get("MARKET_DATA_PROVIDER", "yahoo")
+
+# 로컬 제공자가 읽는 녹화 데이터 경로와 호출마다 넣는 지연 시간(초)
+FIXTURE_DIR = os.environ.get(
+    "MARKET_DATA_FIXTURES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fixtures")
+)
+LATENCY = float(os.environ.get("MARKET_DATA_LATENCY", "0"))
+LATENCY_JITTER = float(os.environ.get("MARKET_DATA_LATENCY_JITTER", "0"))
+
+# 합성 데이터가 시작하는 날짜 (max 기간 요청 시)
+SYNTHETIC_START = pd.Timestamp("2000-01-03")
+
+# 합성 환율의 기준 수준 (1 USD당 현지 통화)
+FX_LEVELS = {
+    "KRW": 1300.0, "JPY": 140.0, "SAR": 3.75, "HKD": 7.8, "CNY": 7.1, "TWD": 31.0,
+    "GBP": 0.8, "EUR": 0.92, "CHF": 0.9, "CAD": 1.35, "AUD": 1.5, "INR": 83.0
+}
+
+# 장중 봉 간격별 길이 (합성 데이터는 하루 24시간 동안 이 간격으로 봉을 만듦)
+INTRADAY_INTERVALS = {
+    "1m": pd.Timedelta(minutes=1),
+    "5m": pd.Timedelta(minutes=5),
+}
+
+SECTORS = ["Technology", "Financial Services", "Healthcare", "Energy",
+           "Consumer Cyclical", "Industrials", "Communication Services"]
+
+
+@lru_cache(maxsize=512)
+def synthetic_history(ticker, today):
+    """티커 이름으로 시드를 정해 항상 같은 값이 나오는 합성 일봉 (평일만)
+
+    반환값은 캐시되어 공유되므로 호출한 쪽에서 수정하면 안 됩니다.
+    """
+    days = pd.date_range(SYNTHETIC_START, today, freq="D")
+    index = days[days.dayofweek < 5]
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    if ticker.endswith("=X"):
+        level = FX_LEVELS.get(ticker[:-2], 1.0)
+        close = level * np.exp(np.cumsum(rng.normal(0, 0.003, len(index))))
+    else:
+        level = rng.uniform(10, 500)
+        close = level * np.exp(np.cumsum(rng.normal(0.0003, 0.018, len(index))))
+    spread = np.abs(rng.normal(0, 0.01, len(index)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, len(index))),
+        'High': close * (1 + spread),
+        'Low': close * (1 - spread),
+        'Close': close,
+        'Volume': rng.integers(100_000, 50_000_000, len(index))
+    }, index=index)
+
+
+def synthetic_intraday(ticker, interval="1m", now=None):
+    """오늘 0시부터 현재 시각까지의 합성 장중 봉 (같은 시각이면 항상 같은 값)
+
+    하루치 난수를 미리 정해 두고 지난 봉만 잘라 내므로, 시간이 지나 다시 불러도
+    이미 나온 봉의 값은 바뀌지 않고 새 봉만 뒤에 붙습니다.
+    """
+    if interval not in INTRADAY_INTERVALS:
+        raise ValueError(f"지원하지 않는 봉 간격입니다: {interval}")
+    step = INTRADAY_INTERVALS[interval]
+    now = pd.Timestamp(now or pd.Timestamp.now())
+    day = now.normalize()
+    index = pd.date_range(day, now.floor(step), freq=step)
+
+    bars = int(pd.Timedelta(days=1) / step)
+    rng = np.random.default_rng([zlib.crc32(ticker.encode()), zlib.crc32(f"{day.date()}{interval}".encode())])
+    returns = rng.normal(0, 0.0008 * np.sqrt(step / pd.Timedelta(minutes=1)), bars)
+    spread = np.abs(rng.normal(0, 0.0005, bars))
+    volume = rng.integers(1_000, 200_000, bars)
+
+    # 전날 종가에서 출발해 일봉 데이터와 이어지도록 함
+    level = float(synthetic_history(ticker, day - pd.Timedelta(days=1))['Close'].iloc[-1])
+    n = len(index)
+    close = level * np.exp(np.cumsum(returns[:n]))
+    open_ = np.concatenate([[level], close[:-1]])
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * (1 + spread[:n]),
+        'Low': np.minimum(open_, close) * (1 - spread[:n]),
+        'Close': close,
+        'Volume': volume[:n]
+    }, index=index)
+
+
+def _align(value, index):
+    """비교할 시각을 인덱스의 타임존에 맞추는 함수 (녹화한 Yahoo 데이터는 거래소 타임존이 있음)"""
+    value = pd.Timestamp(value)
+    if index.tz is not None and value.tz is None:
+        return value.tz_localize(index.tz)
+    if index.tz is None and value.tz is not None:
+        return value.tz_convert(None)
+    return value
+
+
+def _between(data, start=None, end=None):
+    """start 이상, end 미만의 행만 남기는 함수"""
+    if start is not None:
+        data = data[data.index >= _align(start, data.index)]
+    if end is not None:
+        data = data[data.index < _align(end, data.index)]
+    return data
+
+
+# yfinance는 기본적으로 오류를 숨기고 빈 결과를 돌려주므로, 그러면 요청 파이프라인의 재시도와
+# 서킷 브레이커가 동작하지 않음. 오류를 그대로 발생시키고 데이터가 없다는 응답만 아래에서 빈 결과로 바꿈
+yf.config.debug.hide_exceptions = False
+
+# 티커에 해당 기간의 데이터가 없다는 응답 (상장 폐지, 휴장 등 다시 요청해도 같으므로 재시도하지 않음)
+NO_DATA_ERRORS = (YFTickerMissingError, YFInvalidPeriodError)
+
+
+class EmptyResponseError(Exception):
+    """일괄 요청에서 어떤 티커의 데이터도 오지 않았을 때 발생하는 예외 (일시적 장애로 보고 재시도)"""
+
+
+def _history(ticker, **kwargs):
+    """Ticker.history 결과 (데이터가 없다는 응답은 빈 DataFrame)"""
+    try:
+        return yf.Ticker(ticker).history(**kwargs)
+    except NO_DATA_ERRORS as e:
+        logger.info("%s 데이터 없음: %s", ticker, e)
+        return pd.DataFrame()
+
+
+def _received(raw, tickers):
+    """일괄 요청 결과에 값이 하나라도 들어 있는 티커 목록"""
+    if raw is None or raw.empty:
+        return []
+    if not isinstance(raw.columns, pd.MultiIndex):
+        return list(tickers)
+    filled = raw.notna().any().groupby(level=0).any()
+    return [ticker for ticker in tickers if filled.get(ticker, False)]
+
+
+def _download(tickers, **kwargs):
+    """yf.download 결과 (yf.download는 티커별 오류를 숨기므로 모두 비어 있으면 예외로 바꿈)"""
+    raw = yf.download(tickers, group_by='ticker', threads=True, progress=False, **kwargs)
+    if not _received(raw, tickers):
+        raise EmptyResponseError(f"요청한 티커의 데이터가 없습니다: {', '.join(tickers)}")
+    return raw
+
+
+class YahooProvider:
+    """Yahoo Finance에서 데이터를 받아오는 기본 제공자 (모든 요청은 요청 파이프라인을 거침)"""
+
+    name = "yahoo"
+
+    def history(self, ticker, start=None, period=None):
+        if start is None:
+            return fetch(_history, ticker, period=period or "max")
+        return fetch(_history, ticker, start=start)
+
+    def intraday(self, ticker, interval="1m", start=None):
+        """장중 봉을 받는 함수 (start를 주면 그 시각 이후의 봉만 요청)"""
+        if start is None:
+            return fetch(_history, ticker, period="1d", interval=interval)
+        return fetch(_history, ticker, start=start, interval=interval)
+
+    def info(self, ticker):
+        stock = yf.Ticker(ticker)
+        info = dict(fetch(stock.get_info))
+        if not info.get('sharesOutstanding'):
+            info['sharesOutstanding'] = fetch(stock.fast_info.get, 'shares')
+        return info
+
+    def download(self, tickers, start=None, end=None, period=None, auto_adjust=True):
+        """여러 티커를 한 번에 받아 (티커, 컬럼) 2단 컬럼의 DataFrame으로 반환"""
+        tickers = list(tickers)
+        kwargs = {'period': period} if period else {'start': start, 'end': end}
+        raw = fetch(_download, tickers, auto_adjust=auto_adjust, **kwargs)
+
+        # 일괄 요청에서 빠진 티커는 하나씩 다시 요청해, 일시적 오류는 재시도하고 데이터가 없는 티커는 제외
+        missing = [ticker for ticker in tickers if ticker not in _received(raw, tickers)]
+        if not missing or not isinstance(raw.columns, pd.MultiIndex):
+            return raw
+        frames = {}
+        for ticker in missing:
+            try:
+                data = fetch(_history, ticker, auto_adjust=auto_adjust, actions=False, **kwargs)
+            except Exception:
+                logger.warning("%s 일괄 요청에서 빠져 다시 요청했지만 실패", ticker, exc_info=True)
+                continue
+            if not data.empty:
+                # yf.download처럼 날짜의 타임존은 없앰
+                frames[ticker] = data.tz_localize(None) if data.index.tz is not None else data
+        raw = raw.drop(columns=missing, level=0, errors='ignore')
+        return pd.concat([raw, pd.concat(frames, axis=1)], axis=1) if frames else raw
+
+
+class LocalProvider:
+    """네트워크 없이 녹화 데이터나 합성 데이터를 돌려주는 제공자 (부하 테스트, 재현용)
+
+    FIXTURE_DIR에 {티커}.parquet 또는 {티커}.csv, info.json이 있으면 그 데이터를 쓰고,
+    없으면 티커 이름으로 시드를 정한 합성 데이터를 만들어 항상 같은 결과를 반환합니다.
+    """
+
+    name = "local"
+
+    def __init__(self, root=FIXTURE_DIR, latency=LATENCY, jitter=LATENCY_JITTER):
+        self.root = root
+        self.latency = latency
+        self.jitter = jitter
+        self._info = None
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _recorded(self, ticker):
+        name = ticker.replace("/", "_")
+        for ext, reader in ((".parquet", pd.read_parquet),
+                            (".csv", lambda p: pd.read_csv(p, index_col=0, parse_dates=True))):
+            path = os.path.join(self.root, name + ext)
+            if os.path.exists(path):
+                return reader(path)
+        return None
+
+    def _frame(self, ticker):
+        data = self._recorded(ticker)
+        return synthetic_history(ticker, pd.Timestamp.today().normalize()) if data is None else data
+
+    def history(self, ticker, start=None, period=None):
+        self._sleep()
+        return _between(self._frame(ticker), start)
+
+    def intraday(self, ticker, interval="1m", start=None):
+        self._sleep()
+        return _between(synthetic_intraday(ticker, interval), start)
+
+    def info(self, ticker):
+        self._sleep()
+        with self._lock:
+            if self._info is None:
+                path = os.path.join(self.root, "info.json")
+                if os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        self._info = json.load(f)
+                else:
+                    self._info = {}
+        if ticker in self._info:
+            return dict(self._info[ticker])
+
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        return {
+            'longName': f"{ticker} Corp.",
+            'sector': SECTORS[int(rng.integers(len(SECTORS)))],
+            'sharesOutstanding': float(rng.integers(100_000_000, 20_000_000_000))
+        }
+
+    def download(self, tickers, start=None, end=None, period=None, auto_adjust=True):
+        self._sleep()
+        frames = {}
+        for ticker in tickers:
+            data = self._frame(ticker)
+            # yf.download처럼 일봉 날짜는 타임존 없이 반환 (녹화 데이터와 합성 데이터를 함께 합칠 수 있도록)
+            if data.index.tz is not None:
+                data = data.tz_localize(None)
+            if period:
+                data = data.tail(int(period.rstrip("d")))
+            else:
+                data = _between(data, start, end)
+            frames[ticker] = data
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+
+def record_fixtures(tickers, root=FIXTURE_DIR, period="max"):
+    """Yahoo Finance에서 받은 데이터를 로컬 제공자용 파일로 저장하는 함수"""
+    source = YahooProvider()
+    os.makedirs(root, exist_ok=True)
+    infos = {}
+    for ticker in tickers:
+        data = source.history(ticker, period=period)
+        if not data.empty:
+            data.to_parquet(os.path.join(root, ticker.replace("/", "_") + ".parquet"))
+        info = source.info(ticker)
+        infos[ticker] = {key: info.get(key) for key in ('longName', 'shortName', 'sector', 'sharesOutstanding')}
+    with open(os.path.join(root, "info.json"), "w", encoding="utf-8") as f:
+        json.dump(infos, f, ensure_ascii=False, indent=2)
+
+
+PROVIDERS = {
+    "yahoo": YahooProvider,
+    "local": LocalProvider,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """MARKET_DATA_PROVIDER 환경 변수에 맞는 제공자를 반환하는 함수"""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if PROVIDER not in PROVIDERS:
+                raise ValueError(f"지원하지 않는 데이터 제공자입니다: {PROVIDER}")
+            _provider = PROVIDERS[PROVIDER]()
+        return _provider
+
+
+def set_provider(provider):
+    """사용할 제공자를 바꾸는 함수 (벤치마크 등에서 사용)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,98 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import QUOTE_TTL, cached
+from utils.fx import FxError, currency_for, latest_rate
+from utils.metadata import get_quotes, static_table
+
+logger = logging.getLogger(__name__)
+
+# 시가총액 순위를 매길 후보 기업 목록 (ticker, name 컬럼의 CSV)
+CANDIDATES_PATH = os.environ.get(
+    "RANKING_CANDIDATES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "candidates.csv")
+)
+
+
+@cached(ttl=24 * 60 * 60, max_entries=4)
+def load_candidates(path=CANDIDATES_PATH):
+    """후보 기업 목록을 읽는 함수 (티커 중복 제거)"""
+    candidates = pd.read_csv(path, dtype=str).dropna(subset=['ticker'])
+    candidates['name'] = candidates['name'].fillna(candidates['ticker'])
+    return candidates.drop_duplicates('ticker').reset_index(drop=True)
+
+
+def candidate_tickers(path=CANDIDATES_PATH):
+    return load_candidates(path)['ticker'].tolist()
+
+
+def usd_rates(tickers):
+    """티커별 USD 환율 배열 (USD는 1, 환율을 구할 수 없으면 NaN)"""
+    currencies = pd.Series([currency_for(ticker) for ticker in tickers])
+    rates = {"USD": 1.0}
+    for currency in currencies.unique():
+        if currency not in rates:
+            try:
+                rates[currency] = latest_rate(currency)
+            except FxError:
+                rates[currency] = np.nan
+    return currencies.map(rates).to_numpy(dtype=np.float64)
+
+
+@cached(ttl=QUOTE_TTL, max_entries=4)
+def market_caps(path=CANDIDATES_PATH):
+    """후보 기업 전체의 USD 시가총액 표 (ticker, name, market_cap)
+
+    상장 주식 수는 디스크의 메타데이터 테이블에서, 가격은 한 번의 일괄 요청으로 가져오므로
+    후보가 많아도 기업별 네트워크 요청이 생기지 않습니다.
+    메타데이터가 아직 없는 기업은 제외되며, 워밍업 스케줄러가 채워 넣습니다.
+    """
+    candidates = load_candidates(path)
+    static = static_table.get_many(candidates['ticker'])
+    known = candidates[candidates['ticker'].isin(list(static))].reset_index(drop=True)
+    if known.empty:
+        return known.assign(market_cap=pd.Series(dtype=np.float64))
+
+    tickers = known['ticker'].tolist()
+    quotes = get_quotes(tickers)
+    prices = np.array([quotes.get(ticker, np.nan) for ticker in tickers], dtype=np.float64)
+    shares = np.array([static[ticker]['shares'] or np.nan for ticker in tickers], dtype=np.float64)
+
+    known['market_cap'] = prices * shares / usd_rates(tickers)
+    return known.dropna(subset=['market_cap'])
+
+
+def top_n(n=10, path=CANDIDATES_PATH):
+    """시가총액 상위 n개 기업을 큰 순서대로 반환하는 함수
+
+    전체를 정렬하지 않고 상위 n개만 골라낸 뒤(argpartition) 그 안에서만 정렬합니다.
+    """
+    caps = market_caps(path)
+    if len(caps) <= n:
+        return caps.sort_values('market_cap', ascending=False).reset_index(drop=True)
+
+    values = caps['market_cap'].to_numpy()
+    top = np.argpartition(-values, n - 1)[:n]
+    top = top[np.argsort(-values[top])]
+    return caps.iloc[top].reset_index(drop=True)
+
+
+def ranked_companies(n=10, fallback=None, label="{name}"):
+    """선택 위젯에 쓸 {표시 이름: 티커} 딕셔너리를 시가총액 순으로 만드는 함수
+
+    메타데이터가 아직 충분하지 않으면(서버 첫 시작 직후 등) fallback 목록을 그대로 사용합니다.
+    """
+    try:
+        ranking = top_n(n)
+    except Exception:
+        logger.warning("시가총액 순위 계산 실패, 기본 목록 사용", exc_info=True)
+        ranking = None
+    if ranking is None or len(ranking) < n:
+        return dict(fallback or {})
+    return {
+        label.format(name=row.name, ticker=row.ticker): row.ticker
+        for row in ranking.itertuples(index=False)
+    }
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+# 가격은 float32, 거래량은 int64로 보관해 메모리를 줄임
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+PRICE_DTYPE = np.float32
+VOLUME_DTYPE = np.int64
+
+
+def _read_only(values, dtype):
+    array = np.ascontiguousarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+class SharedPrices:
+    """세션끼리 복사 없이 공유하는 읽기 전용 주가 배열 묶음
+
+    캐시에는 이 객체를 한 번만 저장하고, 세션에는 view()로 배열을 가리키는 DataFrame을 돌려줍니다.
+    복사 없이 공유하고 수정할 때만 복사되는 동작은 pandas 3의 copy-on-write에 의존합니다.
+    """
+
+    __slots__ = ('index', 'columns', '_frame')
+
+    def __init__(self, data):
+        columns = {}
+        for col in PRICE_COLUMNS:
+            if col in data.columns:
+                columns[col] = _read_only(data[col].to_numpy(dtype=np.float64), PRICE_DTYPE)
+        if 'Volume' in data.columns:
+            columns['Volume'] = _read_only(data['Volume'].fillna(0).to_numpy(), VOLUME_DTYPE)
+
+        # Index는 변경할 수 없는 객체이므로 그대로 공유
+        self.index = data.index
+        self.columns = columns
+        # 배열을 감싼 DataFrame은 한 번만 만들고, 세션에는 이를 참조하는 얕은 복사본을 줌
+        # (pandas는 DataFrame끼리의 참조만 추적하므로, 그래야 수정할 때 복사됨)
+        self._frame = pd.DataFrame(columns, index=self.index, copy=False)
+
+    def view(self):
+        """공유 배열을 그대로 가리키는 DataFrame을 반환하는 함수 (수정하면 그 세션에서만 복사됨)"""
+        return self._frame.copy(deep=False)
+
+    @property
+    def nbytes(self):
+        return self.index.nbytes + sum(array.nbytes for array in self.columns.values())
+
+    def __len__(self):
+        return len(self.index)
@@ -0,0 +1,78 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    """진행 중인 요청 하나의 결과를 기다리는 다른 요청들과 공유하기 위한 객체"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청을 하나의 실제 호출로 합치는 클래스"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.deduplicated = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """키가 같은 요청이 진행 중이면 그 결과를 기다리고, 아니면 직접 호출하는 함수"""
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._inflight[key] = call
+                self.calls += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            logger.debug("%s: 진행 중인 요청에 합류 %s", self.name, key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn(*args, **kwargs)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'deduplicated': self.deduplicated,
+                'inflight': len(self._inflight),
+            }
+
+
+def group(name):
+    """이름별로 프로세스 전체에서 하나만 존재하는 SingleFlight를 반환하는 함수"""
+    with _groups_lock:
+        return _groups.setdefault(name, SingleFlight(name))
+
+
+def stats():
+    """모든 SingleFlight 그룹의 호출 수와 합쳐진 요청 수를 반환하는 함수"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {g.name: g.stats() for g in groups}
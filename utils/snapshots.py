@@ -0,0 +1,209 @@
+"""자주 보는 조합(기업 선택, 기간, 차트 타입)의 차트와 표를 미리 만들어 두고 페이지에서 그대로 보여주는 모듈
+
+스냅샷 하나는 기업 선택마다 폴더 하나이며 다음 파일로 이루어집니다.
+    meta.json               기업 목록, 데이터 제공자, 만든 시각, 기간별 차트 목록
+    cards.parquet           기업 정보 카드 (현재가, 시가총액, 섹터)
+    {기간}/performance.parquet  성과 비교 표
+    {기간}/{line,candle,volume,correlation}.json  Plotly 그림
+    {기간}/report.html      위 내용을 한 화면에 모은 보고서
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+import plotly.io as pio
+
+from utils.analytics import close_matrix, correlation_matrix, performance_metrics
+from utils.cache import DAILY_TTL, cached
+from utils.charts import PRICE_CHARTS, correlation_chart, volume_chart
+from utils.downsample import point_budget
+from utils.loader import load_parallel
+from utils.metadata import load_company_info
+from utils.prices import get_stock_data
+from utils.providers import PROVIDER
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 저장 경로와 유효 기간(초), 사용 여부 (환경 변수로 변경 가능)
+SNAPSHOT_DIR = os.environ.get(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "snapshots")
+)
+SNAPSHOT_MAX_AGE = int(os.environ.get("SNAPSHOT_MAX_AGE", 24 * 60 * 60))
+SNAPSHOTS_ENABLED = os.environ.get("SNAPSHOTS_ENABLED", "1") != "0"
+
+# 페이지의 차트 타입 이름과 저장 파일 이름
+CHART_FILES = {
+    "라인 차트": "line",
+    "캔들스틱 차트": "candle",
+}
+
+
+def selection_key(companies):
+    """기업 선택(순서 포함)으로 스냅샷 폴더 이름을 만드는 함수"""
+    text = json.dumps(list(companies.items()), ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+@cached(ttl=DAILY_TTL, max_entries=128)
+def _read_figure(path, mtime):
+    # 세션끼리 공유되는 그림이므로 수정하면 안 됩니다.
+    with open(path, encoding="utf-8") as f:
+        return pio.from_json(f.read(), skip_invalid=True)
+
+
+@cached(ttl=DAILY_TTL, max_entries=128)
+def _read_table(path, mtime):
+    return pd.read_parquet(path)
+
+
+class Snapshot:
+    """디스크에 저장된 기업 선택 하나의 스냅샷"""
+
+    def __init__(self, root, meta):
+        self.root = root
+        self.meta = meta
+        self.created = datetime.fromisoformat(meta['created_at'])
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def has_period(self, period):
+        return period in self.meta.get('periods', {})
+
+    def cards(self):
+        """{기업명: 회사 정보} (load_company_info와 같은 형태)"""
+        path = self._path("cards.parquet")
+        table = _read_table(path, os.path.getmtime(path))
+        return {company: row for company, row in table.to_dict('index').items()}
+
+    def performance(self, period):
+        path = self._path(period, "performance.parquet")
+        return _read_table(path, os.path.getmtime(path))
+
+    def figure(self, period, name):
+        """저장된 Plotly 그림 (없으면 None)"""
+        path = self._path(period, f"{name}.json")
+        if not os.path.exists(path):
+            return None
+        return _read_figure(path, os.path.getmtime(path))
+
+    def chart(self, period, chart_type):
+        """페이지의 차트 타입 이름으로 가격 차트 그림을 찾는 함수"""
+        name = CHART_FILES.get(chart_type)
+        return None if name is None else self.figure(period, name)
+
+
+def load_snapshot(companies, period=None, root=SNAPSHOT_DIR, max_age=SNAPSHOT_MAX_AGE):
+    """기업 선택(과 기간)에 맞는 유효한 스냅샷을 찾는 함수 (없거나 오래됐으면 None)"""
+    if not SNAPSHOTS_ENABLED or not companies:
+        return None
+    folder = os.path.join(root, selection_key(companies))
+    try:
+        with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # 다른 데이터 제공자로 만든 스냅샷이나 선택이 다른 스냅샷(해시 충돌)은 사용하지 않음
+    if meta.get('provider') != PROVIDER or meta.get('companies') != [list(item) for item in companies.items()]:
+        return None
+    snapshot = Snapshot(folder, meta)
+    if (datetime.now() - snapshot.created).total_seconds() > max_age:
+        return None
+    if period is not None and not snapshot.has_period(period):
+        return None
+    return snapshot
+
+
+def _write_text(path, text):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def _write_table(path, table):
+    table.to_parquet(path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def _report_html(title, cards, performance, figures):
+    """카드, 성과 표, 그림을 한 파일에 모은 HTML 보고서"""
+    parts = [f"<html><head><meta charset='utf-8'><title>{title}</title></head><body>", f"<h1>{title}</h1>"]
+    if not cards.empty:
+        parts.append("<h2>선택된 기업 정보</h2>" + cards.to_html(float_format=lambda v: f"{v:,.2f}"))
+    if not performance.empty:
+        parts.append("<h2>성과 비교</h2>" + performance.to_html(float_format=lambda v: f"{v:,.4f}"))
+    for i, fig in enumerate(figures):
+        parts.append(pio.to_html(fig, full_html=False, include_plotlyjs='cdn' if i == 0 else False))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def build_snapshot(companies, periods, chart_types=tuple(CHART_FILES), root=SNAPSHOT_DIR, budget=None):
+    """페이지와 같은 순서로 데이터를 받고 계산해 스냅샷 파일을 만드는 함수
+
+    companies는 {기업명: 티커}, periods는 {기간 이름: 기간 코드}(예: {"3년": "3y"})입니다.
+    만든 스냅샷 폴더 경로와 기업별 오류 딕셔너리를 반환합니다.
+    """
+    budget = budget or point_budget()
+    folder = os.path.join(root, selection_key(companies))
+    os.makedirs(folder, exist_ok=True)
+    # 만드는 동안에는 페이지가 이 스냅샷을 사용하지 않도록 메타 정보를 먼저 지움
+    meta_path = os.path.join(folder, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    errors = {}
+    company_info, info_errors = load_company_info(companies)
+    errors.update(info_errors)
+    cards = pd.DataFrame.from_dict(company_info, orient='index')
+    _write_table(os.path.join(folder, "cards.parquet"), cards)
+
+    written = {}
+    for label, period in periods.items():
+        stock_data, data_errors = load_parallel(companies, get_stock_data, period)
+        errors.update(data_errors)
+        if not stock_data:
+            logger.warning("%s 기간의 주가 데이터가 없어 스냅샷을 만들지 않습니다", period)
+            continue
+
+        period_dir = os.path.join(folder, period)
+        # 이전에 만든 차트가 남아 다른 설정의 그림이 섞이지 않도록 기간 폴더를 새로 만듦
+        shutil.rmtree(period_dir, ignore_errors=True)
+        os.makedirs(period_dir)
+
+        closes = close_matrix(stock_data)
+        performance = performance_metrics(closes)
+        _write_table(os.path.join(period_dir, "performance.parquet"), performance)
+
+        figures = {}
+        for chart_type in chart_types:
+            figures[CHART_FILES[chart_type]] = PRICE_CHARTS[chart_type](stock_data, label, budget)
+        if len(closes.columns) > 1:
+            figures['correlation'] = correlation_chart(correlation_matrix(closes))
+        figures['volume'] = volume_chart(stock_data, label, budget)
+
+        for name, fig in figures.items():
+            _write_text(os.path.join(period_dir, f"{name}.json"), fig.to_json())
+        _write_text(
+            os.path.join(period_dir, "report.html"),
+            _report_html(f"주가 현황 - {label}", cards, performance, list(figures.values()))
+        )
+        written[period] = list(figures)
+
+    # 메타 정보는 마지막에 써서, 다 만든 스냅샷만 페이지에서 사용하게 함
+    meta = {
+        'companies': [list(item) for item in companies.items()],
+        'provider': PROVIDER,
+        'created_at': datetime.now().isoformat(),
+        'periods': written,
+    }
+    _write_text(meta_path, json.dumps(meta, ensure_ascii=False, indent=2))
+    return folder, errors
+
@@ -0,0 +1,170 @@
+"""위경도 점들에 대한 격자 공간 색인 (가까운 k개, 반경 내 검색)"""
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEGREE = 111_320.0
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """두 지점(배열 가능) 사이의 대원 거리(m)를 한 번에 계산하는 함수"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class GridIndex:
+    """점들을 일정한 크기의 격자 칸으로 나눠 두고, 질의 주변 칸의 점만 거리 계산하는 색인
+
+    점들은 칸 번호 순서로 정렬해 두므로 한 행(위도 방향 한 줄)의 연속된 칸은
+    searchsorted 두 번으로 찾을 수 있습니다.
+    """
+
+    def __init__(self, lat, lon, cell_m=500):
+        self.lat = np.ascontiguousarray(lat, dtype=np.float64)
+        self.lon = np.ascontiguousarray(lon, dtype=np.float64)
+        self.cell_m = cell_m
+        if len(self.lat) == 0:
+            self.lat0 = self.lon0 = 0.0
+            self.dlat = self.dlon = 1.0
+            self.cols = 1
+            self.order = np.empty(0, dtype=np.int64)
+            self.keys = np.empty(0, dtype=np.int64)
+            return
+
+        self.lat0 = self.lat.min()
+        self.lon0 = self.lon.min()
+        # 경도 1도의 거리는 위도에 따라 줄어들므로 가장 좁은 위도(극에 가까운 쪽) 기준으로 칸을 잡음
+        max_abs_lat = np.abs(self.lat).max()
+        self.dlat = cell_m / METERS_PER_DEGREE
+        self.dlon = cell_m / (METERS_PER_DEGREE * max(np.cos(np.radians(max_abs_lat)), 1e-6))
+        self.cols = int((self.lon.max() - self.lon0) // self.dlon) + 1
+
+        # 가장 가까운 점을 찾을 때 반경을 더 넓힐 필요가 있는지 판단하는 데 사용
+        self.center = ((self.lat0 + self.lat.max()) / 2, (self.lon0 + self.lon.max()) / 2)
+        self.radius = haversine(self.lat0, self.lon0, self.lat.max(), self.lon.max())
+
+        keys = self._cell_rows(self.lat) * self.cols + self._cell_cols(self.lon)
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def __len__(self):
+        return len(self.lat)
+
+    @property
+    def nbytes(self):
+        return self.lat.nbytes + self.lon.nbytes + self.order.nbytes + self.keys.nbytes
+
+    def _cell_rows(self, lat):
+        return np.floor((np.asarray(lat) - self.lat0) / self.dlat).astype(np.int64)
+
+    def _cell_cols(self, lon):
+        return np.floor((np.asarray(lon) - self.lon0) / self.dlon).astype(np.int64)
+
+    def _candidates(self, lat, lon, radius_m):
+        """질의 지점을 중심으로 반경 radius_m인 원을 덮는 칸들에 속한 점의 번호"""
+        dlat = radius_m / METERS_PER_DEGREE
+        edge_lat = min(abs(lat) + dlat, 89.9)
+        dlon = radius_m / (METERS_PER_DEGREE * np.cos(np.radians(edge_lat)))
+
+        row_lo, row_hi = self._cell_rows([lat - dlat, lat + dlat])
+        col_lo, col_hi = self._cell_cols([lon - dlon, lon + dlon])
+        row_lo, col_lo = max(row_lo, 0), max(col_lo, 0)
+        col_hi = min(col_hi, self.cols - 1)
+        if col_lo > col_hi or row_hi < row_lo:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self.keys, rows * self.cols + col_lo, side='left')
+        ends = np.searchsorted(self.keys, rows * self.cols + col_hi, side='right')
+        if len(starts) == 1:
+            return self.order[starts[0]:ends[0]]
+        return np.concatenate([self.order[s:e] for s, e in zip(starts, ends) if e > s] or
+                              [np.empty(0, dtype=np.int64)])
+
+    def in_bounds(self, south, west, north, east):
+        """사각형 영역(지도 화면) 안에 있는 점의 번호 배열"""
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64)
+        row_lo, row_hi = self._cell_rows([south, north])
+        col_lo, col_hi = self._cell_cols([west, east])
+        row_lo, col_lo = max(row_lo, 0), max(col_lo, 0)
+        col_hi = min(col_hi, self.cols - 1)
+        if col_lo > col_hi or row_hi < row_lo:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(row_lo, row_hi + 1)
+        starts = np.searchsorted(self.keys, rows * self.cols + col_lo, side='left')
+        ends = np.searchsorted(self.keys, rows * self.cols + col_hi, side='right')
+        candidates = np.concatenate([self.order[s:e] for s, e in zip(starts, ends)])
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(candidates[inside])
+
+    def within(self, lat, lon, radius_m):
+        """반경 radius_m 안의 점을 가까운 순서로 (번호, 거리) 배열로 반환하는 함수"""
+        candidates = self._candidates(lat, lon, radius_m)
+        distances = haversine(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_m
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+    def nearest(self, lat, lon, k=5, max_radius_m=None):
+        """가까운 점 k개를 (번호, 거리) 배열로 반환하는 함수
+
+        반경을 두 배씩 넓혀 가며 원 안에 k개가 들어오면 그 안에서만 고릅니다.
+        max_radius_m을 주면 그보다 먼 점은 제외합니다.
+        """
+        if len(self) == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        radius = self.cell_m
+        # 질의 지점에서 모든 점을 덮는 반경을 넘으면 더 넓힐 필요가 없음
+        limit = self.radius + haversine(lat, lon, *self.center)
+        if max_radius_m is not None:
+            limit = min(limit, max_radius_m)
+
+        while True:
+            radius = min(radius, limit)
+            candidates = self._candidates(lat, lon, radius)
+            distances = haversine(lat, lon, self.lat[candidates], self.lon[candidates])
+            inside = distances <= radius
+            if inside.sum() >= k or radius >= limit:
+                candidates, distances = candidates[inside], distances[inside]
+                break
+            radius *= 2
+
+        if len(candidates) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[top], distances[top]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+
+
+def degrees_per_pixel(zoom):
+    """웹 지도(256px 타일)에서 해당 줌 레벨의 화면 1픽셀이 차지하는 경도(도)"""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def thin(lat, lon, zoom, spacing_px=24, limit=None):
+    """화면에서 spacing_px 픽셀 간격의 격자 칸마다 점 하나만 남기는 함수 (남길 위치 배열 반환)
+
+    limit을 넘으면 간격을 두 배씩 넓혀 표시되는 점의 수를 일정하게 유지합니다.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    keep = np.arange(len(lat))
+    if len(lat) == 0:
+        return keep
+    cos_lat = max(np.cos(np.radians(np.mean(lat))), 1e-6)
+    while True:
+        size = degrees_per_pixel(zoom) * spacing_px
+        rows = np.floor(lat / (size * cos_lat)).astype(np.int64)
+        cols = np.floor(lon / size).astype(np.int64)
+        _, first = np.unique(rows * 4_000_000 + cols, return_index=True)
+        keep = np.sort(first)
+        if limit is None or len(keep) <= limit:
+            return keep
+        spacing_px *= 2
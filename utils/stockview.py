@@ -0,0 +1,376 @@
+"""주식 페이지(시총 Top 10, 주요 기업)가 함께 쓰는 화면 구성 모듈
+
+페이지마다 다른 것은 기업 목록, 기간 선택지, 제목뿐이므로 나머지 화면은 render_stock_page가 그립니다.
+"""
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils import universe
+from utils.analytics import close_matrix, correlation_matrix, performance_metrics
+from utils.charts import (COLORS, PRICE_CHARTS, candlestick_grid, correlation_chart, indicator_chart,
+                          volume_chart)
+from utils.downsample import point_budget
+from utils.indicators import INDICATOR_OPTIONS, company_indicators
+from utils.live import LIVE_REFRESH, append_bars, bars_since, load_intraday
+from utils.loader import load_parallel
+from utils.metadata import load_company_info
+from utils.metrics import render_debug_panel, stage, timed
+from utils.prices import get_stock_data
+from utils.snapshots import load_snapshot
+
+# 페이지별 기간 선택지 (00: 시총 Top 10, 02: 주요 기업)
+TOP10_PERIOD_OPTIONS = {
+    "1년": "1y",
+    "2년": "2y",
+    "3년": "3y",
+    "5년": "5y"
+}
+COMPANY_PERIOD_OPTIONS = {
+    **TOP10_PERIOD_OPTIONS,
+    "10년": "10y",
+    "최대": "max"
+}
+
+# 주요 기업 페이지의 기본 선택 기업 (시총 Top 10 페이지는 상위 3개)
+COMPANY_DEFAULT = ["Apple", "Samsung Electronics", "NVIDIA"]
+
+# 실시간 모드 봉 간격
+LIVE_INTERVALS = {
+    "1분봉": "1m",
+    "5분봉": "5m"
+}
+
+
+def page_setup(page):
+    """페이지("00", "02")의 (기업 목록, 기본 선택, 기간 선택지) (페이지와 스냅샷 생성기가 함께 사용)"""
+    if page == "00":
+        # 시가총액 순위로 만든 Top 10 목록
+        top_companies = universe.top10_companies()
+        return top_companies, list(top_companies)[:3], TOP10_PERIOD_OPTIONS
+    if page == "02":
+        return universe.COMPANIES_TO_ANALYZE, COMPANY_DEFAULT, COMPANY_PERIOD_OPTIONS
+    raise ValueError(f"지원하지 않는 페이지입니다: {page}")
+
+
+def format_market_cap(market_cap):
+    """시가총액을 읽기 쉬운 형태로 변환"""
+    if market_cap >= 1e12:
+        return f"${market_cap/1e12:.2f}T"
+    elif market_cap >= 1e9:
+        return f"${market_cap/1e9:.2f}B"
+    elif market_cap >= 1e6:
+        return f"${market_cap/1e6:.2f}M"
+    else:
+        return f"${market_cap:,.0f}"
+
+
+def show_errors(errors, label):
+    """기업별 오류 메시지를 표시하는 함수"""
+    for company, message in errors.items():
+        st.error(f"{company} {label} 오류: {message}")
+
+
+def load_stock_data(companies, period):
+    """선택된 기업의 주가를 동시에 불러오고 오류를 표시하는 함수"""
+    with st.spinner("데이터를 불러오는 중..."), stage("stock_data", period=period, companies=len(companies)):
+        stock_data, errors = load_parallel(companies, get_stock_data, period)
+    show_errors(errors, "주가 데이터")
+    return stock_data
+
+
+def show_snapshot_caption(snapshot):
+    st.caption(f"🗂 미리 만든 스냅샷을 표시합니다 ({snapshot.created:%Y-%m-%d %H:%M} 기준)")
+
+
+def render_company_cards(companies):
+    """선택된 기업의 현재가와 시가총액 카드 (기업 선택이 바뀔 때만 다시 그림)"""
+    st.header("📊 선택된 기업 정보")
+
+    # 미리 만든 스냅샷이 있으면 그 카드를 그대로 사용
+    snapshot = load_snapshot(companies)
+    if snapshot is not None:
+        company_info, errors = snapshot.cards(), {}
+        show_snapshot_caption(snapshot)
+    else:
+        # 고정 정보는 디스크 테이블에서, 시세는 선택된 기업 전체를 한 번에 요청
+        with stage("company_info", companies=len(companies)):
+            company_info, errors = load_company_info(companies)
+    show_errors(errors, "회사 정보")
+
+    cols = st.columns(len(companies))
+    for i, company in enumerate(companies):
+        if company in company_info:
+            info = company_info[company]
+            with cols[i]:
+                st.metric(
+                    label=f"{company}",
+                    value=f"${info['currentPrice']:.2f}",
+                    delta=f"시총: {format_market_cap(info['marketCap'])}"
+                )
+                st.caption(f"섹터: {info['sector']}")
+
+
+@st.fragment
+@timed("price_chart")
+def render_price_chart(companies, period, selected_period, stock_data=None, snapshot=None):
+    """주가 차트 (차트 타입을 바꾸면 이 부분만 다시 실행)
+
+    스냅샷에 선택한 차트 타입의 그림이 있으면 그대로 표시하고, 없으면 주가를 불러와 그립니다.
+    """
+    st.header("📈 주가 차트")
+
+    chart_type = st.radio(
+        "차트 타입:",
+        ["라인 차트", "캔들스틱 차트"],
+        horizontal=True
+    )
+
+    selected_indicators = st.multiselect(
+        "보조 지표:",
+        options=list(INDICATOR_OPTIONS.keys()),
+        default=[]
+    )
+
+    # 스냅샷에는 보조 지표가 없으므로 지표를 고르지 않았을 때만 사용
+    fig = snapshot.chart(period, chart_type) if snapshot is not None and not selected_indicators else None
+    panels = {}
+    if fig is None:
+        if stock_data is None:
+            stock_data = load_stock_data(companies, period)
+            if not stock_data:
+                st.error("선택한 기업의 데이터를 불러올 수 없습니다.")
+                return
+
+        # 지표는 (티커, 지표, 매개변수)별로 보관되어 새 봉이 생겼을 때만 뒷부분을 계산
+        overlays = {}
+        if selected_indicators:
+            with stage("indicators", indicators=len(selected_indicators), companies=len(stock_data)):
+                overlays, panels = company_indicators(stock_data, companies, selected_indicators)
+
+        # 라인 차트는 모든 기업의 종가를, 캔들스틱 차트는 기업별 봉과 거래량을 격자로 그림
+        # (브라우저로 보내는 점의 개수는 차트 폭에 맞춰 줄임)
+        fig = PRICE_CHARTS[chart_type](stock_data, selected_period, point_budget(), overlays=overlays)
+
+    with stage("plotly_chart", chart="price"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    if panels:
+        with stage("plotly_chart", chart="indicators"):
+            st.plotly_chart(indicator_chart(panels, selected_period, point_budget()), use_container_width=True)
+
+
+def render_performance(stock_data, period=None, snapshot=None):
+    """성과 비교 테이블과 수익률 상관관계"""
+    st.header("📊 성과 비교")
+
+    if snapshot is not None:
+        df_performance = snapshot.performance(period)
+        fig_corr = snapshot.figure(period, "correlation")
+    else:
+        # 모든 기업의 종가를 하나의 날짜 x 기업 행렬로 맞춰 지표를 한 번에 계산
+        with stage("analytics", companies=len(stock_data)):
+            closes = close_matrix(stock_data)
+            df_performance = performance_metrics(closes)
+        fig_corr = correlation_chart(correlation_matrix(closes)) if len(closes.columns) > 1 else None
+
+    if not df_performance.empty:
+        # 수익률 계열은 비율로 계산되므로 표시할 때만 %로 바꿈
+        percent_columns = ['총 수익률', '연평균 수익률(CAGR)', '연환산 변동성', '최대 낙폭']
+        df_display = df_performance.copy()
+        df_display[percent_columns] = df_display[percent_columns] * 100
+        st.dataframe(
+            df_display,
+            use_container_width=True,
+            column_config={
+                **{col: st.column_config.NumberColumn(format="$%.2f")
+                   for col in ['시작 가격', '현재 가격', '최고가', '최저가']},
+                **{col: st.column_config.NumberColumn(format="%.2f%%") for col in percent_columns},
+                '가격 표준편차': st.column_config.NumberColumn(format="%.2f"),
+                '샤프 지수': st.column_config.NumberColumn(format="%.2f"),
+            }
+        )
+
+    if fig_corr is not None:
+        st.subheader("수익률 상관관계")
+        with stage("plotly_chart", chart="correlation"):
+            st.plotly_chart(fig_corr, use_container_width=True)
+
+
+@timed("volume_chart")
+def render_volume(stock_data, selected_period, period=None, snapshot=None):
+    """거래량 차트"""
+    st.header("📊 거래량 분석")
+
+    if snapshot is not None:
+        fig_volume = snapshot.figure(period, "volume")
+    else:
+        fig_volume = volume_chart(stock_data, selected_period, point_budget())
+
+    with stage("plotly_chart", chart="volume"):
+        st.plotly_chart(fig_volume, use_container_width=True)
+
+
+def live_figure(companies, interval):
+    """실시간 라인 차트의 빈 그림 (봉은 append_bars로 조금씩 채움)"""
+    fig = go.Figure()
+    for i, company in enumerate(companies):
+        fig.add_trace(go.Scatter(
+            x=[],
+            y=[],
+            mode='lines',
+            name=company,
+            line=dict(color=COLORS[i % len(COLORS)], width=2),
+            hovertemplate=f'<b>{company}</b><br>' +
+                         'Time: %{x}<br>' +
+                         'Price: $%{y:.2f}<br>' +
+                         '<extra></extra>'
+        ))
+
+    fig.update_layout(
+        title=f"장중 주가 ({interval})",
+        xaxis_title="시각",
+        yaxis_title="주가 (USD)",
+        hovermode='x unified',
+        height=500,
+        template='plotly_white'
+    )
+    return fig
+
+
+@st.fragment(run_every=LIVE_REFRESH)
+@timed("live_chart")
+def render_live_chart(companies, interval):
+    """장중 실시간 차트 (일정 주기로 이 부분만 다시 실행되고, 라인 차트는 새로 생긴 봉만 그림에 붙임)"""
+    st.header("⏱ 실시간 주가")
+
+    chart_type = st.radio(
+        "실시간 차트 타입:",
+        ["라인 차트", "캔들스틱 차트"],
+        horizontal=True,
+        key="live_chart_type"
+    )
+
+    # 티커별로 마지막 봉 이후만 새로 받아 메모리의 장중 봉 뒤에 붙임
+    with stage("live_data", interval=interval, companies=len(companies)):
+        bars, errors = load_parallel(companies, load_intraday, interval)
+    show_errors(errors, "장중 데이터")
+
+    if not bars:
+        st.info("표시할 장중 데이터가 없습니다.")
+        return
+
+    # 라인 차트 그림은 세션에 두고, 선택이 바뀔 때만 새로 만듦
+    key = (tuple(bars), interval, chart_type)
+    state = st.session_state.get("live_chart")
+    if state is None or state['key'] != key:
+        fig = live_figure(list(bars), interval) if chart_type == "라인 차트" else None
+        state = {'key': key, 'fig': fig, 'last': {}}
+        st.session_state["live_chart"] = state
+
+    added = 0
+    for i, (company, data) in enumerate(bars.items()):
+        new = bars_since(data, state['last'].get(company))
+        if state['fig'] is not None:
+            append_bars(state['fig'].data[i], new, {'y': 'Close'})
+        state['last'][company] = data.index[-1]
+        added += len(new)
+
+    # 캔들스틱은 기간 차트와 같은 격자로 모든 기업을 그림 (봉은 버퍼에 있으므로 그림만 다시 만듦)
+    fig = state['fig']
+    if fig is None:
+        fig, _ = candlestick_grid(bars, interval=interval)
+        fig.update_layout(title=f"장중 주가 ({interval})")
+
+    last_time = max(data.index[-1] for data in bars.values())
+    st.caption(f"마지막 봉: {last_time:%H:%M} · 이번에 반영한 봉: {added}개 · {LIVE_REFRESH}초마다 갱신")
+
+    with stage("plotly_chart", chart="live"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def render_period_sections(companies, period_options, default_period="3년"):
+    """기간에 따라 달라지는 차트와 표 (기간을 바꾸면 이 부분만 다시 실행)"""
+    selected_period = st.selectbox(
+        "기간 선택:",
+        options=list(period_options.keys()),
+        index=list(period_options).index(default_period)
+    )
+    period = period_options[selected_period]
+
+    # 미리 만든 스냅샷이 있으면 주가를 불러오거나 계산하지 않고 저장된 차트와 표를 표시
+    snapshot = load_snapshot(companies, period)
+    if snapshot is not None:
+        show_snapshot_caption(snapshot)
+        render_price_chart(companies, period, selected_period, snapshot=snapshot)
+        render_performance(None, period, snapshot)
+        render_volume(None, selected_period, period, snapshot)
+        return
+
+    # 데이터 로딩 (모든 기업의 주가를 동시에 요청)
+    stock_data = load_stock_data(companies, period)
+
+    if not stock_data:
+        st.error("선택한 기업의 데이터를 불러올 수 없습니다.")
+        return
+
+    # 차트 타입 변경은 차트 영역만 다시 실행되므로 아래 표와 거래량 차트는 다시 만들지 않음
+    render_price_chart(companies, period, selected_period, stock_data)
+    render_performance(stock_data)
+    render_volume(stock_data, selected_period)
+
+
+def render_stock_page(title, description, universe, default, period_options):
+    """주식 페이지 전체를 그리는 함수
+
+    universe는 고를 수 있는 {기업명: 티커}, default는 처음 선택할 기업명 목록,
+    period_options는 {기간 이름: 기간 코드}입니다.
+    """
+    st.title(title)
+    st.markdown(description)
+
+    # 사이드바에서 기업 선택
+    st.sidebar.header("기업 선택")
+    selected_companies = st.sidebar.multiselect(
+        "분석할 기업을 선택하세요:",
+        options=list(universe.keys()),
+        default=default
+    )
+
+    # 실시간 모드: 장중 봉을 주기적으로 받아 차트에 이어 붙임
+    live_mode = st.sidebar.toggle("실시간 모드 (장중)", value=False)
+    live_interval = LIVE_INTERVALS[st.sidebar.selectbox(
+        "봉 간격:",
+        options=list(LIVE_INTERVALS.keys()),
+        disabled=not live_mode
+    )]
+
+    if not selected_companies:
+        st.warning("최소 하나의 기업을 선택해주세요.")
+        return
+
+    companies = {company: universe[company] for company in selected_companies}
+
+    # 회사 정보 표시
+    render_company_cards(companies)
+
+    if live_mode:
+        render_live_chart(companies, live_interval)
+
+    # 기간, 차트 타입에 따라 달라지는 영역
+    render_period_sections(companies, period_options)
+
+    # 추가 정보
+    st.header("ℹ️ 추가 정보")
+    st.info("""
+    **데이터 소스**: Yahoo Finance
+
+    **주의사항**:
+    - 이 데이터는 투자 조언이 아닙니다.
+    - 실제 투자 전에 전문가와 상담하세요.
+    - 과거 성과가 미래 성과를 보장하지 않습니다.
+    """)
+
+    # ?debug=1 또는 DEBUG_PANEL=1일 때 단계별 시간과 캐시 현황 표시
+    render_debug_panel()
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.providers import PROVIDER, get_provider
+
+logger = logging.getLogger(__name__)
+
+# 티커별 Parquet 파일을 저장하는 기본 경로 (환경 변수로 변경 가능)
+# 로컬 제공자의 데이터가 실제 데이터와 섞이지 않도록 제공자별로 경로를 나눔
+_CACHE_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+STORE_DIR = os.environ.get(
+    "OHLCV_STORE_DIR",
+    os.path.join(_CACHE_ROOT, "ohlcv") if PROVIDER == "yahoo" else os.path.join(_CACHE_ROOT, PROVIDER, "ohlcv")
+)
+
+# 기간 문자열을 일 수로 변환 (max는 전체 기간)
+PERIOD_DAYS = {
+    "1mo": 31,
+    "3mo": 92,
+    "6mo": 183,
+    "1y": 365,
+    "2y": 365 * 2,
+    "3y": 365 * 3,
+    "5y": 365 * 5,
+    "10y": 365 * 10,
+    "max": None
+}
+
+# 이 컬럼에 0이 아닌 값이 있으면 이전 봉의 수정 주가가 모두 바뀜
+ADJUSTMENT_COLUMNS = ['Stock Splits', 'Dividends']
+
+# 겹치는 봉의 시가가 이 비율 이상 다르면 수정 주가가 바뀐 것으로 봄
+ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def period_start(period, today=None):
+    """기간 문자열에 해당하는 시작 날짜를 반환하는 함수 (max는 None)"""
+    if period not in PERIOD_DAYS:
+        raise ValueError(f"지원하지 않는 기간입니다: {period}")
+    days = PERIOD_DAYS[period]
+    if days is None:
+        return None
+    today = pd.Timestamp(today or datetime.today()).normalize()
+    return today - timedelta(days=days)
+
+
+def to_dates(index):
+    """거래소마다 다른 타임존을 없애고 날짜 단위로 맞춘 인덱스를 반환하는 함수"""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def slice_from(data, start):
+    """시작 날짜 이후의 행만 남기는 함수 (타임존이 있는 인덱스도 처리)"""
+    if start is None or data.empty:
+        return data
+    start = pd.Timestamp(start)
+    if data.index.tz is not None:
+        start = start.tz_localize(data.index.tz)
+    return data[data.index >= start]
+
+
+def adjustment_changed(stored, fetched, tolerance=ADJUSTMENT_TOLERANCE):
+    """새로 받은 구간 때문에 저장된 봉의 수정 주가가 달라졌는지 확인하는 함수
+
+    저장되지 않은 새 봉에 분할이나 배당이 있거나, 겹치는 봉의 시가가 저장된 값과 다르면 True입니다.
+    """
+    if fetched is None or fetched.empty:
+        return False
+    # 이미 저장된 봉의 분할/배당은 저장할 때 반영되었으므로 새 봉만 확인
+    added = fetched[~fetched.index.isin(stored.index)]
+    for column in ADJUSTMENT_COLUMNS:
+        if column in added.columns and (added[column].fillna(0) != 0).any():
+            return True
+    # 마지막 봉의 종가는 장중에 바뀌므로 시가로 비교
+    overlap = stored.index.intersection(fetched.index)
+    if overlap.empty or 'Open' not in fetched.columns:
+        return False
+    old = stored.loc[overlap, 'Open'].to_numpy()
+    new = fetched.loc[overlap, 'Open'].to_numpy()
+    return not np.allclose(old, new, rtol=tolerance, equal_nan=True)
+
+
+def merge_bars(old, new):
+    """기존 데이터와 새 데이터를 합치고 날짜가 겹치면 새 값을 사용하는 함수"""
+    if old is None or old.empty:
+        return new
+    if new is None or new.empty:
+        return old
+    merged = pd.concat([old, new])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+
+class OHLCVStore:
+    """티커별 Parquet 파일로 주가 데이터를 보관하고 부족한 구간만 받아오는 저장소"""
+
+    def __init__(self, root=STORE_DIR, min_refresh=timedelta(minutes=15)):
+        self.root = root
+        self.min_refresh = min_refresh
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker):
+        name = ticker.replace("/", "_")
+        return (os.path.join(self.root, f"{name}.parquet"),
+                os.path.join(self.root, f"{name}.json"))
+
+    def read(self, ticker):
+        """저장된 데이터와 메타 정보를 읽는 함수 (없으면 None, None)"""
+        data_path, meta_path = self._paths(ticker)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        try:
+            data = pd.read_parquet(data_path)
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            # 손상된 파일은 없는 것으로 보고 다시 받아옴
+            return None, None
+        return data, meta
+
+    def write(self, ticker, data, meta):
+        """임시 파일에 쓴 뒤 교체해서 다른 프로세스가 반쯤 쓴 파일을 읽지 않게 하는 함수"""
+        os.makedirs(self.root, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+        data.to_parquet(data_path + ".tmp")
+        os.replace(data_path + ".tmp", data_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _covers(self, meta, start):
+        """저장된 데이터가 요청한 시작 날짜까지 포함하는지 확인하는 함수"""
+        covered_from = meta.get("covered_from")
+        if covered_from is None:
+            return True
+        return start is not None and pd.Timestamp(covered_from) <= start
+
+    def _fetch_from(self, ticker, start):
+        """시작 날짜부터(None이면 전체 기간) 받아오는 함수"""
+        if start is None:
+            return get_provider().history(ticker, period="max")
+        return get_provider().history(ticker, start=start.date())
+
+    def load_history(self, ticker, period="3y"):
+        """저장소를 먼저 확인하고 마지막 저장일 이후의 데이터만 받아 합치는 함수
+
+        요청이 실패해도 저장된 데이터가 있으면 그 데이터를 반환합니다.
+        """
+        start = period_start(period)
+        now = datetime.now()
+
+        with self._lock(ticker):
+            stored, meta = self.read(ticker)
+
+            try:
+                if stored is None or not self._covers(meta, start):
+                    # 저장된 구간이 부족하면 요청 기간 전체를 받아옴
+                    fetched = self._fetch_from(ticker, start)
+                    if fetched.empty:
+                        return fetched if stored is None else slice_from(stored, start)
+                    data = merge_bars(stored, fetched)
+                    meta = {"covered_from": None if start is None else start.isoformat()}
+                elif now - datetime.fromisoformat(meta["fetched_at"]) >= self.min_refresh:
+                    # 마지막 봉은 장중에 바뀔 수 있으므로 마지막 저장일부터 다시 받음
+                    last_date = stored.index[-1].date()
+                    fetched = get_provider().history(ticker, start=last_date)
+                    data = merge_bars(stored, fetched)
+                    if adjustment_changed(stored, fetched):
+                        # 분할이나 배당으로 이전 봉의 수정 주가가 바뀌었으므로 저장된 구간 전체를 다시 받음
+                        covered_from = meta.get("covered_from")
+                        refetched = self._fetch_from(ticker, None if covered_from is None else pd.Timestamp(covered_from))
+                        if not refetched.empty:
+                            data = refetched
+                else:
+                    return slice_from(stored, start)
+            except Exception:
+                if stored is None:
+                    raise
+                logger.warning("%s 요청 실패, 저장된 데이터 사용", ticker, exc_info=True)
+                return slice_from(stored, start)
+
+            meta["fetched_at"] = now.isoformat()
+            self.write(ticker, data, meta)
+
+        return slice_from(data, start)
+
+
+_default_store = OHLCVStore()
+
+
+def load_history(ticker, period="3y"):
+    """기본 저장소를 통해 주가 데이터를 가져오는 함수"""
+    return _default_store.load_history(ticker, period)
@@ -0,0 +1,76 @@
+"""페이지에서 분석하는 기업 목록 (워밍업 스케줄러와 공유)"""
+
+from utils.ranking import ranked_companies
+
+# 시총 Top 10 기업 (2024년 기준, 시가총액 순위를 계산할 수 없을 때 사용)
+TOP_10_COMPANIES = {
+    "Apple": "AAPL",
+    "Microsoft": "MSFT",
+    "Alphabet": "GOOGL",
+    "Amazon": "AMZN",
+    "NVIDIA": "NVDA",
+    "Tesla": "TSLA",
+    "Meta": "META",
+    "Berkshire Hathaway": "BRK-B",
+    "Taiwan Semiconductor": "TSM",
+    "Visa": "V"
+}
+
+# 시총 기준 Top 10 기업 및 티커 (시가총액 순위를 계산할 수 없을 때 사용)
+GLOBAL_TOP10_COMPANIES = {
+    "Apple (AAPL)": "AAPL",
+    "Microsoft (MSFT)": "MSFT",
+    "NVIDIA (NVDA)": "NVDA",
+    "Saudi Aramco (2222.SR)": "2222.SR",  # 사우디거래소
+    "Amazon (AMZN)": "AMZN",
+    "Alphabet (GOOGL)": "GOOGL",
+    "Meta Platforms (META)": "META",
+    "Berkshire Hathaway (BRK-B)": "BRK-B",
+    "Eli Lilly (LLY)": "LLY",
+    "TSMC (TSM)": "TSM"
+}
+
+# 분석할 기업 목록 (시총 Top 10 및 추가 기업 포함)
+COMPANIES_TO_ANALYZE = {
+    "Apple": "AAPL",
+    "Microsoft": "MSFT",
+    "Alphabet": "GOOGL",
+    "Amazon": "AMZN",
+    "NVIDIA": "NVDA",
+    "Tesla": "TSLA",
+    "Meta": "META",
+    "Berkshire Hathaway": "BRK-B",
+    "Taiwan Semiconductor": "TSM",
+    "Visa": "V",
+    # 한국 기업 추가
+    "Samsung Electronics": "005930.KS", # 삼성전자 (KRX)
+    "Hyundai Motor": "005380.KS",     # 현대자동차 (KRX)
+    # 차세대 AI 관련 기업 (예시 - 대표적인 AI 관련 기업들)
+    "Advanced Micro Devices": "AMD",  # AI 칩
+    "Broadcom": "AVGO",               # AI 인프라
+    "Palantir Technologies": "PLTR",  # 데이터 분석 및 AI
+    # 양자컴퓨터 관련 기업 (예시 - 주목받는 양자컴퓨팅 관련 기업들)
+    "IonQ": "IONQ",                   # 양자 컴퓨팅 하드웨어 및 소프트웨어
+    "Rigetti Computing": "RGTI",      # 양자 컴퓨팅 하드웨어
+    "Honeywell International": "HON"  # 양자 솔루션 연구 개발 포함
+}
+
+
+def top10_companies():
+    """주식 페이지용 시가총액 상위 10개 기업 {기업명: 티커}"""
+    return ranked_companies(10, fallback=TOP_10_COMPANIES)
+
+
+def global_top10_companies():
+    """글로벌 Top 10 페이지용 시가총액 상위 10개 기업 {"기업명 (티커)": 티커}"""
+    return ranked_companies(10, fallback=GLOBAL_TOP10_COMPANIES, label="{name} ({ticker})")
+
+
+def all_tickers():
+    """모든 페이지의 기업 목록을 합친 티커 목록 (중복 제거, 순서 유지)"""
+    tickers = {}
+    for companies in (top10_companies(), global_top10_companies(), TOP_10_COMPANIES,
+                      GLOBAL_TOP10_COMPANIES, COMPANIES_TO_ANALYZE):
+        for ticker in companies.values():
+            tickers[ticker] = None
+    return list(tickers)
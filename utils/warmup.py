@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from utils.fx import currency_for, get_rate_series
+from utils.loader import MAX_WORKERS
+from utils.metadata import refresh_metadata
+from utils.prices import load_prices, load_shared_prices
+from utils.ranking import candidate_tickers, market_caps
+from utils.universe import all_tickers, global_top10_companies
+
+logger = logging.getLogger(__name__)
+
+# WARMUP_ENABLED=0 이면 스케줄러를 시작하지 않음 (테스트, 벤치마크용)
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1") != "0"
+
+# 전체 목록을 다시 받아오는 주기(초)
+WARMUP_INTERVAL = int(os.environ.get("WARMUP_INTERVAL", 30 * 60))
+
+# 미리 받아둘 기간 (페이지 기본값 포함)
+WARMUP_PERIODS = tuple(os.environ.get("WARMUP_PERIODS", "3y").split(","))
+
+def _run(name, fn, *args):
+    try:
+        fn(*args)
+        return True
+    except Exception:
+        logger.warning("워밍업 실패: %s %s", name, args, exc_info=True)
+        return False
+
+
+def warm_universe(tickers=None, periods=WARMUP_PERIODS, max_workers=MAX_WORKERS):
+    """전체 기업의 주가, 회사 정보, 환율을 새로 받아 캐시에 채우는 함수
+
+    (성공 수, 실패 수)를 반환합니다.
+    """
+    results = []
+
+    # 시가총액 순위 후보까지 포함해 회사 정보와 시세를 한 번에 갱신한 뒤 순위를 다시 계산
+    if tickers is None:
+        results.append(_run("metadata", refresh_metadata, candidate_tickers() + all_tickers()))
+        results.append(_run("ranking", market_caps.refresh))
+        tickers = all_tickers()
+    else:
+        results.append(_run("metadata", refresh_metadata, tickers))
+    currencies = {currency_for(ticker) for ticker in tickers} - {"USD"}
+
+    tasks = []
+    # 환율을 먼저 받아두면 해외 주식 변환 시 다시 요청하지 않음
+    for currency in currencies:
+        for period in periods + ("1mo",):
+            tasks.append(("fx", get_rate_series.refresh, currency, period))
+    for ticker in tickers:
+        for period in periods:
+            tasks.append(("history", load_shared_prices.refresh, ticker, period))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results.extend(executor.map(lambda task: _run(*task), tasks))
+
+    # 글로벌 Top 10 페이지는 선택한 티커 집합 단위로 캐시되므로 기본 선택(상위 3개)을 받아둠
+    end_date = datetime.today()
+    start_date = end_date - timedelta(days=365 * 3)
+    default_tickers = list(global_top10_companies().values())[:3]
+    results.append(_run("download", load_prices, default_tickers, start_date, end_date, True))
+
+    succeeded = sum(results)
+    return succeeded, len(results) - succeeded
+
+
+class WarmupScheduler(threading.Thread):
+    """시작 시 한 번, 이후 일정 주기로 전체 기업 데이터를 미리 받아두는 백그라운드 스레드"""
+
+    def __init__(self, interval=WARMUP_INTERVAL):
+        super().__init__(name="warmup-scheduler", daemon=True)
+        self.interval = interval
+        self.last_run = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                succeeded, failed = warm_universe()
+                logger.info("워밍업 완료: 성공 %d, 실패 %d, %.1f초",
+                            succeeded, failed, time.monotonic() - started)
+            except Exception:
+                logger.exception("워밍업 중 오류 발생")
+            self.last_run = datetime.now()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_warmup():
+    """프로세스당 한 번만 워밍업 스케줄러를 시작하는 함수 (여러 번 호출해도 안전)"""
+    global _scheduler
+    if not WARMUP_ENABLED:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WarmupScheduler()
+            _scheduler.start()
+    return _scheduler